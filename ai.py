@@ -1,15 +1,26 @@
 import random
+from frontier import FrontierIndex
+from solver import ProbabilitySolver, SolverCancelled
 
 class AI:
     """Pure decision-making AI. It does NOT change game state; it only returns a recommended
     action for the caller to apply. This keeps game-state changes centralized in InputHandler.
+    Moves are ("reveal", (row, col)), ("reveal_many", [(row, col), ...]) when several cells
+    are proven safe at once, or ("none", None).
     """
 
     def __init__(self, board, difficulty):
         self.board = board
         self.difficulty = difficulty
+        # Medium and hard keep an incrementally updated frontier instead of rescanning the grid.
+        self.frontier = FrontierIndex(board) if difficulty in ("medium", "hard") else None
+        # Hard reasons about mine probabilities from visible information only.
+        self.solver = ProbabilitySolver(board, self.frontier) if difficulty == "hard" else None
 
-    def make_move(self):
+    # should_stop, if given, is polled while the move is worked out (e.g. from a background
+    # worker); once it returns True the search gives up and ("none", None) is returned.
+    def make_move(self, should_stop=None):
+        self.should_stop = should_stop or (lambda: False)
         if self.board.gameOver:
             return ("none", None)
         if self.difficulty == "easy":
@@ -20,81 +31,78 @@ class AI:
             return self._hard_move()
         return ("none", None)
 
-    def _easy_move(self):
-        # Collect all covered, unflagged cells
+    # True if a covered, unflagged cell is left to move on; otherwise make_move can only
+    # return ("none", None). Worked out from the board's counters, without a scan.
+    def has_move(self):
+        board = self.board
+        return not board.gameOver and board.rows * board.cols - board.revealed_count - board.flags_placed > 0
+
+    # Covered, unflagged cells, or None if the move was cancelled during the scan.
+    def _covered_cells(self):
         candidates = []
         for r in range(self.board.rows):
+            if self.should_stop():
+                return None
             for c in range(self.board.cols):
                 cell = self.board.grid[r][c]
                 if not cell.isClicked and not cell.isFlagged:
                     candidates.append((r, c))
+        return candidates
 
-        # If no candidates, do nothing
+    def _easy_move(self):
+        # Collect all covered, unflagged cells
+        candidates = self._covered_cells()
+
+        # If no candidates (or cancelled), do nothing
         if not candidates:
             return ("none", None)
 
         # Pick a random candidate
         return ("reveal", random.choice(candidates))
-    
+
     def _medium_move(self):
-        # Check if any zero-mine cells have been revealed to trigger strategic mode
-        has_zero_revealed = any(
-            cell.isClicked and cell.adjMines == 0 
-            for row in self.board.grid for cell in row
-        )
-        
         # If zero-mine cell revealed, use logical deduction
-        if has_zero_revealed:
-            safe_move = self._find_safe_move()
-            if safe_move:
-                return ("reveal", safe_move)
+        if self.frontier.zero_revealed:
+            safe_moves = self._find_safe_moves()
+            if safe_moves:
+                return self._reveal_move(safe_moves)
         
         # Make random moves initially or fall back to random
-        candidates = []
-        for r in range(self.board.rows):
-            for c in range(self.board.cols):
-                cell = self.board.grid[r][c]
-                if not cell.isClicked and not cell.isFlagged:
-                    candidates.append((r, c))
-        
-        if candidates:
-            return ("reveal", random.choice(candidates))
+        choice = self._random_covered_cell()
+        if choice is not None:
+            return ("reveal", choice)
         return ("none", None)
 
-    def _find_safe_move(self):
-        for r in range(self.board.rows):
-            for c in range(self.board.cols):
-                cell = self.board.grid[r][c]
-                if cell.isClicked and cell.adjMines > 0:
-                    neighbors = self._get_neighbors(r, c)
-                    covered = [pos for pos in neighbors if not self.board.grid[pos[0]][pos[1]].isClicked and not self.board.grid[pos[0]][pos[1]].isFlagged]
-                    flagged = [pos for pos in neighbors if self.board.grid[pos[0]][pos[1]].isFlagged]
-                    
-                    if len(flagged) == cell.adjMines and covered:
-                        return covered[0]
-        return None
+    # A random covered, unflagged cell, or None if there is none or the move was cancelled.
+    # Random probes almost always hit one unless the board is nearly cleared, so the full
+    # scan is rarely needed.
+    def _random_covered_cell(self):
+        board = self.board
+        for _ in range(64):
+            r, c = random.randrange(board.rows), random.randrange(board.cols)
+            cell = board.grid[r][c]
+            if not cell.isClicked and not cell.isFlagged:
+                return (r, c)
+        candidates = self._covered_cells()
+        return random.choice(candidates) if candidates else None
 
-    def _get_neighbors(self, r, c):
-        neighbors = []
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < self.board.rows and 0 <= nc < self.board.cols:
-                    neighbors.append((nr, nc))
-        return neighbors
+    def _find_safe_moves(self):
+        # Covered neighbours of revealed numbers whose mines are all flagged
+        return self.frontier.safe_cells()
 
+    # Move revealing the given cells: a single reveal, or all of them in one batch.
+    def _reveal_move(self, cells):
+        if len(cells) == 1:
+            return ("reveal", cells[0])
+        return ("reveal_many", cells)
 
     def _hard_move(self):
-        # Hard: pick a random covered cell that isn't a mine 
-        safe_cells = []
-        for r in range(self.board.rows):
-            for c in range(self.board.cols):
-                cell = self.board.grid[r][c]
-                if not cell.isClicked and not cell.isFlagged and cell.cellState != 3:
-                    safe_cells.append((r, c))
-        if safe_cells:
-            choice = random.choice(safe_cells)
-            return ("reveal", choice)
-        return ("none", None)
\ No newline at end of file
+        # Hard: reveal every cell proven safe, otherwise the covered cell least likely to be a
+        # mine, judged only from the revealed numbers, flags and total mine count
+        try:
+            choices = self.solver.best_cells(self.should_stop)
+        except SolverCancelled:
+            return ("none", None)
+        if choices:
+            return self._reveal_move(choices)
+        return ("none", None)
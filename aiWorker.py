@@ -0,0 +1,64 @@
+'''
+File: aiWorker.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Works out AI moves on a background thread so the game loop keeps handling events
+and drawing while the AI thinks. One move is computed at a time. The game loop polls for
+the result each frame; cancelling a move (on a reset or a loaded game) tells the running
+search to stop early and throws its result away.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Runs make_move and returns (move, seconds it took).
+def timed_move(ai, should_stop):
+    start = time.perf_counter()
+    move = ai.make_move(should_stop)
+    return move, time.perf_counter() - start
+
+# Class that runs AI.make_move off the game loop.
+class AIWorker:
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+        self.future = None # pending make_move call
+        self.stop = None # threading.Event the pending call polls
+        self.last_seconds = 0.0 # time the last collected move took to compute
+
+    # True while a move is being computed or waiting to be collected.
+    @property
+    def busy(self):
+        return self.future is not None
+
+    # Starts computing ai's next move, cancelling any move still pending. The board must
+    # not change until the result has been collected or cancelled.
+    def request(self, ai):
+        self.cancel()
+        self.stop = threading.Event()
+        self.future = self.pool.submit(timed_move, ai, self.stop.is_set)
+
+    # The (action, (row, col)) move once it is ready, otherwise None. Errors raised by the
+    # AI are raised here.
+    def result(self):
+        if self.future is None or not self.future.done():
+            return None
+        future, self.future = self.future, None
+        move, self.last_seconds = future.result()
+        return move
+
+    # Drops the pending move. A search already running stops at its next check.
+    def cancel(self):
+        if self.future is not None:
+            self.stop.set()
+            self.future.cancel()
+            self.future = None
+
+    # Cancels the pending move and waits for the worker thread to finish.
+    def shutdown(self):
+        self.cancel()
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,269 @@
+'''
+File: arrayBoard.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: NumPy-backed Board for very large grids. Mine, revealed and flag state and the
+adjacent counts live in 2D arrays, and adjacent counts are computed for the whole board in
+one vectorized pass. grid[r][c] still returns a cell-like view so ai.py, inputHandler.py
+and the renderer work unchanged.
+Inputs: None.
+Outputs: None.
+External Sources: NumPy (optional dependency, only needed for this module).
+'''
+
+# Imports.
+from board import Board, CLICKED_BIT, FLAGGED_BIT, MINE_BIT, ADJ_SHIFT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+REGION_WINDOW = 32 # half-size of the first window a flood fill looks at; grown 4x as needed
+
+# Cell-like view onto one position of an ArrayBoard.
+class CellView:
+    __slots__ = ("board", "row", "col")
+
+    def __init__(self, board, row, col):
+        self.board = board
+        self.row = row # y pos of grid
+        self.col = col # x pos of grid
+
+    @property
+    def cellState(self):
+        return int(self.board.state[self.row, self.col])
+
+    @cellState.setter
+    def cellState(self, value):
+        self.board.state[self.row, self.col] = value
+
+    @property
+    def isClicked(self):
+        return bool(self.board.clicked[self.row, self.col])
+
+    @isClicked.setter
+    def isClicked(self, value):
+        self.board.clicked[self.row, self.col] = value
+
+    @property
+    def isFlagged(self):
+        return bool(self.board.flagged[self.row, self.col])
+
+    @isFlagged.setter
+    def isFlagged(self, value):
+        self.board.flagged[self.row, self.col] = value
+
+    @property
+    def adjMines(self):
+        return int(self.board.adj[self.row, self.col])
+
+    @adjMines.setter
+    def adjMines(self, value):
+        self.board.adj[self.row, self.col] = value
+
+    # Flood-fill reveal, done directly on the board's arrays.
+    def revealGrid(self, grid):
+        return self.board.reveal_region(self.row, self.col)
+
+# Read-only sequence of cells given by flat indices, returned from reveals.
+class _CellList:
+    __slots__ = ("board", "indices")
+
+    def __init__(self, board, indices):
+        self.board = board
+        self.indices = indices # flat row * cols + col positions
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, k):
+        r, c = divmod(int(self.indices[k]), self.board.cols)
+        return CellView(self.board, r, c)
+
+    def __iter__(self):
+        board, cols = self.board, self.board.cols
+        return (CellView(board, i // cols, i % cols) for i in self.indices.tolist())
+
+# One row of an ArrayBoard grid.
+class _RowView:
+    __slots__ = ("board", "row")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.cols
+
+    def __getitem__(self, col):
+        return CellView(self.board, self.row, col)
+
+    def __iter__(self):
+        board, row = self.board, self.row
+        return (CellView(board, row, c) for c in range(board.cols))
+
+# grid[r][c] access for an ArrayBoard.
+class _GridView:
+    __slots__ = ("board",)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __len__(self):
+        return self.board.rows
+
+    def __getitem__(self, row):
+        return _RowView(self.board, row)
+
+    def __iter__(self):
+        board = self.board
+        return (_RowView(board, r) for r in range(board.rows))
+
+# Board that stores cell state in NumPy arrays.
+class ArrayBoard(Board):
+    storage = "array"
+
+    # Allocates the state arrays and returns the grid view over them.
+    def build_grid(self):
+        if np is None:
+            raise ImportError("ArrayBoard requires NumPy (pip install numpy)")
+        shape = (self.rows, self.cols)
+        self.state = np.zeros(shape, dtype=np.int8) # cell states, 3 is mine
+        self.clicked = np.zeros(shape, dtype=bool) # revealed cells
+        self.flagged = np.zeros(shape, dtype=bool) # flagged cells
+        self.adj = np.zeros(shape, dtype=np.int8) # adjacent mine counts
+        return _GridView(self)
+
+    # Places mines on board in one vectorized write.
+    def addMines(self, safe_rc):
+        self.state.reshape(-1)[self.mine_layout(safe_rc)] = 3
+
+    # Same rules as Board.mine_positions, but sampled and shifted with NumPy so 10M-cell
+    # boards take well under a second. Layouts are reproducible from the seed, though they
+    # differ from what a list-backed Board makes with the same seed.
+    def mine_positions(self, safe_rc):
+        zone, allowed = self.safe_zone(safe_rc)
+        positions = np.random.default_rng(self.seed).choice(allowed, self.mine_count, replace=False)
+        for s in zone:
+            positions += positions >= s
+        return positions
+
+    # Board.cell_bytes() encoding, built from the arrays in one vectorized pass.
+    def cell_bytes(self):
+        out = self.clicked * np.uint8(CLICKED_BIT)
+        out |= self.flagged * np.uint8(FLAGGED_BIT)
+        out |= (self.state == 3) * np.uint8(MINE_BIT)
+        out |= self.adj.astype(np.uint8) << ADJ_SHIFT
+        return out.astype(np.uint8).tobytes()
+
+    # Sets the arrays from cell_bytes() output, vectorized.
+    def load_cell_bytes(self, data):
+        b = np.frombuffer(data, dtype=np.uint8).reshape(self.rows, self.cols)
+        # 0/1 bytes reinterpreted as bools without another pass
+        self.clicked = (b & CLICKED_BIT).view(bool)
+        self.flagged = ((b & FLAGGED_BIT) >> 1).view(bool)
+        # Cell state looked up per byte value: 3 for mines, 2 for revealed cells
+        lut = np.array([3 if v & MINE_BIT else (2 if v & CLICKED_BIT else 0) for v in range(256)], dtype=np.int8)
+        self.state = lut[b]
+        self.adj = (b >> ADJ_SHIFT).view(np.int8)
+        self.dirty_all = True
+
+    # Reveal all mines on board
+    def revealMines(self):
+        hidden = (self.state == 3) & ~self.clicked
+        self.clicked |= hidden
+        mines = _CellList(self, np.flatnonzero(hidden))
+        self.revealed_count += len(mines)
+        self.cells_changed(mines)
+
+    # Count adjacent mines for every cell in one neighbour-sum pass.
+    def compute_adjacents(self):
+        mines = (self.state == 3).astype(np.int8)
+        # Pad by one so the 8 shifted windows line up with the board.
+        padded = np.pad(mines, 1)
+        adj = np.zeros_like(mines)
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                if dr == 1 and dc == 1:
+                    continue
+                adj += padded[dr:dr + self.rows, dc:dc + self.cols]
+        # Mines keep an adjacent count of 0 like the list-backed board.
+        adj[mines == 1] = 0
+        self.adj = adj
+
+    # Scanline flood fill with the same rules as Cell.revealGrid: the connected region of
+    # covered 0-cells around (row, col) is filled span by span, then the region plus its
+    # unflagged covered border is revealed in one vectorized step. Returns the newly
+    # revealed cells as a sequence of views. Only a window around the click is read, grown
+    # until the region fits inside it, so a click costs about the size of what it reveals
+    # rather than of the board.
+    def reveal_region(self, row, col):
+        rows, cols = self.rows, self.cols
+        if self.clicked[row, col] or self.flagged[row, col]:
+            return _CellList(self, np.zeros(0, dtype=np.intp))
+        # A number or a mine reveals just itself
+        if self.adj[row, col] != 0 or self.state[row, col] == 3:
+            self.clicked[row, col] = True
+            if self.state[row, col] == 0:
+                self.state[row, col] = 2
+            return _CellList(self, np.array([row * cols + col], dtype=np.intp))
+        half = REGION_WINDOW
+        while True:
+            r0, r1 = max(row - half, 0), min(row + half + 1, rows)
+            c0, c1 = max(col - half, 0), min(col + half + 1, cols)
+            blocked = self.clicked[r0:r1, c0:c1] | self.flagged[r0:r1, c0:c1]
+            region = self.fill_window(blocked, r0, r1, c0, c1, row, col)
+            # Done once the region keeps off every window edge that isn't the board's
+            if not ((r0 > 0 and region[0].any()) or (r1 < rows and region[-1].any())
+                    or (c0 > 0 and region[:, 0].any()) or (c1 < cols and region[:, -1].any())):
+                break
+            half *= 4
+        # Reveal the region and its 8-neighbour border, skipping blocked cells
+        h, w = r1 - r0, c1 - c0
+        padded = np.pad(region, 1)
+        grown = np.zeros((h, w), dtype=bool)
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                grown |= padded[dr:dr + h, dc:dc + w]
+        newly = grown & ~blocked
+        self.clicked[r0:r1, c0:c1] |= newly
+        state = self.state[r0:r1, c0:c1]
+        state[newly & (state == 0)] = 2
+        wr, wc = np.nonzero(newly)
+        return _CellList(self, (wr + r0) * cols + (wc + c0))
+
+    # Fills the region of fillable (covered, unflagged, non-mine, no adjacent mines) cells
+    # around (row, col) inside rows r0:r1, cols c0:c1; returns it as a bool array over the
+    # window. blocked is the window's revealed-or-flagged mask.
+    def fill_window(self, blocked, r0, r1, c0, c1, row, col):
+        rows, cols = r1 - r0, c1 - c0
+        fillable = bytearray((~blocked & (self.adj[r0:r1, c0:c1] == 0) & (self.state[r0:r1, c0:c1] != 3)).tobytes())
+        region = np.zeros(rows * cols, dtype=bool)
+        seeds = [(row - r0) * cols + (col - c0)]
+        while seeds:
+            i = seeds.pop()
+            if not fillable[i]:
+                continue
+            r = i // cols
+            rowStart, rowEnd = r * cols, (r + 1) * cols
+            # Extend the span left and right along the row
+            a = fillable.rfind(0, rowStart, i) + 1 or rowStart
+            b = fillable.find(0, i, rowEnd)
+            if b == -1:
+                b = rowEnd
+            fillable[a:b] = bytes(b - a)
+            region[a:b] = True
+            # Seed every fillable run touching the span (diagonals included) above and below
+            for nr in (r - 1, r + 1):
+                if 0 <= nr < rows:
+                    lo = nr * cols + max(a - rowStart - 1, 0)
+                    hi = nr * cols + min(b - rowStart + 1, cols)
+                    j = fillable.find(1, lo, hi)
+                    while j != -1:
+                        seeds.append(j)
+                        k = fillable.find(0, j, hi)
+                        if k == -1:
+                            break
+                        j = fillable.find(1, k, hi)
+        return region.reshape(rows, cols)
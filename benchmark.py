@@ -0,0 +1,243 @@
+'''
+File: benchmark.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Micro-benchmarks for the engine hot paths (adjacent counts, mine placement, flood
+reveal, victory check, AI moves and board drawing) at several board sizes. Reports time per
+operation and peak memory and compares them against a stored baseline so regressions are
+caught before they ship.
+Inputs: Command line options (see --help); optional baseline JSON file.
+Outputs: Results table on stdout; optional JSON results file. Exits with status 1 when a
+case regresses past the tolerance.
+External Sources: None (NumPy for --storage array, PyGame for the draw case).
+'''
+
+# Imports.
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from board import board_class
+from inputHandler import InputHandler
+from ai import AI
+
+MINE_DENSITY = 0.15 # fraction of cells that are mines in every case
+MIN_TOTAL_SECONDS = 0.2 # keep repeating a case until it has run at least this long
+MAX_REPEATS = 1000
+AI_MOVES = 20 # moves timed per AI case
+
+# Builds a seeded board of the requested storage, optionally with mines placed at the centre.
+def make_board(storage, rows, cols, place_mines=True, difficulty="easy"):
+    mines = int(rows * cols * MINE_DENSITY)
+    board = board_class(storage)(rows, cols, mines, "y", difficulty, seed=1)
+    if place_mines:
+        board.insertMines((rows // 2, cols // 2))
+    return board
+
+# Each case returns (setup, op): setup builds fresh state outside the timing and op(state)
+# is the timed operation.
+def case_compute_adjacents(storage, rows, cols):
+    return (lambda: make_board(storage, rows, cols),
+            lambda board: board.compute_adjacents())
+
+def case_add_mines(storage, rows, cols):
+    return (lambda: make_board(storage, rows, cols, place_mines=False),
+            lambda board: board.addMines((rows // 2, cols // 2)))
+
+def case_reveal(storage, rows, cols):
+    # The first-click cell never has adjacent mines, so this is a real flood fill
+    return (lambda: make_board(storage, rows, cols),
+            lambda board: board.reveal(rows // 2, cols // 2))
+
+def case_victory_check(storage, rows, cols):
+    return (lambda: make_board(storage, rows, cols),
+            lambda board: board.victoryCheck())
+
+def case_ai(difficulty):
+    def case(storage, rows, cols):
+        def setup():
+            random.seed(1)
+            board = make_board(storage, rows, cols, place_mines=False, difficulty=difficulty)
+            handler = InputHandler(board)
+            handler.reveal_cell(rows // 2, cols // 2)
+            return board, handler, AI(board, difficulty)
+        def op(state):
+            board, handler, ai = state
+            # Several moves of a real game; reveals are part of the game, not the measurement
+            total = 0.0
+            moves = 0
+            for _ in range(AI_MOVES):
+                if board.gameOver:
+                    break
+                start = time.perf_counter()
+                action, rc = ai.make_move()
+                total += time.perf_counter() - start
+                moves += 1
+                if action == "reveal_many":
+                    handler.reveal_cells(rc)
+                elif action == "reveal":
+                    handler.reveal_cell(*rc)
+                else:
+                    break
+                board.victoryCheck()
+            # Time per move
+            return total / max(moves, 1)
+        return setup, op
+    return case
+
+def case_draw(storage, rows, cols):
+    import pygame
+    from renderer import BoardRenderer
+    def setup():
+        board = make_board(storage, rows, cols)
+        board.reveal(rows // 2, cols // 2)
+        renderer = BoardRenderer(board)
+        # Scroll to the revealed middle so the view shows numbers, not just covered cells
+        renderer.scroll_to(rows // 2 - renderer.visible_rows // 2, cols // 2 - renderer.visible_cols // 2)
+        return renderer, pygame.Surface(renderer.window_size())
+    def op(state):
+        renderer, screen = state
+        renderer.invalidate()
+        renderer.draw(screen)
+    return setup, op
+
+# name -> (case, whether the op can be repeated on the same state)
+CASES = {
+    "compute_adjacents": (case_compute_adjacents, True),
+    "addMines": (case_add_mines, False),
+    "reveal": (case_reveal, False),
+    "victoryCheck": (case_victory_check, True),
+    "ai_easy": (case_ai("easy"), False),
+    "ai_medium": (case_ai("medium"), False),
+    "ai_hard": (case_ai("hard"), False),
+    "draw": (case_draw, True),
+}
+
+# Times one case and keeps the fastest run. Setup counts toward the time budget so slow
+# setups on big boards don't repeat forever. Idempotent ops are looped on one state until a
+# batch takes a millisecond, so tiny ops are not lost in timer overhead. Finally the case
+# runs once more under tracemalloc for the peak memory of setup plus operation.
+def run_case(setup, op, idempotent):
+    best = None
+    wall = time.perf_counter()
+    repeats = 0
+    while repeats < MAX_REPEATS and (repeats == 0 or time.perf_counter() - wall < MIN_TOTAL_SECONDS):
+        state = setup()
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                measured = op(state)
+            elapsed = time.perf_counter() - start
+            if not idempotent or elapsed > 1e-3 or number >= 1 << 20:
+                break
+            number *= 2
+        # Ops that time themselves (AI moves) return their own figure
+        seconds = measured if isinstance(measured, float) else elapsed / number
+        best = seconds if best is None else min(best, seconds)
+        repeats += 1
+    tracemalloc.start()
+    op(setup())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak, "repeats": repeats}
+
+# Memory held per cell by a freshly built board of each storage, and the saving against
+# the list board of Cell objects.
+def print_memory_report(storages, n):
+    print(f"{'storage':<10} {'bytes/cell':>12} {'saved/cell':>12}   ({n}x{n} board)")
+    listBytes = None
+    for storage in ["list"] + [s for s in storages if s != "list"]:
+        cls = board_class(storage) # imported outside the trace
+        tracemalloc.start()
+        board = cls(n, n, int(n * n * MINE_DENSITY), "n", "no_ai", seed=1)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del board
+        perCell = held / (n * n)
+        if listBytes is None:
+            listBytes = perCell
+        print(f"{storage:<10} {perCell:>12.1f} {listBytes - perCell:>12.1f}", flush=True)
+
+# Formats a duration with a readable unit.
+def format_seconds(t):
+    if t < 1e-3:
+        return f"{t * 1e6:.2f} us"
+    if t < 1:
+        return f"{t * 1e3:.2f} ms"
+    return f"{t:.2f} s"
+
+# Formats a byte count with a binary unit.
+def format_bytes(n):
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Minesweeper engine hot paths.")
+    parser.add_argument("-c", "--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("-s", "--sizes", nargs="+", type=int, default=[10, 100, 500, 2000],
+                        help="square board sizes (N for an NxN board)")
+    parser.add_argument("--storage", nargs="+", default=["list"], choices=["list", "packed", "array"],
+                        help="board storage to benchmark (array needs NumPy)")
+    parser.add_argument("--memory", type=int, metavar="N",
+                        help="only report memory per cell of an NxN board for each --storage")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--save", help="write these results as JSON (e.g. a new baseline)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown or memory growth before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        print_memory_report(args.storage, args.memory)
+        return
+
+    if "draw" in args.cases:
+        # Offscreen rendering, no window needed
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        pygame.font.init()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'case':<36} {'time/op':>12} {'peak mem':>12} {'vs baseline':>12}")
+    for storage in args.storage:
+        for name in args.cases:
+            for n in args.sizes:
+                key = f"{name}/{storage}/{n}x{n}"
+                case, idempotent = CASES[name]
+                setup, op = case(storage, n, n)
+                res = run_case(setup, op, idempotent)
+                results[key] = res
+                change = ""
+                base = baseline.get(key)
+                if base:
+                    ratio = res["seconds"] / base["seconds"] if base["seconds"] > 0 else 1.0
+                    change = f"{100 * (ratio - 1):+.0f}%"
+                    memRatio = res["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] > 0 else 1.0
+                    if ratio > 1 + args.tolerance or memRatio > 1 + args.tolerance:
+                        regressions.append(key)
+                        change += " REGRESSED"
+                print(f"{key:<36} {format_seconds(res['seconds']):>12} {format_bytes(res['peak_bytes']):>12} {change:>12}",
+                      flush=True)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+# Calls main function.
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@ File: board.py
 Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
 Date: 9/10/25
 Purpose: Create & manage 2D grid, insert mines, compute adjacent mines, 
-calculates mines left, check if victory.
+calculates mines left, check if victory. Pure game logic with no PyGame dependency, so
+it can run headless; renderer.py draws it.
 Inputs: None.
 Outputs: None.
 External Sources: None.
@@ -13,18 +14,44 @@ External Sources: None.
 import random
 from cell import Cell
 from config import *
-import pygame
 import time
+# Board class for a storage name (the storage attribute of each board class).
+def board_class(storage):
+    if storage == "packed":
+        from packedBoard import PackedBoard
+        return PackedBoard
+    if storage == "array":
+        from arrayBoard import ArrayBoard
+        return ArrayBoard
+    if storage == "chunked":
+        from chunkedBoard import ChunkedBoard
+        return ChunkedBoard
+    return Board
+
+# Bits of a cell in cell_bytes().
+CLICKED_BIT = 1
+FLAGGED_BIT = 2
+MINE_BIT = 4
+ADJ_SHIFT = 3 # bits 3-6: adjacent mine count
+
 # Class for handing the board.
 class Board:
-    def __init__(self, rows, cols, mine_count, ai_mode, difficulty):
+    storage = "list" # storage name, see board_class()
+
+    def __init__(self, rows, cols, mine_count, ai_mode, difficulty, seed=None):
         self.rows = rows # number of rows
         self.cols = cols # number of cols
         self.mine_count = mine_count # mine count
+        # Mine layout seed; one is drawn when not given so every game can be reproduced.
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        # Optional callable(board, first click) giving (layout id, mine positions), or None
+        # for a seeded random layout (e.g. noGuess.LayoutPool.layout_for).
+        self.layout_source = None
+        self.layout_id = None # id of the layout layout_source gave, to rebuild it for replays
         self.difficulty = difficulty
         self.ai_mode = ai_mode
-        self.gridSurface = pygame.Surface((WIDTH, HEIGHT - GAME_STATE_OBJ_SIZE)) # grid surface with PyGame
-        self.grid = [[Cell(r, c, 0) for c in range(cols)] for r in range(rows)] # Fills grid with proper row and col count with '0' cell state.
+        self.grid = self.build_grid() # Fills grid with proper row and col count with '0' cell state.
         self.gameOver = False # bool to check if game over (mine clicked on grid)
         self.victory = False # bool to check if won
         self.player_name = "Player"
@@ -32,115 +59,141 @@ class Board:
         self.best_time_holder = None # name tied to best time
         self.start_time = None # used for timer
         self.elapsed_time_seconds = 0 # value of timer
+        # Running counters so victory and flag queries don't scan the grid.
+        self.covered_safe = rows * cols # covered non-mine cells (every cell until mines are placed)
+        self.flags_placed = 0 # flagged cells
+        self.revealed_count = 0 # revealed cells, mines included
+        # Cells whose look changed since the renderer last drew them.
+        self.dirty_cells = []
+        self.dirty_all = True # whole board needs drawing (also set when too many cells changed)
+        self.listeners = [] # callables told about changed cells (e.g. the AI's frontier index)
+
+    # Creates the grid of cells; storage-specific boards override this.
+    def build_grid(self):
+        return [[Cell(r, c, 0) for c in range(self.cols)] for r in range(self.rows)]
 
     def set_player_name(self, name: str):
         self.player_name = name if name else "Player"
 
     # Calculate flag count by subtracting flags from mines
     def flag_count(self):
-        flags = sum(cell.isFlagged for row in self.grid for cell in row)
-        return max(self.mine_count - flags, 0)
-        
-    # Draws the board.
-    def draw(self, screen):
-        # Clear once per frame (moved out of the loop)
-        self.gridSurface.fill((210, 210, 210))
-        for row in self.grid:
-            for cell in row:
-                cell.draw(self.gridSurface)
-        screen.blit(self.gridSurface, (0, GAME_STATE_OBJ_SIZE))
-        # Renders how many flags are placed.
-        font = pygame.font.SysFont(None, 36)
-        flags_text = font.render(f"Flag count: {self.flag_count()}", True, (0, 0, 0))
-        screen.blit(flags_text, (10, 10))
-
-        # Render how many mines there are total
-        mines_text = font.render(f"Mine count: {self.mine_count}", True, (0, 0, 0))
-        screen.blit(mines_text, (10, 40))
-
-        # Render how the AI difficulty
-        if self.ai_mode == "y":     
-            if self.difficulty in ["easy", "medium", "hard"]:
-                mines_text = font.render(f"AI difficulty: {self.difficulty}", True, (0, 0, 0))        
-        else:
-            mines_text = font.render(f"AI mode disabled", True, (0, 0, 0))  
-        screen.blit(mines_text, (10, 70))
-
-        # Render labels for columns
-        for c in range(self.cols):
-            colLabel = font.render(chr(65 + c), True, TEXT_COLOR)
-            screen.blit(colLabel, (c * CELL_SIZE + 10, (GAME_STATE_OBJ_SIZE)-(CELL_SIZE/2) - 10))
-
-        # Render labels for rows
-        for r in range(self.rows):
-            rowLabel = font.render(str(r + 1), True, TEXT_COLOR)
-            grid_right_edge = COLS * CELL_SIZE   # end of grid
-            label_x = grid_right_edge + 10       # row numbers appear right after grid
-            label_y = (GAME_STATE_OBJ_SIZE) + (r * CELL_SIZE) + 10
-            screen.blit(rowLabel, (label_x, label_y))
+        return max(self.mine_count - self.flags_placed, 0)
 
-        #player & future timer/highscore
-        footer_font = pygame.font.SysFont(None, 28)
-        # --- Footer: one-line status ---
-        footer_y = HEIGHT - EXTRA_HEIGHT + 10
+    # Reveals from (row, col) and updates the counters. Returns the newly revealed cells.
+    def reveal(self, row, col):
+        return self.reveal_many(((row, col),))
 
-        # Initial high score label
-        hs_label = "No high scores recorded"
-        if self.best_time_seconds and self.best_time_holder:
-            m, s = divmod(int(self.best_time_seconds), 60)
-            hs_label = f"{self.difficulty} - {m:02d}:{s:02d} by {self.best_time_holder}"
-
-        line = f"High score: {hs_label}"
-
-        # Fit-to-width: try smaller fonts if needed
-        for size in (28, 24, 20, 18):
-            footer_font = pygame.font.SysFont(None, size)
-            line_surf = footer_font.render(line, True, (0, 0, 0))
-            if line_surf.get_width() <= WIDTH - 20:
-                break
+    # Reveals from each (row, col) in turn, then updates the counters and notifies the
+    # renderer and listeners once for the whole batch. Returns the newly revealed cells.
+    def reveal_many(self, positions):
+        grid = self.grid
+        parts = []
+        mines = 0
+        for row, col in positions:
+            cell = grid[row][col]
+            revealed = cell.revealGrid(grid)
+            if revealed:
+                parts.append(revealed)
+                # A flood fill never reaches a mine, so only the clicked cell can be one.
+                if cell.cellState == 3:
+                    mines += 1
+        # A single fill is passed on as is (storage-specific boards return compact sequences)
+        revealed = parts[0] if len(parts) == 1 else [cell for part in parts for cell in part]
+        self.revealed_count += len(revealed)
+        self.covered_safe -= len(revealed) - mines
+        self.cells_changed(revealed)
+        return revealed
 
-        screen.blit(line_surf, (10, 590))
+    # Toggles the flag on a covered cell. Returns True if the flag changed.
+    def toggle_flag(self, row, col):
+        cell = self.grid[row][col]
+        if cell.isClicked:
+            return False
+        cell.isFlagged = not cell.isFlagged
+        self.flags_placed += 1 if cell.isFlagged else -1
+        self.cells_changed((cell,))
+        return True
 
+    # Called after cells are revealed or (un)flagged: marks them for redraw and tells listeners.
+    def cells_changed(self, cells):
+        self.mark_dirty(cells)
+        for listener in self.listeners:
+            listener(cells)
 
+    # Records changed cells for the renderer. Past a quarter of the board (or DIRTY_CELL_LIMIT
+    # cells, since a full redraw only covers the visible window) a full redraw is cheaper, so
+    # the list is dropped; this also keeps it bounded when nothing renders.
+    def mark_dirty(self, cells):
+        if self.dirty_all:
+            return
+        if len(self.dirty_cells) + len(cells) > min(self.rows * self.cols / 4, DIRTY_CELL_LIMIT):
+            self.dirty_all = True
+            self.dirty_cells = []
+        else:
+            self.dirty_cells.extend(cells)
+        
     # Places mines on board.
     def addMines(self, safe_rc):
-        # Skip the first-clicked safe cell when placing mines
+        for pos in self.mine_layout(safe_rc):
+            r, c = divmod(pos, self.cols)
+            self.grid[r][c].cellState = 3  # mine
+
+    # Sorted flat positions (row * cols + col) of the first click and its neighbours, plus
+    # how many cells are left for mines. Raises ValueError if mine_count doesn't fit.
+    def safe_zone(self, safe_rc):
         safe_r, safe_c = safe_rc
-        # Safe zone for first clicked and neighbors.
-        safe_zone = set()
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                nr, nc = safe_r + dr, safe_c + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    safe_zone.add((nr, nc))
-        # Randomly places mines until reaches mine count.
-        placed = 0
-        while placed < self.mine_count:
-            r = random.randint(0, self.rows - 1)
-            c = random.randint(0, self.cols - 1)
-            # Passes if in safe zone.
-            if (r, c) in safe_zone:
-                continue
-            # If cell empty, place mine.
-            if self.grid[r][c].cellState == 0:
-                self.grid[r][c].cellState = 3  # mine
-                placed += 1
+        zone = sorted(nr * self.cols + nc
+                      for nr in range(max(safe_r - 1, 0), min(safe_r + 2, self.rows))
+                      for nc in range(max(safe_c - 1, 0), min(safe_c + 2, self.cols)))
+        allowed = self.rows * self.cols - len(zone)
+        if not 0 <= self.mine_count <= allowed:
+            raise ValueError(f"Cannot place {self.mine_count} mines: only {allowed} cells are outside the safe zone")
+        return zone, allowed
+
+    # Picks mine_count distinct flat positions outside the safe zone, sampled directly from
+    # the allowed cells so it takes bounded time at any density.
+    def mine_positions(self, safe_rc):
+        # Skip the first-clicked safe cell and its neighbours when placing mines
+        zone, allowed = self.safe_zone(safe_rc)
+        positions = self.rng.sample(range(allowed), self.mine_count)
+        # Shift each sample past the safe cells at or before it (at most 9 of them).
+        for i, pos in enumerate(positions):
+            for s in zone:
+                if pos >= s:
+                    pos += 1
+            positions[i] = pos
+        return positions
+
+    # Flat mine positions for the first click at safe_rc: from layout_source when it has a
+    # layout, otherwise sampled from the seed by mine_positions.
+    def mine_layout(self, safe_rc):
+        if self.layout_source is not None:
+            layout = self.layout_source(self, safe_rc)
+            if layout is not None:
+                self.layout_id, positions = layout
+                return positions
+        return self.mine_positions(safe_rc)
 
     # Calls the add mine function and computes neighbors.
     def insertMines(self, safe_rc):
         # Place mines away from safe cell and compute numbers once
         self.addMines(safe_rc)
+        self.covered_safe -= self.mine_count
         self.compute_adjacents()
         self.minesPlaced = True
 
     # Reveal all mines on board
     def revealMines(self):
         # iterate through grid and for each cell if there's a mine reveal it
+        mines = []
         for row in self.grid:
             for cell in row:
                 # if cellState is a mine, reveal that cell
-                if cell.cellState == 3:
+                if cell.cellState == 3 and not cell.isClicked:
                     cell.isClicked = True # reveal cell
+                    mines.append(cell)
+        self.revealed_count += len(mines)
+        self.cells_changed(mines)
         
     # Count adjacent mines once after placement.
     def compute_adjacents(self):
@@ -166,15 +219,54 @@ class Board:
                 # Number of adjacent mines.
                 cell.adjMines = cnt
 
-    #Check if there are any covered left (victory)
-    def victoryCheck(self):
-        # Iterates through the grid and if no covered game is over with win.
-        coveredcount = 0
+    # One byte per cell in row-major order: CLICKED_BIT, FLAGGED_BIT, MINE_BIT and the
+    # adjacent count. The same encoding for every storage, so states can be compared and saved.
+    def cell_bytes(self):
+        return bytes((cell.isClicked * CLICKED_BIT) | (cell.isFlagged * FLAGGED_BIT) |
+                     ((cell.cellState == 3) * MINE_BIT) | (cell.adjMines << ADJ_SHIFT)
+                     for row in self.grid for cell in row)
+
+    # Sets every cell from cell_bytes() output. Counters are the caller's to restore.
+    def load_cell_bytes(self, data):
+        i = 0
         for row in self.grid:
             for cell in row:
-                if cell.cellState == 0:
-                    coveredcount += 1
-        if coveredcount == 0:
+                b = data[i]
+                i += 1
+                cell.isClicked = bool(b & CLICKED_BIT)
+                cell.isFlagged = bool(b & FLAGGED_BIT)
+                cell.cellState = 3 if b & MINE_BIT else (2 if b & CLICKED_BIT else 0)
+                cell.adjMines = b >> ADJ_SHIFT
+        self.dirty_all = True
+
+    # cell_bytes() encoding of just the given flat positions, in order.
+    def cell_codes(self, positions):
+        grid, cols = self.grid, self.cols
+        out = bytearray(len(positions))
+        for k, i in enumerate(positions):
+            cell = grid[i // cols][i % cols]
+            out[k] = ((cell.isClicked * CLICKED_BIT) | (cell.isFlagged * FLAGGED_BIT) |
+                      ((cell.cellState == 3) * MINE_BIT) | (cell.adjMines << ADJ_SHIFT))
+        return bytes(out)
+
+    # Sets the cells at the given flat positions from cell_codes() output and marks them
+    # for redraw. Counters are the caller's to restore.
+    def load_cell_codes(self, positions, codes):
+        grid, cols = self.grid, self.cols
+        cells = []
+        for i, b in zip(positions, codes):
+            cell = grid[i // cols][i % cols]
+            cell.isClicked = bool(b & CLICKED_BIT)
+            cell.isFlagged = bool(b & FLAGGED_BIT)
+            cell.cellState = 3 if b & MINE_BIT else (2 if b & CLICKED_BIT else 0)
+            cell.adjMines = b >> ADJ_SHIFT
+            cells.append(cell)
+        self.mark_dirty(cells)
+
+    #Check if there are any covered left (victory)
+    def victoryCheck(self):
+        # Game is over with a win once no covered safe cells remain.
+        if self.covered_safe == 0:
             self.gameOver = True
             self.victory = True
 
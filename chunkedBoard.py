@@ -0,0 +1,287 @@
+'''
+File: chunkedBoard.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Endless Board mode. The world is every cell right of and below the top-left
+corner, split into CHUNK_SIZE x CHUNK_SIZE chunks. A chunk's mines are generated the first
+time they are needed from the world seed and the chunk's coordinates, so the same seed always
+gives the same world. Adjacent counts are worked out per cell and read across chunk edges.
+Memory grows with the explored area only: chunks with nothing revealed or flagged are
+evicted when too many are loaded and are regenerated identically on demand.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import math
+import random
+from board import Board
+from config import *
+
+UNKNOWN = 255 # adjacent count not computed yet
+
+# State of one chunk: the mine layout (regenerable) and what the player did (kept).
+class Chunk:
+    __slots__ = ("key", "mines", "adj", "clicked", "flagged", "touched")
+
+    def __init__(self, key, size):
+        self.key = key # (chunk row, chunk col)
+        self.mines = None # 1 per mine, generated on first use
+        self.adj = bytearray([UNKNOWN]) * (size * size) # cached adjacent counts
+        self.clicked = bytearray(size * size)
+        self.flagged = bytearray(size * size)
+        self.touched = 0 # revealed or flagged cells; chunks at 0 can be evicted
+
+# Cell-like view onto one position of a ChunkedBoard.
+class ChunkCell:
+    __slots__ = ("board", "row", "col")
+
+    def __init__(self, board, row, col):
+        self.board = board
+        self.row = row # y pos of grid
+        self.col = col # x pos of grid
+
+    @property
+    def cellState(self):
+        if self.board.is_mine(self.row, self.col):
+            return 3
+        return 2 if self.isClicked else 0
+
+    # Safe cells show as revealed through isClicked and mines come from the chunk layout,
+    # so there is nothing to store (InputHandler marks the first click as 2).
+    @cellState.setter
+    def cellState(self, value):
+        pass
+
+    @property
+    def isClicked(self):
+        chunk, i = self.board.peek(self.row, self.col)
+        return chunk is not None and bool(chunk.clicked[i])
+
+    @isClicked.setter
+    def isClicked(self, value):
+        chunk, i = self.board.locate(self.row, self.col)
+        self.board.set_mark(chunk, chunk.clicked, i, value)
+
+    @property
+    def isFlagged(self):
+        chunk, i = self.board.peek(self.row, self.col)
+        return chunk is not None and bool(chunk.flagged[i])
+
+    @isFlagged.setter
+    def isFlagged(self, value):
+        chunk, i = self.board.locate(self.row, self.col)
+        self.board.set_mark(chunk, chunk.flagged, i, value)
+
+    @property
+    def adjMines(self):
+        return self.board.adjacent(self.row, self.col)
+
+    # Flood-fill reveal, done directly on the board's chunks.
+    def revealGrid(self, grid):
+        return self.board.reveal_region(self.row, self.col)
+
+# One row of a ChunkedBoard grid.
+class _RowView:
+    __slots__ = ("board", "row")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __getitem__(self, col):
+        return ChunkCell(self.board, self.row, col)
+
+# grid[r][c] access for a ChunkedBoard. The grid is endless, so it has no length.
+class _GridView:
+    __slots__ = ("board",)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, row):
+        return _RowView(self.board, row)
+
+# Board with no right or bottom edge, generated and stored chunk by chunk.
+class ChunkedBoard(Board):
+    storage = "chunked"
+
+    def __init__(self, ai_mode, difficulty, seed=None, density=INFINITE_MINE_DENSITY, chunk_size=CHUNK_SIZE):
+        # Denser than this, the zero-cell regions a reveal opens are always finite
+        if not MIN_INFINITE_MINE_DENSITY <= density < 1:
+            raise ValueError(f"Mine density must be between {MIN_INFINITE_MINE_DENSITY} and 1")
+        self.density = density # fraction of each chunk that is mines
+        self.chunk_size = chunk_size
+        self.chunks = {} # (chunk row, chunk col) -> Chunk, in load order
+        self.layouts = {} # mine layouts of chunks read but not loaded, by key
+        self.touched_chunks = 0 # loaded chunks holding revealed or flagged cells
+        self.safe_cells = set() # first click and its neighbours, kept free of mines
+        self.minesPlaced = False
+        # Unbounded size and mine count; the counters built from them stay infinite
+        super().__init__(math.inf, math.inf, math.inf, ai_mode, difficulty, seed)
+
+    # Returns the grid view; chunks are created as they are reached.
+    def build_grid(self):
+        return _GridView(self)
+
+    # An endless board has no fixed cell array to encode or restore, so saves, replay digests
+    # and server deltas refuse it.
+    def cell_bytes(self):
+        raise TypeError("the endless board has no fixed cell array")
+
+    def load_cell_bytes(self, data):
+        raise TypeError("the endless board has no fixed cell array")
+
+    def cell_codes(self, positions):
+        raise TypeError("the endless board has no fixed cell array")
+
+    def load_cell_codes(self, positions, codes):
+        raise TypeError("the endless board has no fixed cell array")
+
+    # The HUD shows flags placed, since the mines never run out.
+    def flag_count(self):
+        return self.flags_placed
+
+    # Chunk for a key, created (and untouched chunks evicted) if it isn't loaded.
+    def chunk(self, key):
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if len(self.chunks) - self.touched_chunks >= MAX_UNTOUCHED_CHUNKS:
+                self.evict(MAX_UNTOUCHED_CHUNKS // 2)
+            chunk = self.chunks[key] = Chunk(key, self.chunk_size)
+        return chunk
+
+    # (chunk, index in the chunk) of a cell.
+    def locate(self, row, col):
+        size = self.chunk_size
+        cr, r = divmod(row, size)
+        cc, c = divmod(col, size)
+        return self.chunk((cr, cc)), r * size + c
+
+    # (chunk, index in the chunk) of a cell, with None for a chunk that isn't loaded. Reads go
+    # through here, so looking at the board never loads or evicts a chunk.
+    def peek(self, row, col):
+        size = self.chunk_size
+        cr, r = divmod(row, size)
+        cc, c = divmod(col, size)
+        return self.chunks.get((cr, cc)), r * size + c
+
+    # Drops the oldest untouched chunks, keeping the newest `keep`. Their mines are
+    # regenerated identically if they are needed again.
+    def evict(self, keep=0):
+        untouched = [key for key, chunk in self.chunks.items() if not chunk.touched]
+        for key in untouched[:max(len(untouched) - keep, 0)]:
+            del self.chunks[key]
+
+    # Sets or clears a revealed/flag mark and keeps the touched counts in step.
+    def set_mark(self, chunk, marks, i, value):
+        value = 1 if value else 0
+        if marks[i] == value:
+            return
+        marks[i] = value
+        if value and not chunk.touched:
+            self.touched_chunks += 1
+        chunk.touched += 1 if value else -1
+        if not chunk.touched:
+            self.touched_chunks -= 1
+
+    # Mine layout of the chunk at key: a fixed share of its cells, sampled with a generator
+    # seeded by the world seed and the chunk coordinates, minus the first click's safe zone.
+    # Layouts of chunks that aren't loaded are kept in a small cache of their own.
+    def layout(self, key):
+        mines = self.layouts.get(key)
+        if mines is None:
+            size = self.chunk_size
+            n = size * size
+            rng = random.Random(f"{self.seed}:{key[0]}:{key[1]}")
+            mines = bytearray(n)
+            for i in rng.sample(range(n), round(n * self.density)):
+                mines[i] = 1
+            cr, cc = key
+            for r, c in self.safe_cells:
+                if r // size == cr and c // size == cc:
+                    mines[(r % size) * size + c % size] = 0
+            if len(self.layouts) >= MAX_UNTOUCHED_CHUNKS:
+                self.layouts.clear()
+            self.layouts[key] = mines
+        return mines
+
+    # Mine layout of a loaded chunk, generated on first use.
+    def chunk_mines(self, chunk):
+        if chunk.mines is None:
+            chunk.mines = self.layout(chunk.key)
+            del self.layouts[chunk.key]
+        return chunk.mines
+
+    # 1 if (row, col) is a mine. Nothing is a mine before the first click.
+    def is_mine(self, row, col):
+        if not self.minesPlaced or row < 0 or col < 0:
+            return 0
+        chunk, i = self.peek(row, col)
+        if chunk is None:
+            size = self.chunk_size
+            return self.layout((row // size, col // size))[i]
+        return self.chunk_mines(chunk)[i]
+
+    # Mines around (row, col), reading neighbouring chunks at the edges; 0 for mines. Counts
+    # are cached in loaded chunks only.
+    def adjacent(self, row, col):
+        if not self.minesPlaced:
+            return 0
+        chunk, i = self.peek(row, col)
+        if chunk is not None and chunk.adj[i] != UNKNOWN:
+            return chunk.adj[i]
+        cnt = 0
+        if not self.is_mine(row, col):
+            for nr in range(row - 1, row + 2):
+                for nc in range(col - 1, col + 2):
+                    cnt += self.is_mine(nr, nc)
+        if chunk is not None:
+            chunk.adj[i] = cnt
+        return cnt
+
+    # Records the safe zone around the first click. Mines and counts are generated lazily.
+    def insertMines(self, safe_rc):
+        safe_r, safe_c = safe_rc
+        self.safe_cells = {(nr, nc)
+                           for nr in range(max(safe_r - 1, 0), safe_r + 2)
+                           for nc in range(max(safe_c - 1, 0), safe_c + 2)}
+        self.minesPlaced = True
+
+    # Iterative flood fill over coordinates; returns the newly revealed cells.
+    def reveal_region(self, row, col):
+        chunk, i = self.locate(row, col)
+        if chunk.clicked[i] or chunk.flagged[i]:
+            return []
+        self.set_mark(chunk, chunk.clicked, i, True)
+        revealed = []
+        stack = [(row, col)]
+        while stack:
+            r, c = stack.pop()
+            revealed.append(ChunkCell(self, r, c))
+            # Mines and numbered cells stop the fill
+            if self.is_mine(r, c) or self.adjacent(r, c):
+                continue
+            for nr in range(max(r - 1, 0), r + 2):
+                for nc in range(max(c - 1, 0), c + 2):
+                    chunk, i = self.locate(nr, nc)
+                    if not chunk.clicked[i] and not chunk.flagged[i]:
+                        self.set_mark(chunk, chunk.clicked, i, True)
+                        stack.append((nr, nc))
+        return revealed
+
+    # Reveals the mines of every loaded chunk (the explored area).
+    def revealMines(self):
+        mines = []
+        if self.minesPlaced:
+            size = self.chunk_size
+            for (cr, cc), chunk in list(self.chunks.items()):
+                layout = self.chunk_mines(chunk)
+                for i in range(size * size):
+                    if layout[i] and not chunk.clicked[i]:
+                        self.set_mark(chunk, chunk.clicked, i, True)
+                        r, c = divmod(i, size)
+                        mines.append(ChunkCell(self, cr * size + r, cc * size + c))
+        self.revealed_count += len(mines)
+        self.cells_changed(mines)
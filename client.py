@@ -0,0 +1,184 @@
+'''
+File: client.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: PyGame client for server.py. The game runs on the server: clicks are sent as reveal,
+chord and flag actions, and the deltas that come back are written into a local PackedBoard
+that only holds what the player can see. BoardRenderer draws that board as usual, redrawing
+just the cells each delta changed.
+Inputs: Command line options (see --help); deltas from the server.
+Outputs: Actions to the server.
+External Sources: None.
+'''
+
+# Imports.
+import argparse
+import collections
+import select
+import socket
+import sys
+import time
+import pygame
+from config import *
+from packedBoard import PackedBoard
+from protocol import *
+from renderer import BoardRenderer
+from settings import parse_board_size, mine_bounds
+
+# Connection to the server and the board mirrored from its deltas.
+class RemoteGame:
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = bytearray() # received bytes not yet split into messages
+        self.sent = collections.deque() # send times of actions still waiting for a reply
+        self.latency_ms = None # round trip of the last answered action
+        self.board = None # mirror of the current game, set by GAME
+
+    # Sends a message and notes when, to time the reply.
+    def send(self, message):
+        self.sock.sendall(message)
+        self.sent.append(time.perf_counter())
+
+    # Handles every message that has arrived, without blocking (or waiting up to timeout
+    # seconds for the first one). Raises ConnectionError once the server has gone.
+    def poll(self, timeout=0):
+        while select.select([self.sock], [], [], timeout)[0]:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("the server closed the connection")
+            self.buffer += data
+            timeout = 0
+        for msg_type, payload in split_messages(self.buffer):
+            if self.sent:
+                self.latency_ms = (time.perf_counter() - self.sent.popleft()) * 1000
+            if msg_type == GAME:
+                rows, cols, mines = GAME_MSG.unpack(payload)
+                self.board = PackedBoard(rows, cols, mines, "n", "no_ai")
+            elif msg_type == DELTA:
+                self.apply(payload)
+            elif msg_type == ERROR:
+                print("Server:", payload.decode("utf-8", errors="replace"))
+
+    # Writes a delta into the mirror board; the timer runs from the first reveal.
+    def apply(self, payload):
+        board = self.board
+        status, flags, positions, codes = read_delta(payload)
+        board.load_cell_codes(positions, codes)
+        board.flags_placed = flags
+        if positions and board.start_time is None and not board.gameOver:
+            board.start_timer()
+        if status & GAME_OVER and not board.gameOver:
+            board.gameOver = True
+            board.victory = bool(status & VICTORY)
+            board.stop_timer()
+
+# Opens the connection given on the command line.
+def connect(args):
+    if args.unix:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(args.unix)
+    else:
+        sock = socket.create_connection((args.host, args.port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Minesweeper on a server.py server.")
+    parser.add_argument("--host", default=SERVER_HOST, help="server address")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="server TCP port")
+    parser.add_argument("--unix", metavar="PATH", help="connect to this UNIX socket instead of TCP")
+    parser.add_argument("--size", default=f"{ROWS}x{COLS}", help="board size as ROWSxCOLS")
+    parser.add_argument("--mines", type=int, help="number of mines (default: the middle of the allowed range)")
+    args = parser.parse_args(argv)
+    try:
+        rows, cols = parse_board_size(args.size)
+    except ValueError as e:
+        parser.error(str(e))
+    if rows * cols > SERVER_MAX_CELLS:
+        parser.error(f"the server hosts boards of up to {SERVER_MAX_CELLS} cells")
+    lo, hi = mine_bounds(rows, cols)
+    mines = args.mines if args.mines is not None else (lo + hi) // 2
+
+    try:
+        game = RemoteGame(connect(args))
+        game.send(new_game_message(rows, cols, mines))
+        game.poll(timeout=5)
+    except OSError as e:
+        sys.exit(f"Can't reach the server: {e}")
+    if game.board is None:
+        sys.exit("The server didn't start a game.")
+
+    pygame.display.init()
+    pygame.font.init()
+    renderer = BoardRenderer(game.board)
+    screen = pygame.display.set_mode(renderer.window_size())
+    width, height = screen.get_size()
+    pygame.display.set_caption("Minesweeper (online)")
+    reset_btn_rect = pygame.Rect(width - 110, 40, 100, 30)
+    clock = pygame.time.Clock()
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+                break
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+                continue
+            if renderer.handle_scroll(event):
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                game.send(new_game_message(rows, cols, mines))
+                continue
+            if event.type != pygame.MOUSEBUTTONDOWN:
+                continue
+            if event.button == 1 and reset_btn_rect.collidepoint(event.pos):
+                game.send(new_game_message(rows, cols, mines))
+                continue
+            # Clicks go to the server; the board changes when its delta arrives
+            rc = renderer.cell_at(event.pos)
+            if rc is None or game.board.gameOver:
+                continue
+            row, col = rc
+            cell = game.board.grid[row][col]
+            if event.button == 1:
+                if cell.isClicked:
+                    game.send(action_message(CHORD, row, col))
+                elif not cell.isFlagged:
+                    game.send(action_message(REVEAL, row, col))
+            elif event.button == 3 and not cell.isClicked:
+                game.send(action_message(FLAG, row, col))
+
+        try:
+            game.poll()
+        except OSError as e:
+            print(e)
+            break
+        # A new game replaces the mirror board
+        board = game.board
+        if renderer.board is not board:
+            renderer = BoardRenderer(board)
+
+        renderer.draw(screen)
+        if board.victory:
+            status = "You Win!"
+        elif board.gameOver:
+            status = "You Lose!"
+        else:
+            status = "Playing"
+        renderer.text(screen, "status", status, 36, (0, 0, 0), topright=(width - 10, 10))
+        board.update_timer()
+        renderer.text(screen, "timer", f"Time: {int(board.elapsed_time_seconds)}s", 36, (0, 0, 0), topleft=(200, 10))
+        renderer.button(screen, "reset", reset_btn_rect, "Play Again" if board.gameOver else "Reset (R)")
+        ping = f"Server round trip: {game.latency_ms:.1f} ms" if game.latency_ms is not None else ""
+        renderer.text(screen, "ping", ping, 24, (80, 80, 80), midbottom=(width // 2, height - 20))
+        pygame.display.update(renderer.flush())
+        clock.tick(FPS_CAP)
+
+    game.sock.close()
+    pygame.quit()
+
+# Calls main function.
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,32 @@ GAME_STATE_OBJ_SIZE = 150
 COL_LABEL_SIZE = 40
 EXTRA_HEIGHT = 150 # Pixels of padding on the bottom
 EXTRA_WIDTH = 100
+TEXT_CACHE_SIZE = 256 # rendered text surfaces kept in textCache.py
+HIGH_SCORE_TOP_N = 10 # scores kept per difficulty and board configuration
+FPS_CAP = 60 # most frames drawn per second while something is changing (0 for no cap)
+IDLE_WAIT_MS = 1000 # longest the game loop sleeps waiting for input when nothing is due
+NO_GUESS_POOL_SIZE = 16 # no-guess layouts kept ready per board configuration (more cover more first clicks)
+NO_GUESS_TRIES = 200 # layouts a pool worker tries per job before giving up
+NO_GUESS_WAIT_SECONDS = 1.0 # longest a first click searches for a layout when the pool has none that fits
+NO_GUESS_MAX_CELLS = 2500 # bigger boards don't offer no-guess layouts (checking them is too slow)
+SERVER_HOST = "127.0.0.1" # address the game server listens on and clients connect to
+SERVER_PORT = 8765 # TCP port of the game server
+SERVER_MAX_CELLS = 250000 # largest board a server session may ask for
+SERVER_INLINE_CELLS = 10000 # actions on bigger boards run on a worker thread, off the event loop
+SERVER_BACKLOG = 1024 # connections the server lets queue while it accepts (load tests open thousands)
+PROFILE_WINDOW = 600 # frames (and reveals, AI moves) the profiler keeps for its overlay and export
 WIDTH = COLS * CELL_SIZE + COL_LABEL_SIZE + EXTRA_WIDTH
 HEIGHT = ROWS * CELL_SIZE + GAME_STATE_OBJ_SIZE + EXTRA_HEIGHT
+MIN_BOARD_SIZE = 4 # smallest rows or cols accepted at startup (room for the safe first click)
+MAX_BOARD_SIZE = 5000 # largest rows or cols accepted at startup
+MAX_VISIBLE_ROWS = 12 # rows shown at once; bigger boards scroll
+MAX_VISIBLE_COLS = 20 # cols shown at once; bigger boards scroll
+ARRAY_BOARD_CELLS = 250000 # boards with at least this many cells use the NumPy ArrayBoard
+DIRTY_CELL_LIMIT = 4096 # changed cells tracked individually before the renderer redraws everything
+CHUNK_SIZE = 32 # cells per side of an endless-board chunk
+INFINITE_MINE_DENSITY = 0.15 # share of mines on the endless board
+MIN_INFINITE_MINE_DENSITY = 0.12 # below this a single reveal could open an endless region
+MAX_UNTOUCHED_CHUNKS = 64 # unexplored chunks kept loaded before the oldest are evicted
 
 # Colors
 BG_COLOR = (220, 220, 220)
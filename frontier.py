@@ -0,0 +1,90 @@
+'''
+File: frontier.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Incrementally maintained frontier of a Board for the AI: the revealed numbered
+cells that still have covered neighbours, with their covered and flagged neighbour counts.
+Updated from the board's change notifications, so lookups cost in proportion to what
+changed rather than to the board size.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Class that tracks the frontier of a board.
+class FrontierIndex:
+    def __init__(self, board):
+        self.board = board
+        self.covered = {} # (r, c) -> covered, unflagged neighbours of a frontier cell
+        self.flagged = {} # (r, c) -> flagged neighbours of a frontier cell
+        self.satisfied = set() # frontier cells whose flags already account for every adjacent mine
+        self.zero_revealed = False # bool to check if any revealed cell has no adjacent mines
+        # An index made mid-game (e.g. for a loaded save) picks up the revealed and flagged cells
+        # from one scan; before the first reveal or flag there is nothing to pick up.
+        if board.revealed_count or board.flags_placed:
+            self.update(cell for row in board.grid for cell in row if cell.isClicked or cell.isFlagged)
+        board.listeners.append(self.update)
+
+    # Neighbour positions of (r, c) inside the board.
+    def neighbors(self, r, c):
+        rows, cols = self.board.rows, self.board.cols
+        return [(nr, nc)
+                for nr in range(max(r - 1, 0), min(r + 2, rows))
+                for nc in range(max(c - 1, 0), min(c + 2, cols))
+                if nr != r or nc != c]
+
+    # Board listener: re-counts the changed cells and their revealed numbered neighbours.
+    def update(self, cells):
+        grid = self.board.grid
+        affected = set()
+        for cell in cells:
+            if cell.isClicked and cell.cellState != 3:
+                if cell.adjMines == 0:
+                    self.zero_revealed = True
+                else:
+                    affected.add((cell.row, cell.col))
+            for nr, nc in self.neighbors(cell.row, cell.col):
+                n = grid[nr][nc]
+                if n.isClicked and n.cellState != 3 and n.adjMines > 0:
+                    affected.add((nr, nc))
+        for pos in affected:
+            self.recount(pos)
+
+    # Recomputes the neighbour counts and set membership of one revealed numbered cell.
+    def recount(self, pos):
+        grid = self.board.grid
+        covered = flagged = 0
+        for nr, nc in self.neighbors(*pos):
+            n = grid[nr][nc]
+            if n.isFlagged:
+                flagged += 1
+            elif not n.isClicked:
+                covered += 1
+        if covered == 0:
+            # Fully resolved, no longer part of the frontier
+            self.covered.pop(pos, None)
+            self.flagged.pop(pos, None)
+            self.satisfied.discard(pos)
+            return
+        self.covered[pos] = covered
+        self.flagged[pos] = flagged
+        if flagged == grid[pos[0]][pos[1]].adjMines:
+            self.satisfied.add(pos)
+        else:
+            self.satisfied.discard(pos)
+
+    # Frontier cells (revealed numbers that still have covered neighbours).
+    def cells(self):
+        return self.covered.keys()
+
+    # Every covered cell proven safe because a neighbouring number's mines are all flagged,
+    # in a fixed order.
+    def safe_cells(self):
+        grid = self.board.grid
+        safe = set()
+        for pos in self.satisfied:
+            for nr, nc in self.neighbors(*pos):
+                n = grid[nr][nc]
+                if not n.isClicked and not n.isFlagged:
+                    safe.add((nr, nc))
+        return sorted(safe)
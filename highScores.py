@@ -0,0 +1,166 @@
+'''
+File: highScores.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: High-score store. Keeps a top-N leaderboard per difficulty and board configuration
+(rows, cols, mines). Scores are appended to a log file one line at a time and synced to
+disk, so a crash can at worst lose the line being written. The file is read once; after
+that reads come from memory, and the cache only changes through this store's own writes.
+When the log holds many more lines than the leaderboards keep, it is compacted by writing
+a new file and atomically replacing the old one. Scores from the old one-line-per-difficulty
+file were set on 10x10 boards with an unrecorded mine count; they are read as 10x10 scores
+with an unknown mine count, ranked on every 10x10 leaderboard of their difficulty, and
+written in the new format at the next compaction.
+Inputs: highscores.txt.
+Outputs: highscores.txt.
+External Sources: None.
+'''
+
+# Imports.
+import os
+from config import *
+
+COMPACT_FACTOR = 4 # compact once the log has this many times the lines it needs to keep
+COMPACT_MIN_LINES = 100 # never bother compacting smaller logs
+# Leaderboard numbers of the old one-score-per-difficulty file (always a 10x10 board).
+LEGACY_DIFFICULTIES = {"1": "easy", "2": "medium", "3": "hard", "4": "no_ai"}
+LEGACY_SIZE = 10 # rows and cols of every old-format score
+UNKNOWN_MINES = "?" # mine count logged for old-format scores, which didn't record it
+
+# Class that stores the high scores.
+class HighScoreStore:
+    def __init__(self, path, top_n=HIGH_SCORE_TOP_N):
+        self.path = path # append-only log: difficulty,rows,cols,mines,seconds,name per line
+        self.top_n = top_n # scores kept per leaderboard
+        self.boards = None # (difficulty, rows, cols, mines) -> [(seconds, name)], fastest first
+        self.lines = 0 # lines in the log file
+        self.torn = None # byte size of the log's complete lines if it ends in a cut-off line
+
+    # Leaderboard key for a board configuration.
+    @staticmethod
+    def key(difficulty, rows, cols, mines):
+        return (difficulty, str(rows), str(cols), str(mines))
+
+    # Reads the log into memory the first time it is needed.
+    def load(self):
+        if self.boards is not None:
+            return
+        self.boards = {}
+        self.lines = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # Text after the last newline was cut off mid-write; it is skipped, and dropped
+        # before the next append
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            self.torn = end
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            self.lines += 1
+            # Old-format lines become 10x10 scores with an unknown mine count
+            legacy = self.legacy_score(line)
+            if legacy is not None:
+                difficulty, seconds, name = legacy
+                if seconds > 0:
+                    self.insert(self.key(difficulty, LEGACY_SIZE, LEGACY_SIZE, UNKNOWN_MINES), seconds, name)
+                continue
+            parts = line.split(",", 5)
+            if len(parts) != 6:
+                continue
+            difficulty, rows, cols, mines, secs, name = parts
+            try:
+                seconds = float(secs)
+            except ValueError:
+                continue
+            if seconds > 0:
+                self.insert((difficulty, rows, cols, mines), seconds, name)
+
+    # (difficulty, seconds, name) of a line in the old "number,seconds,name" format (one line
+    # per difficulty, 0 seconds for none yet), or None for any other line.
+    @staticmethod
+    def legacy_score(line):
+        parts = line.split(",", 2)
+        if len(parts) != 3 or parts[0] not in LEGACY_DIFFICULTIES:
+            return None
+        try:
+            seconds = float(parts[1])
+        except ValueError:
+            return None
+        return LEGACY_DIFFICULTIES[parts[0]], seconds, parts[2].strip()
+
+    # Puts a score into its in-memory leaderboard. Returns its 1-based rank, or None if it
+    # didn't make the top N.
+    def insert(self, key, seconds, name):
+        board = self.boards.setdefault(key, [])
+        rank = 0
+        while rank < len(board) and board[rank][0] <= seconds:
+            rank += 1
+        if rank >= self.top_n:
+            return None
+        board.insert(rank, (seconds, name))
+        del board[self.top_n:]
+        return rank + 1
+
+    # Leaderboard for a configuration as [(seconds, name)], fastest first. On a 10x10 board
+    # it includes the old-format scores of the difficulty, whatever the mine count.
+    def top(self, difficulty, rows, cols, mines):
+        self.load()
+        key = self.key(difficulty, rows, cols, mines)
+        board = self.boards.get(key, [])
+        legacy_key = self.key(difficulty, LEGACY_SIZE, LEGACY_SIZE, UNKNOWN_MINES)
+        if key[1:3] == legacy_key[1:3] and key != legacy_key and legacy_key in self.boards:
+            board = sorted(board + self.boards[legacy_key], key=lambda score: score[0])[:self.top_n]
+        return list(board)
+
+    # (seconds, name) of the fastest time for a configuration, or (None, None).
+    def best(self, difficulty, rows, cols, mines):
+        board = self.top(difficulty, rows, cols, mines)
+        return board[0] if board else (None, None)
+
+    # Records a finished game. Returns its rank on the leaderboard (old-format scores
+    # included), or None if it didn't place (nothing is written then).
+    def record(self, name, seconds, difficulty, rows, cols, mines):
+        self.load()
+        key = self.key(difficulty, rows, cols, mines)
+        name = name.replace(",", " ").replace("\n", " ")
+        # Kept at the precision the log stores
+        rounded = round(seconds, 3)
+        rank = 1 + sum(1 for s, _ in self.top(difficulty, rows, cols, mines) if s <= rounded)
+        if rank > self.top_n:
+            return None
+        self.insert(key, rounded, name)
+        self.append(f"{','.join(key)},{seconds:.3f},{name}\n")
+        if self.lines >= COMPACT_MIN_LINES and self.lines > COMPACT_FACTOR * self.kept():
+            self.compact()
+        return rank
+
+    # Number of scores held across all leaderboards.
+    def kept(self):
+        return sum(len(board) for board in self.boards.values())
+
+    # Appends one line in a single write and syncs it to disk.
+    def append(self, line):
+        if self.torn is not None:
+            os.truncate(self.path, self.torn)
+            self.torn = None
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.lines += 1
+
+    # Rewrites the log with only the leaderboard entries (old-format scores in the new
+    # format), via a synced temporary file that atomically replaces the old log.
+    def compact(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for key, board in self.boards.items():
+                for seconds, name in board:
+                    f.write(f"{','.join(key)},{seconds:.3f},{name}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.lines = self.kept()
@@ -2,76 +2,145 @@
 File: inputHandler.py
 Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
 Date: 9/15/2025
-Purpose: Input handler for user clicks. Handles input for Minesweeper.
+Purpose: Input handler for user clicks. Handles input for Minesweeper. The reveal and flag
+logic is PyGame-free so the AI and headless runs can drive a game without a display;
+PyGame is only imported when translating window events.
 Inputs: None.
 Outputs: None.
 External Sources: None.
 '''
 
 # Imports.
-import pygame
+import time
 from config import *
 
 # Handles input of user.
 class InputHandler:
-    def __init__(self, board):
+    def __init__(self, board, cell_at=None):
         # References board and tracks if first cell clicked.
         self.board = board
         self.firstClick = True
+        # Maps a window position to a board (row, col) or None; the renderer passes its
+        # viewport-aware mapping, otherwise the grid is assumed to start at the top-left cell.
+        self.cell_at = cell_at or self.grid_cell_at
+        # Optional replay.ReplayRecorder told about every action that changes the board.
+        self.recorder = None
+        # Optional profiler.FrameProfiler told how long each board reveal takes.
+        self.profiler = None
+        # Cells the last reveal_cells call clicked (one for a click, several for a chord or
+        # an AI batch), so callers can tell what the reveal uncovered.
+        self.last_revealed = []
 
-    # Centralized reveal logic used by both human input and AI decisions.
-    def reveal_cell(self, row, col):
-        
-        # bounds check
-        if not (0 <= row < ROWS and 0 <= col < COLS):
-            return False
-        cell = self.board.grid[row][col]
-        if cell.isFlagged or cell.isClicked:
+    # Default position mapping: an unscrolled grid right below the HUD.
+    def grid_cell_at(self, pos):
+        mx, my = pos
+        # Adjustment for top bar.
+        my_grid = my - GAME_STATE_OBJ_SIZE
+        if mx < 0 or my_grid < 0:
+            return None
+        # Transistion to cell coordinates.
+        row = my_grid // CELL_SIZE
+        col = mx // CELL_SIZE
+        # Ignores out of bounds clicks.
+        if not (0 <= row < self.board.rows and 0 <= col < self.board.cols):
+            return None
+        return row, col
+
+    # Centralized reveal logic used by both human input and AI decisions. actor ("human" or
+    # "ai") is only used for the replay log.
+    def reveal_cell(self, row, col, actor="human"):
+        return self.reveal_cells(((row, col),), actor)
+
+    # Reveals several cells in one board pass (the cells the AI proved safe, or a chord), with
+    # one counter update and redraw for the batch. Returns True if any cell was revealed.
+    def reveal_cells(self, positions, actor="human"):
+        board = self.board
+        grid = board.grid
+        todo = []
+        for row, col in dict.fromkeys(positions):
+            # bounds check against this board's own size
+            if not (0 <= row < board.rows and 0 <= col < board.cols):
+                continue
+            cell = grid[row][col]
+            if not cell.isFlagged and not cell.isClicked:
+                todo.append((row, col))
+        self.last_revealed = todo
+        if not todo:
             return False
-        # First click flow: place mines safely around (row,col)
+        # First click flow: place mines safely around the first cell
         if self.firstClick:
-            cell.cellState = 2
+            row, col = todo[0]
+            grid[row][col].cellState = 2
             self.firstClick = False
-            self.board.insertMines((row, col))
-            cell.revealGrid(self.board.grid)
+            board.insertMines((row, col))
+        if self.profiler is None:
+            board.reveal_many(todo)
         else:
-            cell.revealGrid(self.board.grid)
-        cell.isClicked = True
-        if cell.cellState == 3:
-            self.board.gameOver = True
-            self.board.revealMines()
+            start = time.perf_counter()
+            revealed = board.reveal_many(todo)
+            self.profiler.reveal(time.perf_counter() - start, len(revealed))
+        if any(grid[row][col].cellState == 3 for row, col in todo):
+            board.gameOver = True
+            board.revealMines()
+        # Logged one cell at a time; replaying them in order gives the same board
+        if self.recorder is not None:
+            for row, col in todo:
+                self.recorder.record("reveal", actor, row, col)
         return True
 
+    # Chording: on a revealed number whose mines are all flagged, reveals every other covered
+    # neighbour at once. Returns True if any cell was revealed.
+    def chord(self, row, col, actor="human"):
+        board = self.board
+        cell = board.grid[row][col]
+        if not cell.isClicked or cell.cellState == 3 or cell.adjMines == 0:
+            return False
+        neighbours = [(nr, nc)
+                      for nr in range(max(row - 1, 0), min(row + 2, board.rows))
+                      for nc in range(max(col - 1, 0), min(col + 2, board.cols))
+                      if nr != row or nc != col]
+        flags = sum(1 for nr, nc in neighbours if board.grid[nr][nc].isFlagged)
+        if flags != cell.adjMines:
+            return False
+        return self.reveal_cells(neighbours, actor)
+
+    # Toggles the flag on a covered cell. Returns True if the flag changed.
+    def toggle_flag(self, row, col, actor="human"):
+        if not (0 <= row < self.board.rows and 0 <= col < self.board.cols):
+            return False
+        changed = self.board.toggle_flag(row, col)
+        if changed and self.recorder is not None:
+            self.recorder.record("flag", actor, row, col)
+        return changed
+
     # Handles each input event.
     def handle_event(self, event):
+        # PyGame is only needed to interpret window events.
+        import pygame
         # Check if user exits.
         if event.type == pygame.QUIT:
             return "quit"
         # Check if left mouse button pressed & game is not over.
         elif event.type == pygame.MOUSEBUTTONDOWN and not self.board.gameOver:
-            # X & Y coordinates of mouse.
-            mx, my = event.pos
-            # Adjustment for top bar.
-            my_grid = my - GAME_STATE_OBJ_SIZE
-            if my_grid < 0:
-                return
-            # Transistion to cell coordinates.
-            row = my_grid // CELL_SIZE
-            col = mx // CELL_SIZE
-            # Ignores out of bounds clicks.
-            if not (0 <= row < ROWS and 0 <= col < COLS):
+            # Board cell under the mouse; clicks outside the grid are ignored.
+            rc = self.cell_at(event.pos)
+            if rc is None:
                 return
+            row, col = rc
             # Identifies cell.
             cell = self.board.grid[row][col]
             # Uncover cell button.
             if event.button == 1:
+                # Clicking a satisfied number chords.
+                if cell.isClicked:
+                    if self.chord(row, col):
+                        return "revealed"
                 # Makes sure cell isn't flagged and then mark as clicked.
-                if not cell.isFlagged:
+                elif not cell.isFlagged:
                     # Delegate to centralized reveal logic
                     revealed = self.reveal_cell(row, col)
                     if revealed:
                         return "revealed"
             # Right click toggles flag if cell not uncovered.
             elif event.button == 3:
-                if not cell.isClicked:
-                    cell.isFlagged = not cell.isFlagged
+                self.toggle_flag(row, col)
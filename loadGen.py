@@ -0,0 +1,185 @@
+'''
+File: loadGen.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Load generator for server.py. Worker processes each open a share of the sessions
+(one connection per session) and play them with random reveals and flags, pausing a random
+think time between actions and starting a new game whenever one ends. Every action's round
+trip is timed. The run reports actions per second and latency percentiles over the measured
+window, and reads the server's CPU time before and after it to estimate how many sessions
+one core can host at this pace.
+Inputs: Command line options (see --help).
+Outputs: Load test report on stdout; optional JSON results file.
+External Sources: None.
+'''
+
+# Imports.
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from board import CLICKED_BIT, FLAGGED_BIT
+from config import *
+from protocol import *
+from selfplay import parse_size
+
+FLAG_SHARE = 0.1 # share of actions that toggle a flag instead of revealing
+
+# Opens a connection to the server.
+async def connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+# Sends one message and waits for its reply; returns (type, payload).
+async def request(reader, writer, message):
+    writer.write(message)
+    await writer.drain()
+    return await read_message(reader)
+
+# Plays one session until `stop` (a time.time() value). Round trips that start inside the
+# measured window [measure, stop) are appended to latencies in milliseconds.
+async def play_session(args, rng, measure, stop, latencies, totals):
+    reader, writer = await connect(args)
+    rows, cols = args.size
+    cells = rows * cols
+    try:
+        game = new_game_message(rows, cols, args.mines)
+        seen = None # visible code of every cell, kept from the deltas
+        while time.time() < stop:
+            if seen is None:
+                msg = game
+                seen = bytearray(cells)
+            else:
+                if args.think > 0:
+                    await asyncio.sleep(rng.expovariate(1000 / args.think))
+                    if time.time() >= stop:
+                        break
+                # A random covered cell; most of the board stays covered in random play
+                while True:
+                    i = rng.randrange(cells)
+                    if not seen[i] & CLICKED_BIT:
+                        break
+                action = FLAG if rng.random() < FLAG_SHARE else REVEAL
+                if action == REVEAL and seen[i] & FLAGGED_BIT:
+                    action = FLAG
+                msg = action_message(action, i // cols, i % cols)
+            measured = time.time() >= measure
+            start = time.perf_counter()
+            msg_type, payload = await request(reader, writer, msg)
+            if measured:
+                latencies.append((time.perf_counter() - start) * 1000)
+                totals["actions"] += 1
+            if msg_type == ERROR:
+                raise ProtocolError(payload.decode("utf-8", errors="replace"))
+            if msg_type == DELTA:
+                status, flags, positions, codes = read_delta(payload)
+                for i, b in zip(positions, codes):
+                    seen[i] = b
+                if status & GAME_OVER:
+                    seen = None
+                    if measured:
+                        totals["games"] += 1
+    finally:
+        writer.close()
+
+# Worker process: plays `count` sessions, opened evenly over the ramp-up. Returns the
+# measured latencies (ms) and counters.
+def run_worker(job):
+    args, count, worker, measure, stop = job
+    raise_file_limit()
+    latencies = array("d")
+    totals = {"actions": 0, "games": 0, "errors": 0}
+
+    async def session(k):
+        # Spread the connects over the ramp-up so the server's accept queue keeps up
+        await asyncio.sleep(args.ramp * k / max(count, 1))
+        rng = random.Random(f"{args.seed}:{worker}:{k}")
+        try:
+            await play_session(args, rng, measure, stop, latencies, totals)
+        except (OSError, asyncio.IncompleteReadError, ProtocolError):
+            totals["errors"] += 1
+
+    async def run():
+        await asyncio.gather(*(session(k) for k in range(count)))
+
+    asyncio.run(run())
+    return latencies.tobytes(), totals
+
+# Server (sessions, actions, CPU seconds, wall seconds), read over a connection of its own.
+def server_stats(args):
+    async def fetch():
+        reader, writer = await connect(args)
+        try:
+            msg_type, payload = await request(reader, writer, pack(STATS))
+        finally:
+            writer.close()
+        return STATS_MSG.unpack(payload)
+    return asyncio.run(fetch())
+
+# Value at fraction q of sorted values.
+def percentile(values, q):
+    return values[min(int(q * len(values)), len(values) - 1)] if values else 0.0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many concurrent sessions against server.py and report latency and sessions per core.")
+    parser.add_argument("--host", default=SERVER_HOST, help="server address")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="server TCP port")
+    parser.add_argument("--unix", metavar="PATH", help="connect to this UNIX socket instead of TCP")
+    parser.add_argument("-n", "--sessions", type=int, default=1000, help="concurrent sessions")
+    parser.add_argument("-t", "--seconds", type=float, default=10, help="length of the measured window")
+    parser.add_argument("--ramp", type=float, default=2, help="seconds to open the sessions over, before measuring")
+    parser.add_argument("--think", type=float, default=500, help="mean pause between a session's actions, in ms")
+    parser.add_argument("-s", "--size", type=parse_size, default=(16, 30), help="board size, e.g. 16x30")
+    parser.add_argument("-m", "--mines", type=int, default=60, help="mine count")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random play")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--json", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    workers = max(1, min(args.workers, args.sessions))
+    # Measuring starts once every session is open; all workers share the same window
+    measure = time.time() + args.ramp + 1
+    stop = measure + args.seconds
+    jobs = [(args, args.sessions // workers + (w < args.sessions % workers), w, measure, stop)
+            for w in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = [pool.submit(run_worker, job) for job in jobs]
+        time.sleep(max(measure - time.time(), 0))
+        before = server_stats(args)
+        time.sleep(max(stop - time.time(), 0))
+        after = server_stats(args)
+        results = [job.result() for job in running]
+
+    latencies = array("d")
+    totals = {"actions": 0, "games": 0, "errors": 0}
+    for data, counts in results:
+        latencies.frombytes(data)
+        for key in totals:
+            totals[key] += counts[key]
+    latencies = sorted(latencies)
+    cpu = (after[2] - before[2]) / (after[3] - before[3]) # cores the server kept busy
+    open_sessions = before[0] - 1 # not counting the statistics connection
+    report = {"sessions": args.sessions, "open": open_sessions, "seconds": args.seconds, "think_ms": args.think,
+              "actions_per_second": totals["actions"] / args.seconds, "games": totals["games"],
+              "errors": totals["errors"],
+              "p50_ms": percentile(latencies, 0.5), "p99_ms": percentile(latencies, 0.99),
+              "max_ms": latencies[-1] if latencies else 0.0,
+              "server_cpu": cpu, "sessions_per_core": open_sessions / cpu if cpu > 0 else None}
+    print(f"{report['open']} of {args.sessions} sessions open, {report['actions_per_second']:.0f} actions/s, "
+          f"{totals['games']} games, {totals['errors']} failed sessions")
+    print(f"latency p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+    if report["sessions_per_core"] is not None:
+        print(f"server CPU {cpu:.0%} of one core: about {report['sessions_per_core']:.0f} sessions per core "
+              f"at {args.think:.0f} ms think time")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+# Calls main function.
+if __name__ == "__main__":
+    main()
@@ -9,120 +9,117 @@ External Sources: None.
 '''
 
 # Imports.
+import math
 import os
+import time
+STARTED = time.perf_counter()  # start of the startup-time report (imports are its first step)
 import pygame
 from config import *
 from board import Board
+from chunkedBoard import ChunkedBoard
+from packedBoard import PackedBoard
+from renderer import BoardRenderer
 from inputHandler import InputHandler
 from ai import AI
+from aiWorker import AIWorker
+from profiler import FrameProfiler
+from highScores import HighScoreStore
+from replay import ReplayRecorder, STORAGES as REPLAY_STORAGES
+from saveGame import save_game, load_game, STORAGES as SAVE_STORAGES
+from settings import startup_settings, parse_board_size, mine_bounds, clean_name
+from sounds import SoundBank
+from profiler import StartupTimer
+from noGuess import LayoutPool
 
 base_dir = os.path.dirname(os.path.abspath(__file__))  # get directory of current script
 HIGHSCORES_FILE = os.path.join(base_dir, "highscores.txt")  # file to track high scores
-# Loading best high score from .txt file
-def load_best_high_score(path, difficulty):
-    best, holder = None, None
-    if os.path.exists(path): # opening file
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        # each line represents the difficulty being played (or no AI)
-        while len(lines) < 4:
-            lines.append("0,None\n")
-
-        index_map = {"easy": 0, "medium": 1, "hard": 2, "no_ai": 3}
-        index = index_map[difficulty]
-
-        line = lines[index].strip()
-        if line:
-            parts = line.split(",", 2)
-            if len(parts) == 3:
-                try:
-                    secs = float(parts[1])
-                    name = parts[2].strip()
-                    if secs > 0:
-                        best, holder = secs, name
-                except ValueError:
-                    pass
-    return best, holder # returning the time and name
-
-
-# updating the high score if the time is faster
-def append_high_score(path, name, seconds, difficulty):
-    if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as f:
-            f.write("1,0,None\n")  # easy
-            f.write("2,0,None\n")  # medium
-            f.write("3,0,None\n")  # hard
-            f.write("4,0,None\n")  # no AI
-
-    with open(path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # pad if file has fewer than 4 lines
-    while len(lines) < 4:
-        lines.append(f"{len(lines)+1},0,None\n")
-
-    index_map = {"easy": 0, "medium": 1, "hard": 2, "no_ai": 3}
-    index = index_map[difficulty]
-
-    # parse current line
-    line = lines[index].strip()
-    parts = line.split(",", 2)
-    if len(parts) == 3:
-        _, old_secs_str, old_name = parts
-        try:
-            old_secs = float(old_secs_str)
-        except ValueError:
-            old_secs = 0
-    else:
-        old_secs, old_name = 0, "None"
-
-    # update if new score is faster OR no score yet
-    if old_secs == 0 or seconds < old_secs:
-        lines[index] = f"{index+1},{seconds:.3f},{name}\n"
-
-    # write back all 4 lines
-    with open(path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+REPLAYS_FILE = os.path.join(base_dir, "replays.jsonl")  # every game played, for replay.py
+SAVE_FILE = os.path.join(base_dir, "savegame.bin")  # suspended game (F5 saves, F9 restores)
+PROFILE_FILE = os.path.join(base_dir, "profile.csv")  # profiler trace (F3 shows the overlay, F4 exports)
+SETTINGS_FILE = os.path.join(base_dir, "settings.json")  # optional settings that replace the prompts
 
+# function to get the board size from user, as ROWSxCOLS ("inf" for the endless board)
+def board_size_input():
+    while True:
+        user_input = input(f"Enter the board size as ROWSxCOLS, or inf for an endless board (Enter for {ROWS}x{COLS}): ").strip().lower()
+        if not user_input:
+            return ROWS, COLS
+        try:
+            return parse_board_size(user_input)
+        except ValueError as e:
+            print(e)
 
 # function to get # mines from user
-def mine_input():
+def mine_input(lo=10, hi=20):
     # loop
     while True:
         try:
             # get user input
-            user_input = input("Enter the number of mines (10-20): ")
+            user_input = input(f"Enter the number of mines ({lo}-{hi}): ")
             mine_count = int(user_input) # mine count is the int of the user input
-            # if mine count not 10 to 20, print
-            if mine_count < 10 or mine_count > 20:
-                print("Please enter a number between 10 and 20.")
-            # mine count 10-20
+            # if mine count out of range, print
+            if mine_count < lo or mine_count > hi:
+                print(f"Please enter a number between {lo} and {hi}.")
+            # mine count in range
             else:
                 return mine_count
         # print exception
         except ValueError:
             print("Please enter a valid number.\n")
 
+# Creates the board; very large boards use the NumPy-backed ArrayBoard when NumPy is installed
+# and an infinite size gives the endless ChunkedBoard.
+def create_board(rows, cols, mine_count, ai_mode, difficulty):
+    if rows == math.inf:
+        return ChunkedBoard(ai_mode, difficulty)
+    if rows * cols >= ARRAY_BOARD_CELLS:
+        try:
+            from arrayBoard import ArrayBoard
+            return ArrayBoard(rows, cols, mine_count, ai_mode, difficulty)
+        except ImportError:
+            # Without NumPy, one byte per cell still keeps big boards small
+            print("NumPy not installed; using the packed board.")
+            return PackedBoard(rows, cols, mine_count, ai_mode, difficulty)
+    return Board(rows, cols, mine_count, ai_mode, difficulty)
+
 def player_name_input():
     while True:
-        name = input("Enter your name (1–20 chars): ").strip()
-        if 1 <= len(name) <= 20:
-            # keep only basic characters to avoid weird font issues
-            safe = "".join(ch for ch in name if ch.isalnum() or ch in " _-")
+        # keep only basic characters to avoid weird font issues
+        safe = clean_name(input("Enter your name (1–20 chars): "))
+        if safe is not None:
             return safe
         print("Please enter a non-empty name up to 20 characters.")
 
 
-# Main function.
-def main():
-    player_name = player_name_input() #ask for player name
-    # get count of mines
-    mine_count = mine_input()
-    # asking user if they want ai
-    ai_mode = input("Do you want to enable AI mode? (y/n): ").strip().lower()
+# Main function. Settings come from the command line or settings.json; the prompts ask for
+# any that are missing.
+def main(argv=None):
+    startup = StartupTimer(STARTED)
+    startup.mark("imports")
+    settings, options = startup_settings(argv, SETTINGS_FILE)
+    startup.mark("settings")
+    player_name = settings.get("name") or player_name_input() #ask for player name
+    # get board size and count of mines
+    rows, cols = settings.get("size") or board_size_input()
+    endless = rows == math.inf
+    mine_count = None
+    if not endless:
+        lo, hi = mine_bounds(rows, cols)
+        mine_count = settings.get("mines")
+        if mine_count is not None and not lo <= mine_count <= hi:
+            print(f"{mine_count} mines don't fit a {rows}x{cols} board.")
+            mine_count = None
+        if mine_count is None:
+            mine_count = mine_input(lo, hi)
+    # asking user if they want ai (the AI needs a board with edges)
+    if endless:
+        ai_mode = "n"
+    elif "ai" in settings:
+        ai_mode = "n" if settings["ai"] == "none" else "y"
+    else:
+        ai_mode = input("Do you want to enable AI mode? (y/n): ").strip().lower()
     if ai_mode == 'y':
-        difficulty = input("Select AI difficulty (easy, medium, hard): ").strip().lower()
+        difficulty = settings.get("ai") or input("Select AI difficulty (easy, medium, hard): ").strip().lower()
         if difficulty in ["easy", "medium", "hard"]:
             print(f"AI mode enabled with {difficulty} difficulty.")
         else:
@@ -131,85 +128,106 @@ def main():
         difficulty = "no_ai"
         print("AI mode disabled.")
 
-    # Sets up PyGame and the board.
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Minesweeper")
-    board = Board(ROWS, COLS, mine_count, ai_mode, difficulty)
-    board.set_player_name(player_name)
-    # load best score from file
-    best, holder = load_best_high_score(HIGHSCORES_FILE, difficulty)
-    if best is not None: #if there is a high score
-        board.best_time_seconds = best
-        board.best_time_holder = holder
+    startup.mark("prompts", waiting=True)
 
-    input_handler = InputHandler(board)
+    # No-guess boards come from a pool of checked layouts made by worker processes, started
+    # before the window so the workers don't inherit it
+    layouts = None
+    if settings.get("no_guess"):
+        if endless or rows * cols > NO_GUESS_MAX_CELLS:
+            print(f"No-guess boards are only available up to {NO_GUESS_MAX_CELLS} cells.")
+        else:
+            layouts = LayoutPool()
+            layouts.prepare(rows, cols, mine_count)
+            print("No-guess boards enabled.")
+            startup.mark("layout pool")
+    # deals pooled no-guess layouts to a board that can use them
+    def _deal_no_guess(board):
+        if layouts is not None and board.storage != "chunked" and board.rows * board.cols <= NO_GUESS_MAX_CELLS:
+            board.layout_source = layouts.layout_for
+
+    # Sets up PyGame and the board. Only the display and fonts are started here; audio
+    # starts the first time a sound plays.
+    pygame.display.init()
+    pygame.font.init()
+    startup.mark("pygame init")
+    board = create_board(rows, cols, mine_count, ai_mode, difficulty)
+    board.set_player_name(player_name)
+    _deal_no_guess(board)
+    startup.mark("board")
+    renderer = BoardRenderer(board)
+    # window sized to the viewport; bigger boards scroll inside it
+    screen = pygame.display.set_mode(renderer.window_size())
+    width, height = screen.get_size()
+    pygame.display.set_caption("Minesweeper")
+    startup.mark("window")
+    # high scores are read from disk once and then served from memory
+    scores = HighScoreStore(HIGHSCORES_FILE)
+    # shows the best time for this difficulty and board configuration
+    def _show_best():
+        best, holder = scores.best(difficulty, rows, cols, mine_count)
+        if best is not None: #if there is a high score
+            board.best_time_seconds = best
+            board.best_time_holder = holder
+    _show_best()
+
+    # times each phase of the game loop while switched on (F3)
+    profiler = FrameProfiler()
+    input_handler = InputHandler(board, renderer.cell_at)
+    input_handler.profiler = profiler
+    # log every game for replay (the endless board can't be replayed against a final state)
+    def _new_recorder():
+        return ReplayRecorder(board, input_handler) if board.storage in REPLAY_STORAGES else None
+    recorder = _new_recorder()
     # AI state for scheduled moves
     ai = None
-    ai_pending = None
+    ai_worker = AIWorker()  # computes AI moves off the game loop
     ai_waiting = False
     ai_wait_start = 0
     ai_wait_duration = 1000  #1 second
+    # first click (row, col) held back while a no-guess layout is searched for it
+    generating = None
     # track who made the last move: 'human' or 'ai' (used for end-of-game messaging)
     last_mover = None
+    # paces frames to FPS_CAP while input keeps arriving
+    clock = pygame.time.Clock()
+
+    # Milliseconds the loop can sleep until something on screen is due to change (the timer's
+    # next second or the AI's move), or None while it has to keep drawing frames.
+    def _idle_ms():
+        wait = IDLE_WAIT_MS
+        # a no-guess layout search is running: poll for it every frame
+        if generating is not None:
+            return None
+        if ai_waiting:
+            due = ai_wait_start + ai_wait_duration - pygame.time.get_ticks()
+            # past due, the AI's move is still being worked out: poll for it every frame
+            if due <= 0:
+                return None
+            wait = min(wait, due)
+        if board.start_time is not None and not board.gameOver:
+            elapsed = time.time() - board.start_time
+            wait = min(wait, math.ceil((math.floor(elapsed) + 1 - elapsed) * 1000))
+        return max(wait, 1)
 
     # If user opted into AI mode at startup, create AI instance now
     if ai_mode == 'y' and difficulty in ["easy", "medium", "hard"]:
         ai = AI(board, difficulty)
     # starting the timer
     board.start_timer()
-    # Sound
-    try:
-        # initialize pygame sound mixer if not already initialized
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
-    # print error message
-    except Exception as e:
-        print("Mixer init failed:", e)
-
-    
-
-
-
-    # helper func to build full paths to sound files
-    def _snd(name):
-        return os.path.join(base_dir, name)
-
-    # helper func to load sound files w/ error handling
-    def _load(path):
-        try:
-            return pygame.mixer.Sound(path)
-        # print error and return None instead of crashing
-        except Exception as e:
-            print(f"Sound not loaded: {path} -> {e}")
-            return None
-
-    # load sound effects
-    click_snd   = _load(_snd("audio/click.wav")) # click sounds
-    flag_snd    = _load(_snd("audio/flag.wav")) # flag sounds
-    mine_snd    = _load(_snd("audio/mine.wav")) # mine sounds
-    victory_snd = _load(_snd("audio/victory.wav")) # victory sounds
-    lose_snd    = _load(_snd("audio/lose.wav")) # lose sounds
-
-    pygame.mixer.set_num_channels(24) # allows up to 24 sounds to play simultaneously
-    FLAG_CH = pygame.mixer.Channel(5) # dedicated channel for flag sounds
+    # Sound effects: files are read in the background after the first frame, and the mixer
+    # starts when the first sound plays
+    sounds = SoundBank(os.path.join(base_dir, "audio"), enabled=settings.get("sound", True))
     last_flag_ms = 0 # timestamp for flag sound cooldown
     played_end  = False # flag to track if game ended
     # Reset / Play Again UI 
     BTN_W, BTN_H = 100, 30
     # Button lives in the HUD (top bar)
-    reset_btn_rect = pygame.Rect(430, 40, BTN_W, BTN_H)
+    reset_btn_rect = pygame.Rect(width - 110, 40, BTN_W, BTN_H)
 
     #UI Button 
     # (AI popup/button removed; AI enabled via startup prompt)
 
-    # func to draw button
-    def draw_button(surface, rect, label):
-        pygame.draw.rect(surface, (235, 235, 235), rect) # draw button's background 
-        pygame.draw.rect(surface, (100, 100, 100), rect, 2) # draw dark gray border 2 pixels wide around button
-        f = pygame.font.SysFont(None, 28) # create a font object w default font at size 28
-        txt = f.render(label, True, (0, 0, 0)) # label text is black
-        surface.blit(txt, txt.get_rect(center=rect.center)) # draw text centered within button rectangle
     # used to record a new high score
     def _record_high_score():
         # stop the timer
@@ -219,53 +237,84 @@ def main():
         if elapsed_time is None:
             return
 
-        # update file only if this run is better for the current difficulty
-        append_high_score(HIGHSCORES_FILE, board.player_name, elapsed_time, board.difficulty)
-
-        # reload the best score for this difficulty
-        best, holder = load_best_high_score(HIGHSCORES_FILE, board.difficulty)
-        if best is not None:
-            board.best_time_seconds = best
-            board.best_time_holder = holder
-
-
-
-    # func to start a new game
-    def new_game():
-        nonlocal board, input_handler, played_end, ai, ai_pending, ai_waiting, last_mover
-        # recreate board and handler
-        board = Board(ROWS, COLS, mine_count, ai_mode, difficulty)
-        board.set_player_name(player_name)
-        # load best score from file after reset so it still shows
-        best, holder = load_best_high_score(HIGHSCORES_FILE,board.difficulty)
-        if best is not None:
-            board.best_time_seconds = best
-            board.best_time_holder = holder
-
-        input_handler = InputHandler(board)
-        played_end = False
-        # reset any scheduled AI state
-        ai_pending = None
+        # logged only if this run makes the leaderboard for this difficulty and board
+        rank = scores.record(board.player_name, elapsed_time, board.difficulty, rows, cols, mine_count)
+        if rank is not None:
+            print(f"{board.player_name} placed #{rank} on the {board.difficulty} {rows}x{cols} ({mine_count} mines) leaderboard.")
+        _show_best()
+
+
+
+    # func to start a new game, or to continue a restored (board, handler) pair
+    def new_game(restored=None):
+        nonlocal board, renderer, input_handler, recorder, played_end, ai, ai_waiting, last_mover, generating
+        nonlocal rows, cols, mine_count, ai_mode, difficulty, screen, width, height, reset_btn_rect
+        # keep the log of the game being left
+        if recorder is not None:
+            recorder.save(REPLAYS_FILE)
+        if restored is None:
+            # recreate board and handler
+            board = create_board(rows, cols, mine_count, ai_mode, difficulty)
+            board.set_player_name(player_name)
+            _deal_no_guess(board)
+            renderer = BoardRenderer(board)
+            input_handler = InputHandler(board, renderer.cell_at)
+            # log every new game for replay
+            recorder = _new_recorder()
+        else:
+            # the saved game's configuration replaces the current one
+            board, input_handler = restored
+            _deal_no_guess(board)
+            rows, cols, mine_count = board.rows, board.cols, board.mine_count
+            ai_mode, difficulty = board.ai_mode, board.difficulty
+            renderer = BoardRenderer(board)
+            input_handler.cell_at = renderer.cell_at
+            # a log starting mid-game couldn't be replayed
+            recorder = None
+            if renderer.window_size() != (width, height):
+                screen = pygame.display.set_mode(renderer.window_size())
+                width, height = screen.get_size()
+                reset_btn_rect = pygame.Rect(width - 110, 40, BTN_W, BTN_H)
+        input_handler.profiler = profiler
+        # best score comes from the in-memory leaderboard so it still shows
+        _show_best()
+
+        played_end = board.gameOver
+        # reset any scheduled AI state; a move still being worked out was for the old board
+        ai_worker.cancel()
         ai_waiting = False
         last_mover = None
+        # a held first click was for the old board
+        generating = None
         # if AI mode was enabled at startup, recreate AI tied to the new board
         if ai_mode == 'y' and difficulty in ["easy", "medium", "hard"]:
             ai = AI(board, difficulty)
         else:
             ai = None
-        board.start_timer()
-
-    # Status text of game.
-    font = pygame.font.SysFont(None, 36)
-    playing_text = font.render("Playing", True, (0, 0, 0)) # text for playing
-    lose_text = font.render("You Lose!", True, (0, 0, 0)) # text for losing
-    win_text = font.render("You Win!", True, (0, 0, 0)) # text for winning
+        # a restored game's timer already runs on from its saved time
+        if restored is None:
+            board.start_timer()
+
+    # the human revealed cells: schedule the AI's answer (if AI is enabled)
+    # (the move is worked out in the background while the loop keeps drawing)
+    # (only when it has a move to make, so the indicator isn't shown for nothing)
+    def _human_revealed():
+        nonlocal last_mover, ai_waiting, ai_wait_start
+        last_mover = 'human'
+        if ai is not None and ai.has_move():
+            ai_worker.request(ai)
+            ai_waiting = True
+            ai_wait_start = pygame.time.get_ticks()
+
+    startup.mark("game setup")
 
     # Loop that checks if game still running.
     running = True
+    idle_events = []  # the event that woke the loop from idle, if any
     while running:
+        profiler.start_frame()
         # Handles user input and checks if quit.
-        for event in pygame.event.get():
+        for event in idle_events + pygame.event.get():
             # Always allow quitting and reset key even while AI is thinking
             if event.type == pygame.QUIT:
                 running = False
@@ -273,27 +322,76 @@ def main():
             if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
                 new_game()
                 continue
+            # Suspend the game to disk / pick a suspended game back up
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                # the endless board has no fixed cell array to write out
+                if board.storage not in SAVE_STORAGES:
+                    print("The endless board can't be saved.")
+                    continue
+                try:
+                    save_game(SAVE_FILE, board, input_handler)
+                    print(f"Game saved to {SAVE_FILE}")
+                except (OSError, ValueError) as e:
+                    print("Save failed:", e)
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                try:
+                    restored = load_game(SAVE_FILE)
+                except (OSError, ValueError) as e:
+                    print("Load failed:", e)
+                else:
+                    new_game(restored)
+                continue
+            # Profiler overlay on/off, and trace export
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                if not profiler.toggle():
+                    renderer.hide_overlay()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                try:
+                    profiler.export(PROFILE_FILE)
+                    print(f"Profile of the last {len(profiler.frames)} frames written to {PROFILE_FILE}")
+                except OSError as e:
+                    print("Profile export failed:", e)
+                continue
+            # Window contents were lost (e.g. uncovered), repaint everything
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+                continue
+            # Scrolling and panning move the viewport, even while the AI is thinking
+            if renderer.handle_scroll(event):
+                continue
 
-            # Block mouse clicks while AI is thinking
-            if ai_waiting and event.type == pygame.MOUSEBUTTONDOWN:
+            # Block mouse clicks while AI is thinking or a no-guess layout is being made
+            if (ai_waiting or generating is not None) and event.type == pygame.MOUSEBUTTONDOWN:
                 # still allow quitting and reset (handled above); otherwise ignore input
                 continue
 
+            # A first click no pooled no-guess layout fits is held back while one is searched
+            # for in the background; the loop keeps drawing and the click is made when it's done
+            if (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and layouts is not None
+                    and board.layout_source is not None and input_handler.firstClick):
+                rc = renderer.cell_at(event.pos)
+                if rc is not None and not board.grid[rc[0]][rc[1]].isFlagged and not layouts.fits(board, rc):
+                    layouts.start_search(board, rc)
+                    generating = rc
+                    continue
+
             # Let InputHandler handle the event (includes left-click reveal / right-click flag)
+            profiler.lap("events")
             response = input_handler.handle_event(event)
+            profiler.lap("input")
             if response == "quit":
                 running = False
                 break
             # If a human revealed a cell, schedule AI to move (if AI is enabled)
             if response == "revealed":
+                # mine sound if the click (or chord) uncovered a mine, click sound otherwise
+                grid = board.grid
+                hit = any(grid[r][c].cellState == 3 for r, c in input_handler.last_revealed)
+                sounds.play("mine" if hit else "click")
                 # human made a reveal
-                last_mover = 'human'
-                # schedule AI only if AI is enabled
-                if ai is not None and not board.gameOver:
-                    ai_pending = ai.make_move()
-                    if ai_pending and ai_pending[0] != "none":
-                        ai_waiting = True
-                        ai_wait_start = pygame.time.get_ticks()
+                _human_revealed()
 
             # --- Mouse: click Reset / Play Again button in HUD ---
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -306,68 +404,70 @@ def main():
 
             # Plays SFX after InputHandler updates the board
             if event.type == pygame.MOUSEBUTTONDOWN and not board.gameOver:
-                mx, my = event.pos # mouse position
-                my_grid = my - GAME_STATE_OBJ_SIZE # adjust Y coordinate to account for HUD height
+                rc = renderer.cell_at(event.pos) # board cell under the mouse, through the viewport
                 # only if click landed inside the grid, not on the HUD
-                if my_grid >= 0:
-                    row = my_grid // CELL_SIZE # row based on Y coord
-                    col = mx // CELL_SIZE # col based on X coord
-                    # if grid coords within bounds
-                    if 0 <= row < ROWS and 0 <= col < COLS:
-                        cell = board.grid[row][col] # get cell at calculated position
-                        # if left-click
-                        if event.button == 1:
-                            # if revealed
-                            if cell.isClicked:
-                                # if cell is a mine
-                                if cell.cellState == 3:
-                                    # play mine explosion sound if available
-                                    if mine_snd: mine_snd.play()
-                                # cell is not a mine
-                                else:
-                                    # play click sound if available
-                                    if click_snd: click_snd.play()
-                        # if right-click
-                        elif event.button == 3:
-                            # dedicated channel for right click so new play replace old ones
-                            now = pygame.time.get_ticks()
-                            # if flag sound exists & cooldown period passed
-                            if flag_snd and now - last_flag_ms >= 60:
-                                # if flag sound currently playing
-                                if FLAG_CH.get_busy():
-                                    FLAG_CH.stop() # stop flag sound
-                                FLAG_CH.play(flag_snd) # play flag sound
-                                last_flag_ms = now # update last flag sound timestamp
-
-        # If AI is waiting and duration elapsed, perform AI move
-        if ai_waiting and ai_pending and not board.gameOver:
+                if rc is not None:
+                    # if right-click (reveal sounds are played above, from what the reveal uncovered)
+                    if event.button == 3:
+                        # dedicated channel for right click so new play replace old ones
+                        now = pygame.time.get_ticks()
+                        # if cooldown period passed
+                        if now - last_flag_ms >= 60:
+                            # play flag sound, stopping the previous one if still playing
+                            sounds.play("flag", exclusive=True)
+                            last_flag_ms = now # update last flag sound timestamp
+
+        profiler.lap("events")
+
+        # The held first click's no-guess layout search is done (or gave up): make the click
+        if generating is not None and not layouts.searching:
+            row, col = generating
+            generating = None
+            if input_handler.reveal_cell(row, col):
+                sounds.play("click")
+                _human_revealed()
+
+        # The game ended (e.g. the human's reveal won it) before the AI's move came in: the
+        # move is dropped and the indicator cleared
+        if ai_waiting and board.gameOver:
+            ai_worker.cancel()
+            ai_waiting = False
+        # If AI is waiting, its move is ready and the duration elapsed, perform AI move
+        if ai_waiting:
             now = pygame.time.get_ticks()
             if now - ai_wait_start >= ai_wait_duration:
-                action, rc = ai_pending
-                if action == "reveal" and rc is not None:
-                    r, c = rc
-                    # AI is about to act
-                    last_mover = 'ai'
-                    input_handler.reveal_cell(r, c)
-                ai_pending = None
-                ai_waiting = False
-
-        # fill screen with bg color
-        screen.fill(BG_COLOR)
-        # draw screen
-        board.draw(screen)
+                move = ai_worker.result()
+                if move is not None:
+                    profiler.ai_move(ai_worker.last_seconds)
+                    action, rc = move
+                    if action == "reveal" and rc is not None:
+                        r, c = rc
+                        # AI is about to act
+                        last_mover = 'ai'
+                        input_handler.reveal_cell(r, c, actor="ai")
+                    elif action == "reveal_many":
+                        # every cell the AI proved safe, in one pass
+                        last_mover = 'ai'
+                        input_handler.reveal_cells(rc, actor="ai")
+                    ai_waiting = False
+
+        profiler.lap("ai")
+
+        # draw screen (only what changed since the last frame)
+        renderer.draw(screen)
+        profiler.lap("draw")
 
         # Checks if win, loss, or playing and blits the text.
         board.victoryCheck()
+        profiler.lap("victory")
 
         # AI thinking indicator (red) while waiting - bottom center
-        if ai_waiting:
-            f_small = pygame.font.SysFont(None, 28)
-            txt = f_small.render("AI thinking...", True, (200, 0, 0))
-            tw, th = txt.get_size()
-            x = (WIDTH - tw) // 2
-            y = HEIGHT - th - 20
-            screen.blit(txt, (x, y))
+        if generating is not None:
+            waiting_text = "Generating board..."
+        else:
+            waiting_text = "AI thinking..." if ai_waiting else ""
+        renderer.text(screen, "ai_thinking", waiting_text, 28, (200, 0, 0),
+                      midbottom=(width // 2, height - 20))
 
         # End of game sound effects and messages
         # End of game sound effects and messages
@@ -375,10 +475,10 @@ def main():
             # Board fully cleared
             if last_mover == 'ai':
                 # AI solved it -> AI wins
-                if lose_snd: lose_snd.play()
+                sounds.play("lose")
             else:
                 # Human cleared the board -> human wins
-                if victory_snd: victory_snd.play()
+                sounds.play("victory")
                 _record_high_score()
             played_end = True
 
@@ -386,42 +486,79 @@ def main():
             # A mine was clicked; if AI clicked it, that's a human win
             if last_mover == 'ai':
                 # AI clicked a mine -> human wins
-                if victory_snd: victory_snd.play()
+                sounds.play("victory")
                 _record_high_score()
             else:
                 # Human clicked a mine -> human loses
-                if lose_snd: lose_snd.play()
+                sounds.play("lose")
             played_end = True
 
+        # log the finished game (saved once)
+        if played_end and recorder is not None:
+            recorder.save(REPLAYS_FILE)
+
         # End-game UI messaging (top-right)
         if board.victory:
             if last_mover == 'ai':
-                txt = font.render("AI won!", True, (0, 0, 0))
+                status = "AI won!"
             else:
-                txt = font.render("You Win!", True, (0, 0, 0))
-            screen.blit(txt, txt.get_rect(topright=(WIDTH - 10, 10)))
+                status = "You Win!"
         elif board.gameOver and not board.victory:
             # If AI triggered the mine, that's a human win; otherwise human lose
             if last_mover == 'ai':
-                txt = font.render("You Win!", True, (0, 0, 0))
+                status = "You Win!"
             else:
-                txt = font.render("You Lose!", True, (0, 0, 0))
-            screen.blit(txt, txt.get_rect(topright=(WIDTH - 10, 10)))
+                status = "You Lose!"
         else:
-            screen.blit(playing_text, playing_text.get_rect(topright=(WIDTH - 10, 10)))
+            status = "Playing"
+        renderer.text(screen, "status", status, 36, (0, 0, 0), topright=(width - 10, 10))
 
         board.update_timer()
         # draw elapsed time
-        font = pygame.font.SysFont(None, 36)
-        txt = font.render(f"Time: {int(board.elapsed_time_seconds)}s", True, (0,0,0))
-        screen.blit(txt, (200, 10))
+        renderer.text(screen, "timer", f"Time: {int(board.elapsed_time_seconds)}s", 36, (0, 0, 0), topleft=(200, 10))
         # Draw Reset / Play Again button 
         btn_label = "Play Again" if board.gameOver else "Reset (R)"
-        draw_button(screen, reset_btn_rect, btn_label)
-
-        # draw the board, text, etc.
-        pygame.display.flip()
+        renderer.button(screen, "reset", reset_btn_rect, btn_label)
+        if profiler.enabled:
+            renderer.overlay(screen, profiler.summary_lines())
+        profiler.lap("hud")
+
+        # push only the changed parts of the window
+        pygame.display.update(renderer.flush())
+        profiler.lap("display")
+
+        # First frame is up: report the startup time and start reading the sound files
+        if startup is not None:
+            startup.mark("first frame")
+            if options.startup_report is not None:
+                print(startup.report())
+                if options.startup_report:
+                    startup.log(options.startup_report)
+            startup = None
+            sounds.start()
+            if options.quit_after_first_frame:
+                break
 
+        # Idle mode: with no input queued, block until an event arrives or the next timer tick /
+        # AI move is due instead of redrawing identical frames; otherwise cap the frame rate
+        idle_events = []
+        wait = _idle_ms()
+        if wait is not None and not pygame.event.peek():
+            event = pygame.event.wait(wait)
+            if event.type != pygame.NOEVENT:
+                idle_events.append(event)
+        else:
+            clock.tick(FPS_CAP)
+        profiler.lap("idle")
+        profiler.end_frame()
+
+    # stop any move still being worked out
+    ai_worker.shutdown()
+    if layouts is not None:
+        layouts.shutdown()
+    # log an unfinished game too
+    if recorder is not None:
+        recorder.save(REPLAYS_FILE)
     pygame.quit()
 
 # Calls main function.
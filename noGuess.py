@@ -0,0 +1,317 @@
+'''
+File: noGuess.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: No-guess mine layouts. A layout is accepted when a deterministic solver, opening a
+zero cell and then only making moves it can prove (a number's last mines or safe cells,
+one number's cells contained in another's, and the total mine count), clears every safe
+cell. Checking layouts is slow, so a LayoutPool fills a pool of checked layouts per board
+configuration in worker processes. Each pooled layout records every first click it can be
+solved from; at the first click the pool hands over a layout (flipped or transposed if
+that helps) that can be solved from the clicked cell. When none fits, one is searched for
+on a background thread while the game loop keeps running.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from config import *
+
+# Neighbour positions of every flat position (row * cols + col) of a board.
+@lru_cache(maxsize=8)
+def neighbour_table(rows, cols):
+    return [tuple(nr * cols + nc
+                  for nr in range(max(r - 1, 0), min(r + 2, rows))
+                  for nc in range(max(c - 1, 0), min(c + 2, cols))
+                  if nr != r or nc != c)
+            for r, c in (divmod(i, cols) for i in range(rows * cols))]
+
+# Symmetries of the board, as numbers for (row, col) mappings. Every one is its own
+# inverse; square boards also have the two transposes.
+def symmetries(rows, cols):
+    return (0, 1, 2, 3, 4, 5) if rows == cols else (0, 1, 2, 3)
+
+def transform(t, r, c, rows, cols):
+    if t == 1:
+        return r, cols - 1 - c
+    if t == 2:
+        return rows - 1 - r, c
+    if t == 3:
+        return rows - 1 - r, cols - 1 - c
+    if t == 4:
+        return c, r
+    if t == 5:
+        return cols - 1 - c, rows - 1 - r
+    return r, c
+
+# Mine positions drawn from a layout seed, keeping the 3x3 block around avoid (a (row, col)
+# or None) free. The same seed always gives the same layout.
+def layout_from_seed(rows, cols, mines, seed, avoid=None):
+    cells = range(rows * cols)
+    if avoid is not None:
+        r, c = avoid
+        block = {nr * cols + nc
+                 for nr in range(max(r - 1, 0), min(r + 2, rows))
+                 for nc in range(max(c - 1, 0), min(c + 2, cols))}
+        cells = [i for i in cells if i not in block]
+    return sorted(random.Random(seed).sample(cells, mines))
+
+# Adjacent mine counts of a layout (mine cells hold 0).
+def adjacent_counts(mine, nbrs):
+    return bytes(0 if mine[i] else sum(mine[j] for j in nbrs[i]) for i in range(len(mine)))
+
+# True if a player who never guesses can clear every safe cell after opening start.
+def solvable(mine, adj, nbrs, start):
+    n = len(mine)
+    total = sum(mine)
+    state = bytearray(n) # 0 unknown, 1 revealed, 2 known mine
+    frontier = set() # revealed numbers with unknown neighbours
+    left = [n - total] # safe cells still covered
+    known = [0] # mines found
+
+    # Reveals i, flood filling from zero cells.
+    def open_cell(i):
+        if state[i]:
+            return
+        state[i] = 1
+        stack = [i]
+        while stack:
+            j = stack.pop()
+            left[0] -= 1
+            if adj[j]:
+                frontier.add(j)
+                continue
+            for k in nbrs[j]:
+                if not state[k]:
+                    state[k] = 1
+                    stack.append(k)
+
+    def mark_mine(i):
+        if not state[i]:
+            state[i] = 2
+            known[0] += 1
+
+    open_cell(start)
+    while left[0]:
+        progress = False
+        # A number whose mines are all found, or whose unknown cells must all be mines
+        constraints = {}
+        for i in list(frontier):
+            unknown = [j for j in nbrs[i] if not state[j]]
+            if not unknown:
+                frontier.discard(i)
+                continue
+            need = adj[i] - sum(1 for j in nbrs[i] if state[j] == 2)
+            if need == 0:
+                for j in unknown:
+                    open_cell(j)
+                progress = True
+            elif need == len(unknown):
+                for j in unknown:
+                    mark_mine(j)
+                progress = True
+            else:
+                constraints[i] = (frozenset(unknown), need)
+        if progress:
+            continue
+        # One number's unknown cells inside another's: the rest hold the difference
+        for i, (cells, need) in constraints.items():
+            near = {k for j in cells for k in nbrs[j] if k != i and k in constraints}
+            for k in near:
+                other, otherNeed = constraints[k]
+                if cells < other:
+                    rest = other - cells
+                    if otherNeed == need:
+                        for j in rest:
+                            open_cell(j)
+                        progress = True
+                    elif otherNeed - need == len(rest):
+                        for j in rest:
+                            mark_mine(j)
+                        progress = True
+        if progress:
+            continue
+        # The mine count settles the rest of the board
+        unknown = [i for i in range(n) if not state[i]]
+        if known[0] == total:
+            for i in unknown:
+                open_cell(i)
+            continue
+        return False
+    return True
+
+# Zero cells a layout can be solved from, as one byte per cell (1 for a good first click).
+# Zero cells that reach each other open the same region, so each region is solved once.
+def good_starts(rows, cols, positions):
+    nbrs = neighbour_table(rows, cols)
+    mine = bytearray(rows * cols)
+    for p in positions:
+        mine[p] = 1
+    adj = adjacent_counts(mine, nbrs)
+    starts = bytearray(rows * cols)
+    seen = bytearray(rows * cols)
+    for i in range(rows * cols):
+        if mine[i] or adj[i] or seen[i]:
+            continue
+        # This opening's zero cells
+        region = [i]
+        seen[i] = 1
+        for j in region:
+            for k in nbrs[j]:
+                if not seen[k] and not mine[k] and not adj[k]:
+                    seen[k] = 1
+                    region.append(k)
+        if solvable(mine, adj, nbrs, i):
+            for j in region:
+                starts[j] = 1
+    return starts
+
+# Worker job: tries layouts seeded "seed:attempt" until one has a good first click. Returns
+# (layout seed, good starts) or None if none was found in `tries` attempts.
+def find_layout(job):
+    rows, cols, mines, seed, tries = job
+    for attempt in range(tries):
+        layoutSeed = f"{seed}:{attempt}"
+        starts = good_starts(rows, cols, layout_from_seed(rows, cols, mines, layoutSeed))
+        if any(starts):
+            return layoutSeed, starts
+    return None
+
+# Mine positions for a layout id [layout seed, symmetry, avoided (row, col) or None].
+def layout_positions(rows, cols, mines, layout_id):
+    seed, t, avoid = layout_id
+    positions = layout_from_seed(rows, cols, mines, seed, tuple(avoid) if avoid is not None else None)
+    if t == 0:
+        return positions
+    placed = []
+    for p in positions:
+        r, c = transform(t, *divmod(p, cols), rows, cols)
+        placed.append(r * cols + c)
+    return sorted(placed)
+
+# Board.layout_source that always gives one recorded layout (used to replay games).
+def fixed_layout(layout_id):
+    def source(board, safe_rc):
+        return layout_id, layout_positions(board.rows, board.cols, board.mine_count, layout_id)
+    return source
+
+# Class that keeps checked no-guess layouts ready for each board configuration.
+class LayoutPool:
+    def __init__(self, size=NO_GUESS_POOL_SIZE, workers=None):
+        self.size = size # layouts kept ready (or being made) per configuration
+        self.workers = workers or min(size, max(1, (os.cpu_count() or 2) - 1))
+        self.executor = None # worker processes, started by the first prepare()
+        self.pending = {} # (rows, cols, mines) -> futures of find_layout jobs
+        self.ready = {} # (rows, cols, mines) -> [(layout seed, good starts)]
+        self.searcher = None # thread for start_search, started by its first call
+        self.searched = None # (config, first click, future) of the last start_search
+
+    # Starts making layouts for a configuration until `size` are ready or on the way.
+    def prepare(self, rows, cols, mines):
+        config = (rows, cols, mines)
+        self.collect(config)
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        pending = self.pending.setdefault(config, [])
+        for _ in range(self.size - len(self.ready.get(config, [])) - len(pending)):
+            job = (rows, cols, mines, random.randrange(2**32), NO_GUESS_TRIES)
+            pending.append(self.executor.submit(find_layout, job))
+
+    # Moves finished jobs of a configuration into its ready layouts.
+    def collect(self, config):
+        pending = self.pending.get(config, [])
+        ready = self.ready.setdefault(config, [])
+        for future in [f for f in pending if f.done()]:
+            pending.remove(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print("No-guess layout generation failed:", e)
+                continue
+            if result is not None:
+                ready.append(result)
+
+    # (index in the ready list, layout id) of a pooled layout that can be solved from a
+    # first click at safe_rc (flipped or transposed if that helps), or None.
+    def match(self, config, safe_rc):
+        rows, cols, mines = config
+        self.collect(config)
+        for k, (seed, starts) in enumerate(self.ready.get(config, [])):
+            for t in symmetries(rows, cols):
+                r, c = transform(t, *safe_rc, rows, cols)
+                if starts[r * cols + c]:
+                    return k, [seed, t, None]
+        return None
+
+    # True if the pool has a layout for a first click at safe_rc on board.
+    def fits(self, board, safe_rc):
+        return self.match((board.rows, board.cols, board.mine_count), safe_rc) is not None
+
+    # Starts looking for a layout opening at safe_rc on a background thread, for a first
+    # click the pool has nothing for. The game loop keeps running; once `searching` is False
+    # the click can be made and layout_for hands over what was found.
+    def start_search(self, board, safe_rc):
+        if self.searcher is None:
+            self.searcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="no-guess")
+        config = (board.rows, board.cols, board.mine_count)
+        self.searched = (config, tuple(safe_rc),
+                         self.searcher.submit(self.search, *config, safe_rc, board.seed))
+
+    # True while a search started by start_search is running.
+    @property
+    def searching(self):
+        return self.searched is not None and not self.searched[2].done()
+
+    # Board.layout_source: (layout id, mine positions) for a first click at safe_rc, or None
+    # to fall back to a random layout. Never waits: a click the pool has nothing for gets
+    # the layout start_search found for it, if any.
+    def layout_for(self, board, safe_rc):
+        rows, cols, mines = board.rows, board.cols, board.mine_count
+        config = (rows, cols, mines)
+        layout_id = None
+        found = self.match(config, safe_rc)
+        if found is not None:
+            k, layout_id = found
+            del self.ready[config][k]
+        elif self.searched is not None:
+            searchConfig, searchStart, future = self.searched
+            if searchConfig == config and searchStart == tuple(safe_rc) and future.done():
+                self.searched = None
+                try:
+                    layout_id = future.result()
+                except Exception as e:
+                    print("No-guess layout search failed:", e)
+        self.prepare(rows, cols, mines)
+        if layout_id is None:
+            return None
+        return layout_id, layout_positions(rows, cols, mines, layout_id)
+
+    # Tries layouts opening at start for up to NO_GUESS_WAIT_SECONDS. Returns a layout id or None.
+    def search(self, rows, cols, mines, start, seed):
+        nbrs = neighbour_table(rows, cols)
+        deadline = time.perf_counter() + NO_GUESS_WAIT_SECONDS
+        attempt = 0
+        while time.perf_counter() < deadline:
+            layout_id = [f"{seed}:{attempt}", 0, list(start)]
+            attempt += 1
+            mine = bytearray(rows * cols)
+            for p in layout_positions(rows, cols, mines, layout_id):
+                mine[p] = 1
+            if solvable(mine, adjacent_counts(mine, nbrs), nbrs, start[0] * cols + start[1]):
+                return layout_id
+        return None
+
+    # Stops the workers; jobs that haven't started are dropped.
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        if self.searcher is not None:
+            self.searcher.shutdown(wait=False, cancel_futures=True)
+            self.searcher = None
@@ -0,0 +1,213 @@
+'''
+File: packedBoard.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Compact Board that stores each cell in one byte: the adjacent count, cell state,
+revealed bit and flag bit packed together in a single bytearray. grid[r][c] returns a
+cell-like view so ai.py, inputHandler.py and the renderer work unchanged. Uses no
+third-party packages (ArrayBoard in arrayBoard.py is the NumPy alternative).
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+from board import Board, CLICKED_BIT as OUT_CLICKED, FLAGGED_BIT as OUT_FLAGGED, MINE_BIT as OUT_MINE, ADJ_SHIFT as OUT_ADJ_SHIFT
+
+# Bit layout of a cell byte.
+ADJ_MASK = 0x0F # bits 0-3: adjacent mine count (0-8)
+STATE_SHIFT = 4
+STATE_MASK = 0x30 # bits 4-5: cell state (0 covered, 2 revealed, 3 mine)
+CLICKED_BIT = 0x40 # bit 6: revealed
+FLAGGED_BIT = 0x80 # bit 7: flagged
+MINE = 3 << STATE_SHIFT
+# Packed byte -> Board.cell_bytes() encoding and back, for bytes.translate.
+TO_CELL_BYTES = bytes((OUT_CLICKED if b & CLICKED_BIT else 0) | (OUT_FLAGGED if b & FLAGGED_BIT else 0) |
+                      (OUT_MINE if b & STATE_MASK == MINE else 0) | ((b & ADJ_MASK) << OUT_ADJ_SHIFT)
+                      for b in range(256))
+FROM_CELL_BYTES = bytes((CLICKED_BIT if b & OUT_CLICKED else 0) | (FLAGGED_BIT if b & OUT_FLAGGED else 0) |
+                        (MINE if b & OUT_MINE else (2 << STATE_SHIFT if b & OUT_CLICKED else 0)) |
+                        ((b >> OUT_ADJ_SHIFT) & ADJ_MASK)
+                        for b in range(256))
+
+# Cell-like view onto one byte of a PackedBoard.
+class PackedCell:
+    __slots__ = ("board", "row", "col")
+
+    def __init__(self, board, row, col):
+        self.board = board
+        self.row = row # y pos of grid
+        self.col = col # x pos of grid
+
+    def _get(self):
+        return self.board.cells[self.row * self.board.cols + self.col]
+
+    # Replaces the bits under mask with value.
+    def _set(self, mask, value):
+        cells, i = self.board.cells, self.row * self.board.cols + self.col
+        cells[i] = (cells[i] & ~mask) | value
+
+    @property
+    def cellState(self):
+        return (self._get() & STATE_MASK) >> STATE_SHIFT
+
+    @cellState.setter
+    def cellState(self, value):
+        self._set(STATE_MASK, value << STATE_SHIFT)
+
+    @property
+    def isClicked(self):
+        return bool(self._get() & CLICKED_BIT)
+
+    @isClicked.setter
+    def isClicked(self, value):
+        self._set(CLICKED_BIT, CLICKED_BIT if value else 0)
+
+    @property
+    def isFlagged(self):
+        return bool(self._get() & FLAGGED_BIT)
+
+    @isFlagged.setter
+    def isFlagged(self, value):
+        self._set(FLAGGED_BIT, FLAGGED_BIT if value else 0)
+
+    @property
+    def adjMines(self):
+        return self._get() & ADJ_MASK
+
+    @adjMines.setter
+    def adjMines(self, value):
+        self._set(ADJ_MASK, value)
+
+    # Flood-fill reveal, done directly on the board's bytes.
+    def revealGrid(self, grid):
+        return self.board.reveal_region(self.row, self.col)
+
+# One row of a PackedBoard grid.
+class _RowView:
+    __slots__ = ("board", "row")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.cols
+
+    def __getitem__(self, col):
+        return PackedCell(self.board, self.row, col)
+
+    def __iter__(self):
+        board, row = self.board, self.row
+        return (PackedCell(board, row, c) for c in range(board.cols))
+
+# grid[r][c] access for a PackedBoard.
+class _GridView:
+    __slots__ = ("board",)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __len__(self):
+        return self.board.rows
+
+    def __getitem__(self, row):
+        return _RowView(self.board, row)
+
+    def __iter__(self):
+        board = self.board
+        return (_RowView(board, r) for r in range(board.rows))
+
+# Board that stores every cell in one byte.
+class PackedBoard(Board):
+    storage = "packed"
+
+    # Allocates the cell bytes and returns the grid view over them.
+    def build_grid(self):
+        self.cells = bytearray(self.rows * self.cols)
+        return _GridView(self)
+
+    # Board.cell_bytes() encoding, translated from the packed bytes in one pass.
+    def cell_bytes(self):
+        return self.cells.translate(TO_CELL_BYTES)
+
+    # Sets every cell from cell_bytes() output in one translate.
+    def load_cell_bytes(self, data):
+        self.cells = bytearray(data).translate(FROM_CELL_BYTES)
+        self.dirty_all = True
+
+    # cell_bytes() encoding of just the given flat positions.
+    def cell_codes(self, positions):
+        cells = self.cells
+        return bytes(cells[i] for i in positions).translate(TO_CELL_BYTES)
+
+    # Sets the given flat positions from cell_codes() output and marks them for redraw.
+    def load_cell_codes(self, positions, codes):
+        cells = self.cells
+        for i, b in zip(positions, bytes(codes).translate(FROM_CELL_BYTES)):
+            cells[i] = b
+        self.mark_dirty(self.views(positions))
+
+    # Views of the given flat positions.
+    def views(self, indices):
+        cols = self.cols
+        return [PackedCell(self, i // cols, i % cols) for i in indices]
+
+    # Places mines on board.
+    def addMines(self, safe_rc):
+        cells = self.cells
+        for pos in self.mine_layout(safe_rc):
+            cells[pos] = (cells[pos] & ~STATE_MASK) | MINE
+
+    # Adds one to the count of every non-mine neighbour of each mine.
+    def compute_adjacents(self):
+        cells, rows, cols = self.cells, self.rows, self.cols
+        for i in range(len(cells)):
+            cells[i] &= ~ADJ_MASK
+        for i in range(len(cells)):
+            if cells[i] & STATE_MASK != MINE:
+                continue
+            r, c = divmod(i, cols)
+            for nr in range(max(r - 1, 0), min(r + 2, rows)):
+                for n in range(nr * cols + max(c - 1, 0), nr * cols + min(c + 2, cols)):
+                    if cells[n] & STATE_MASK != MINE:
+                        cells[n] += 1
+
+    # Iterative flood fill over the bytes; returns views of the newly revealed cells.
+    def reveal_region(self, row, col):
+        cells, rows, cols = self.cells, self.rows, self.cols
+        start = row * cols + col
+        if cells[start] & (CLICKED_BIT | FLAGGED_BIT):
+            return []
+        # Cells are marked revealed when pushed, so each one enters the stack at most once
+        cells[start] |= CLICKED_BIT
+        revealed = []
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            b = cells[i]
+            state = b & STATE_MASK
+            # Updates cell state
+            if state == 0:
+                cells[i] = b | (2 << STATE_SHIFT)
+            revealed.append(i)
+            # Mines and numbered cells stop the fill
+            if state == MINE or b & ADJ_MASK:
+                continue
+            r, c = divmod(i, cols)
+            for nr in range(max(r - 1, 0), min(r + 2, rows)):
+                for n in range(nr * cols + max(c - 1, 0), nr * cols + min(c + 2, cols)):
+                    if not cells[n] & (CLICKED_BIT | FLAGGED_BIT):
+                        cells[n] |= CLICKED_BIT
+                        stack.append(n)
+        return self.views(revealed)
+
+    # Reveal all mines on board.
+    def revealMines(self):
+        cells = self.cells
+        # Mine state with the revealed bit still clear
+        mines = [i for i, b in enumerate(cells) if b & (STATE_MASK | CLICKED_BIT) == MINE]
+        for i in mines:
+            cells[i] |= CLICKED_BIT
+        self.revealed_count += len(mines)
+        self.cells_changed(self.views(mines))
@@ -0,0 +1,168 @@
+'''
+File: profiler.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Per-frame profiler for the game loop, and a timer for startup. The loop marks the end of each phase (event
+handling, input handling, the AI move, drawing, the victory check, HUD and display update)
+and the profiler adds up the time since the previous mark. Board reveals and background AI
+move computations are timed too. The last PROFILE_WINDOW frames are kept for the on-screen
+overlay (frame-time percentiles and a per-phase breakdown) and can be exported to CSV or
+JSON. While disabled every call returns straight away. StartupTimer reports how long each
+startup step took up to the first frame.
+Inputs: None.
+Outputs: Profile trace files (CSV or JSON), startup reports.
+External Sources: None.
+'''
+
+# Imports.
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from config import *
+
+# Game loop phases in the order they run; "idle" is time spent waiting for events and
+# doesn't count towards the frame time.
+PHASES = ("events", "input", "ai", "draw", "victory", "hud", "display", "idle")
+BUSY_PHASES = PHASES[:-1]
+# Per-frame counters that aren't phases.
+COUNTERS = ("reveals", "reveal_ms", "reveal_cells", "ai_move_ms")
+
+# Nearest-rank percentile of an already sorted list.
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))]
+
+# Class that times the phases of each frame.
+class FrameProfiler:
+    def __init__(self, window=PROFILE_WINDOW):
+        self.enabled = False
+        self.frames = deque(maxlen=window) # recent frames as dicts, oldest first
+        self.reveals = deque(maxlen=window) # (ms, cells) of recent reveals
+        self.ai_moves = deque(maxlen=window) # ms of recent AI move computations
+        self.count = 0 # frames profiled so far
+        self.current = None # {phase or counter: value} of the frame being timed
+        self.last = 0.0 # perf_counter of the previous mark
+
+    # Turns profiling on or off; returns the new state.
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current = None
+        return self.enabled
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self.current = dict.fromkeys(PHASES + COUNTERS, 0)
+        self.last = time.perf_counter()
+
+    # Adds the time since the previous mark to a phase.
+    def lap(self, phase):
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last) * 1000
+        self.last = now
+
+    # Records one board reveal (seconds taken, cells revealed).
+    def reveal(self, seconds, cells):
+        if self.current is None:
+            return
+        ms = seconds * 1000
+        self.reveals.append((ms, cells))
+        self.current["reveals"] += 1
+        self.current["reveal_ms"] += ms
+        self.current["reveal_cells"] += cells
+
+    # Records how long the background worker took to choose an AI move.
+    def ai_move(self, seconds):
+        if self.current is None:
+            return
+        ms = seconds * 1000
+        self.ai_moves.append(ms)
+        self.current["ai_move_ms"] += ms
+
+    def end_frame(self):
+        frame, self.current = self.current, None
+        if frame is None:
+            return
+        self.count += 1
+        row = {"frame": self.count, "time": round(time.time(), 3),
+               "frame_ms": round(sum(frame[p] for p in BUSY_PHASES), 4)}
+        for key in PHASES + COUNTERS:
+            row[key] = round(frame[key], 4)
+        self.frames.append(row)
+
+    # Text lines for the overlay: frame-time percentiles, mean time and share per phase,
+    # and reveal and AI move timings.
+    def summary_lines(self):
+        frames = self.frames
+        if not frames:
+            return ["Profiling... (F3 hides, F4 exports)"]
+        times = sorted(f["frame_ms"] for f in frames)
+        total = sum(times) or 1
+        lines = [f"frame ms  p50 {percentile(times, 50):.2f}  p95 {percentile(times, 95):.2f}  "
+                 f"p99 {percentile(times, 99):.2f}  max {times[-1]:.2f}  ({len(frames)} frames)"]
+        for phase in BUSY_PHASES:
+            spent = sum(f[phase] for f in frames)
+            lines.append(f"{phase:<8} {spent / len(frames):7.3f} ms  {spent / total:4.0%}")
+        if self.reveals:
+            ms = [r[0] for r in self.reveals]
+            lines.append(f"reveal   {len(ms)} x {sum(ms) / len(ms):.3f} ms, max {max(ms):.3f} ms, "
+                         f"{sum(r[1] for r in self.reveals)} cells")
+        if self.ai_moves:
+            lines.append(f"AI move  {len(self.ai_moves)} x {sum(self.ai_moves) / len(self.ai_moves):.2f} ms, "
+                         f"max {max(self.ai_moves):.2f} ms")
+        lines.append("F3 hides, F4 exports")
+        return lines
+
+    # Writes the recent frames to path: JSON (frames, reveals and AI moves) for a .json path,
+    # otherwise CSV with one row per frame.
+    def export(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".json"):
+                json.dump({"phases": PHASES, "frames": list(self.frames),
+                           "reveals": [{"ms": ms, "cells": cells} for ms, cells in self.reveals],
+                           "ai_moves_ms": list(self.ai_moves)}, f)
+            else:
+                writer = csv.DictWriter(f, ["frame", "time", "frame_ms", *PHASES, *COUNTERS])
+                writer.writeheader()
+                writer.writerows(self.frames)
+        os.replace(tmp, path)
+
+# Class that times the steps of startup up to the first frame. Steps spent waiting for the
+# player (the prompts) are reported but not counted.
+class StartupTimer:
+    def __init__(self, start=None):
+        self.start = self.last = start if start is not None else time.perf_counter()
+        self.steps = [] # (name, ms, waiting)
+
+    # Ends a step at the current time.
+    def mark(self, step, waiting=False):
+        now = time.perf_counter()
+        self.steps.append((step, (now - self.last) * 1000, waiting))
+        self.last = now
+
+    # Milliseconds of startup work so far, not counting time spent waiting.
+    def total_ms(self):
+        return sum(ms for _, ms, waiting in self.steps if not waiting)
+
+    def report(self):
+        parts = ", ".join(f"{step} {ms:.1f} ms" for step, ms, waiting in self.steps if not waiting)
+        waited = sum(ms for _, ms, waiting in self.steps if waiting)
+        line = f"Startup: {parts}; first frame after {self.total_ms():.1f} ms"
+        if waited >= 1:
+            line += f" (plus {waited / 1000:.1f} s at the prompts)"
+        return line
+
+    # Appends the steps as one JSON line to a log, for tracking startup time across runs.
+    def log(self, path):
+        record = {"time": round(time.time()), "python": sys.version.split()[0],
+                  "first_frame_ms": round(self.total_ms(), 2),
+                  "steps": {step: round(ms, 2) for step, ms, _ in self.steps}}
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
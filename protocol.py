@@ -0,0 +1,117 @@
+'''
+File: protocol.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Wire format shared by the game server, the network client and the load generator.
+Every message is a 4-byte little-endian length, a 1-byte message type and a payload. Clients
+send new-game, reveal, flag and chord actions; the server answers each one with a delta: the
+game status and only the cells that changed, as flat positions and cell_bytes() codes with
+the mine and count bits of covered cells cleared, so a client never learns more than it sees.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import struct
+import sys
+from array import array
+from board import CLICKED_BIT, FLAGGED_BIT
+
+# Client -> server messages.
+NEW_GAME = 1 # rows, cols, mines: start a new game in this session
+REVEAL = 2 # row, col
+FLAG = 3 # row, col (toggles)
+CHORD = 4 # row, col of a revealed number
+STATS = 5 # no payload: server statistics
+ACTIONS = (REVEAL, FLAG, CHORD)
+# Server -> client messages.
+GAME = 16 # rows, cols, mines of the new game
+DELTA = 17 # status, flags placed and the changed cells
+STATS_REPLY = 18 # sessions, actions, CPU and wall seconds
+ERROR = 19 # UTF-8 text; the session carries on
+
+HEADER = struct.Struct("<IB") # length of type + payload, message type
+GAME_MSG = struct.Struct("<HHI") # rows, cols, mines (NEW_GAME and GAME)
+CELL_MSG = struct.Struct("<HH") # row, col
+DELTA_MSG = struct.Struct("<BII") # status bits, flags placed, changed cells (then positions, codes)
+STATS_MSG = struct.Struct("<IQdd") # open sessions, actions handled, CPU seconds, wall seconds
+MAX_CLIENT_MESSAGE = 64 # longest message a server accepts; anything longer closes the session
+# Delta status bits.
+GAME_OVER = 1
+VICTORY = 2
+
+# cell_bytes() code -> what a client may see: covered cells keep only their flag bit.
+VISIBLE = bytes(b if b & CLICKED_BIT else b & FLAGGED_BIT for b in range(256))
+
+# Raised for a malformed message.
+class ProtocolError(Exception):
+    pass
+
+# One framed message.
+def pack(msg_type, payload=b""):
+    return HEADER.pack(len(payload) + 1, msg_type) + payload
+
+def new_game_message(rows, cols, mines):
+    return pack(NEW_GAME, GAME_MSG.pack(rows, cols, mines))
+
+def action_message(msg_type, row, col):
+    return pack(msg_type, CELL_MSG.pack(row, col))
+
+# DELTA message for the changed flat positions and their visible codes.
+def delta_message(status, flags, positions, codes):
+    pos = array("I", positions)
+    if sys.byteorder == "big":
+        pos.byteswap()
+    return pack(DELTA, DELTA_MSG.pack(status, flags, len(codes)) + pos.tobytes() + codes)
+
+# Splits a DELTA payload into (status, flags placed, positions, codes).
+def read_delta(payload):
+    status, flags, n = DELTA_MSG.unpack_from(payload)
+    start = DELTA_MSG.size
+    if len(payload) != start + 5 * n:
+        raise ProtocolError("malformed delta")
+    pos = array("I")
+    pos.frombytes(payload[start:start + 4 * n])
+    if sys.byteorder == "big":
+        pos.byteswap()
+    return status, flags, pos, payload[start + 4 * n:]
+
+# Reads one message from an asyncio stream; returns (type, payload). Raises
+# asyncio.IncompleteReadError when the stream closes and ProtocolError for bad lengths.
+async def read_message(reader, limit=None):
+    length, msg_type = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if length < 1 or (limit is not None and length > limit):
+        raise ProtocolError(f"bad message length {length}")
+    return msg_type, await reader.readexactly(length - 1)
+
+# Takes every complete message off the front of buffer (a bytearray filled from a
+# non-blocking socket); returns [(type, payload)].
+def split_messages(buffer):
+    messages = []
+    offset = 0
+    while len(buffer) - offset >= HEADER.size:
+        length, msg_type = HEADER.unpack_from(buffer, offset)
+        if length < 1:
+            raise ProtocolError(f"bad message length {length}")
+        end = offset + 4 + length
+        if end > len(buffer):
+            break
+        messages.append((msg_type, bytes(buffer[offset + HEADER.size:end])))
+        offset = end
+    del buffer[:offset]
+    return messages
+
+# Raises this process's open-file limit to the hard limit, so one process can hold
+# thousands of connections. Not available (or needed) everywhere.
+def raise_file_limit():
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
@@ -0,0 +1,331 @@
+'''
+File: renderer.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: PyGame rendering layer for Minesweeper. Draws the cells, labels and HUD text of a
+Board through a scrollable viewport, so only the visible cells are drawn however big the
+board is; the board, cell and input logic it reads from have no PyGame dependency.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import math
+import pygame
+from config import *
+from functools import lru_cache
+from textCache import get_font, render_text
+
+# Tiles in the atlas: 0 is a revealed empty cell, 1-8 are numbered cells, then these.
+TILE_MINE = 9
+TILE_COVERED = 10
+TILE_FLAG = 11
+TILE_COUNT = 12
+
+# Atlas tile a cell should show.
+def tile_index(cell):
+    if cell.isClicked:
+        if cell.cellState == 3:
+            return TILE_MINE
+        return cell.adjMines
+    return TILE_FLAG if cell.isFlagged else TILE_COVERED
+
+# Spreadsheet-style column label: A..Z, then AA, AB, ...
+def column_label(c):
+    label = ""
+    c += 1
+    while c > 0:
+        c, rem = divmod(c - 1, 26)
+        label = chr(65 + rem) + label
+    return label
+
+# Renders every distinct cell look once, side by side, for a given cell size.
+@lru_cache(maxsize=None)
+def tile_atlas(size):
+    atlas = pygame.Surface((size * TILE_COUNT, size))
+    for i in range(TILE_COUNT):
+        rect = pygame.Rect(i * size, 0, size, size)
+        if i == TILE_COVERED or i == TILE_FLAG:
+            # Covered cell
+            pygame.draw.rect(atlas, GRID_COLOR, rect)
+            pygame.draw.rect(atlas, BORDER_COLOR, rect, 1)
+        else:
+            # Revealed cell
+            pygame.draw.rect(atlas, REVEALED_BG, rect)
+            pygame.draw.rect(atlas, BORDER_COLOR, rect, 1)
+        if i == TILE_MINE:
+            # Draw a mine as a black circle
+            pygame.draw.circle(atlas, MINE_COLOR, rect.center, size // 4)
+        elif 1 <= i <= 8:
+            # Draw the number of adjacent mines with the proper color
+            color = NUMBER_COLORS.get(i, TEXT_COLOR)
+            num_surface = render_text(str(i), 24, color)
+            atlas.blit(num_surface, num_surface.get_rect(center=rect.center))
+        elif i == TILE_FLAG:
+            pole_x = rect.x + size // 3
+            # Draw the flag pole
+            pygame.draw.line(atlas, (80, 80, 80),
+                            (pole_x, rect.y + size // 4),
+                            (pole_x, rect.y + 3 * size // 4), 2)
+            # Draw the triangular red flag
+            flag_pts = [
+                (pole_x, rect.y + size // 4),
+                (pole_x + size // 2, rect.y + size // 3),
+                (pole_x, rect.y + size // 2)
+            ]
+            pygame.draw.polygon(atlas, FLAG_COLOR, flag_pts)
+    return atlas
+
+# Class that draws a Board onto the screen through a scrollable viewport.
+class BoardRenderer:
+    def __init__(self, board, cell_size=CELL_SIZE):
+        self.board = board # board being drawn
+        self.cellSize = cell_size # pixels per cell
+        self.visible_rows = min(board.rows, MAX_VISIBLE_ROWS) # rows that fit in the viewport
+        self.visible_cols = min(board.cols, MAX_VISIBLE_COLS) # cols that fit in the viewport
+        self.view_row = 0 # board row shown at the top of the viewport
+        self.view_col = 0 # board col shown at the left of the viewport
+        self.drag = None # (mouse pos, view) while panning with the middle button
+        self.width, self.height = self.window_size()
+        self.gridSurface = pygame.Surface((self.width, self.height - GAME_STATE_OBJ_SIZE)) # grid surface with PyGame
+        self.gridRect = pygame.Rect(0, GAME_STATE_OBJ_SIZE, self.width, self.height - GAME_STATE_OBJ_SIZE) # grid surface on screen
+        self.labels = None # cached row/column label surfaces and positions for the current view
+        self.hud = {} # key -> (content, screen rect) of the HUD items currently on screen
+        self.dirty_rects = [] # screen rects changed this frame
+        self.overlay_rect = None # area covered by the overlay panel, while it is shown
+        self.full_redraw = True # repaint everything on the next draw
+        self.atlas = tile_atlas(cell_size) # pre-rendered cell sprites
+        self.tiles = [pygame.Rect(i * cell_size, 0, cell_size, cell_size) for i in range(TILE_COUNT)] # tile areas in the atlas
+
+    # Window size that fits the viewport, its labels and the HUD (never below the default).
+    def window_size(self):
+        width = self.visible_cols * self.cellSize + COL_LABEL_SIZE + EXTRA_WIDTH
+        height = self.visible_rows * self.cellSize + GAME_STATE_OBJ_SIZE + EXTRA_HEIGHT
+        return max(width, WIDTH), max(height, HEIGHT)
+
+    # Forces a full repaint next frame (e.g. after the window was exposed).
+    def invalidate(self):
+        self.full_redraw = True
+
+    # Moves the viewport so (row, col) is its top-left cell, clamped to the board.
+    def scroll_to(self, row, col):
+        row = max(0, min(row, self.board.rows - self.visible_rows))
+        col = max(0, min(col, self.board.cols - self.visible_cols))
+        if (row, col) != (self.view_row, self.view_col):
+            self.view_row, self.view_col = row, col
+            self.labels = None
+            self.full_redraw = True
+
+    # Scrolls the viewport by a number of rows and cols.
+    def scroll(self, drow, dcol):
+        self.scroll_to(self.view_row + drow, self.view_col + dcol)
+
+    # Handles scroll and pan input: arrow keys/WASD (Shift for a page), the mouse wheel
+    # (Shift for sideways) and dragging with the middle button. Returns True if used.
+    def handle_scroll(self, event):
+        if event.type == pygame.KEYDOWN:
+            steps = {pygame.K_UP: (-1, 0), pygame.K_w: (-1, 0), pygame.K_DOWN: (1, 0), pygame.K_s: (1, 0),
+                     pygame.K_LEFT: (0, -1), pygame.K_a: (0, -1), pygame.K_RIGHT: (0, 1), pygame.K_d: (0, 1)}
+            if event.key not in steps:
+                return False
+            drow, dcol = steps[event.key]
+            if event.mod & pygame.KMOD_SHIFT:
+                drow, dcol = drow * self.visible_rows, dcol * self.visible_cols
+            self.scroll(drow, dcol)
+            return True
+        if event.type == pygame.MOUSEWHEEL:
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                self.scroll(0, -event.y)
+            else:
+                self.scroll(-event.y, event.x)
+            return True
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 2:
+            self.drag = (event.pos, (self.view_row, self.view_col))
+            return True
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+            self.drag = None
+            return True
+        if event.type == pygame.MOUSEMOTION and self.drag is not None:
+            (x0, y0), (row, col) = self.drag
+            x, y = event.pos
+            self.scroll_to(row - (y - y0) // self.cellSize, col - (x - x0) // self.cellSize)
+            return True
+        return False
+
+    # Board (row, col) under a window position, or None outside the visible grid.
+    def cell_at(self, pos):
+        x, y = pos[0], pos[1] - GAME_STATE_OBJ_SIZE
+        if x < 0 or y < 0:
+            return None
+        r, c = y // self.cellSize, x // self.cellSize
+        if r >= self.visible_rows or c >= self.visible_cols:
+            return None
+        return self.view_row + r, self.view_col + c
+
+    # True if the cell is inside the viewport.
+    def in_view(self, cell):
+        return (0 <= cell.row - self.view_row < self.visible_rows and
+                0 <= cell.col - self.view_col < self.visible_cols)
+
+    # Rectangle of a cell on the grid surface.
+    def cell_rect(self, cell):
+        x = (cell.col - self.view_col) * self.cellSize
+        y = (cell.row - self.view_row) * self.cellSize
+        return pygame.Rect(x, y, self.cellSize, self.cellSize)
+
+    # Draws a single cell by copying its tile from the atlas.
+    def draw_cell(self, cell):
+        self.gridSurface.blit(self.atlas, self.cell_rect(cell), self.tiles[tile_index(cell)])
+
+    # Draws the board. Only visible cells the board marked dirty are redrawn; labels are
+    # cached and HUD text is re-rendered only when it changes. Changed areas collect in
+    # dirty_rects.
+    def draw(self, screen):
+        board = self.board
+        if self.full_redraw or board.dirty_all:
+            self.draw_full(screen)
+        elif board.dirty_cells:
+            for cell in board.dirty_cells:
+                if not self.in_view(cell):
+                    continue
+                self.draw_cell(cell)
+                rect = self.cell_rect(cell)
+                screenRect = rect.move(0, GAME_STATE_OBJ_SIZE)
+                screen.blit(self.gridSurface, screenRect, rect)
+                self.dirty_rects.append(screenRect)
+            board.dirty_cells = []
+
+        # Renders how many flags are placed.
+        self.text(screen, "flags", f"Flag count: {board.flag_count()}", 36, (0, 0, 0), topleft=(10, 10))
+
+        # Render how many mines there are total
+        if board.mine_count == math.inf:
+            mine_label = f"Mine density: {board.density:.0%}" # endless board
+        else:
+            mine_label = f"Mine count: {board.mine_count}"
+        self.text(screen, "mines", mine_label, 36, (0, 0, 0), topleft=(10, 40))
+
+        # Render how the AI difficulty
+        if board.ai_mode == "y":
+            ai_label = f"AI difficulty: {board.difficulty}" if board.difficulty in ["easy", "medium", "hard"] else ""
+        else:
+            ai_label = "AI mode disabled"
+        self.text(screen, "ai_mode", ai_label, 36, (0, 0, 0), topleft=(10, 70))
+
+        # --- Footer: one-line status ---
+        # Initial high score label
+        hs_label = "No high scores recorded"
+        if board.best_time_seconds and board.best_time_holder:
+            m, s = divmod(int(board.best_time_seconds), 60)
+            hs_label = f"{board.difficulty} - {m:02d}:{s:02d} by {board.best_time_holder}"
+        line = f"High score: {hs_label}"
+        if self.hud.get("footer", (None,))[0] != line:
+            # Fit-to-width: try smaller fonts if needed
+            for size in (28, 24, 20, 18):
+                # measure without rasterizing every candidate size
+                if get_font(None, size).size(line)[0] <= self.width - 20:
+                    break
+            line_surf = render_text(line, size, (0, 0, 0))
+            footer_y = GAME_STATE_OBJ_SIZE + self.visible_rows * self.cellSize + 40 # just below the grid
+            self.blit_hud(screen, "footer", line, line_surf, line_surf.get_rect(topleft=(10, footer_y)))
+
+    # Repaints the whole window: background, the visible cells and the cached labels.
+    def draw_full(self, screen):
+        board = self.board
+        cs = self.cellSize
+        r0, c0 = self.view_row, self.view_col
+        screen.fill(BG_COLOR)
+        self.gridSurface.fill((210, 210, 210))
+        # One blits call for the visible part of the grid
+        atlas, tiles, grid = self.atlas, self.tiles, board.grid
+        self.gridSurface.blits([(atlas, ((c - c0) * cs, (r - r0) * cs), tiles[tile_index(grid[r][c])])
+                                for r in range(r0, r0 + self.visible_rows)
+                                for c in range(c0, c0 + self.visible_cols)], False)
+        screen.blit(self.gridSurface, self.gridRect)
+
+        # Labels only change when the view scrolls, so they are rendered once per view
+        if self.labels is None:
+            self.labels = []
+            # Render labels for columns
+            for i in range(self.visible_cols):
+                colLabel = render_text(column_label(c0 + i), 36, TEXT_COLOR)
+                self.labels.append((colLabel, (i * cs + 10, (GAME_STATE_OBJ_SIZE)-(cs/2) - 10)))
+            # Render labels for rows
+            for i in range(self.visible_rows):
+                rowLabel = render_text(str(r0 + i + 1), 36, TEXT_COLOR)
+                grid_right_edge = self.visible_cols * cs   # end of grid
+                label_x = grid_right_edge + 10       # row numbers appear right after grid
+                label_y = (GAME_STATE_OBJ_SIZE) + (i * cs) + 10
+                self.labels.append((rowLabel, (label_x, label_y)))
+        screen.blits(self.labels)
+
+        # Everything on screen is fresh; HUD items get drawn again on top
+        self.hud = {}
+        self.dirty_rects = [screen.get_rect()]
+        self.full_redraw = False
+        board.dirty_all = False
+        board.dirty_cells = []
+
+    # Restores the background (HUD colour or grid surface) under a screen rect.
+    def clear_rect(self, screen, rect):
+        screen.fill(BG_COLOR, rect)
+        overlap = rect.clip(self.gridRect)
+        if overlap:
+            screen.blit(self.gridSurface, overlap, overlap.move(0, -GAME_STATE_OBJ_SIZE))
+
+    # Puts a HUD surface on screen under key, clearing whatever that key showed before.
+    def blit_hud(self, screen, key, content, surf, rect):
+        old = self.hud.get(key)
+        if old is not None:
+            self.clear_rect(screen, old[1])
+            self.dirty_rects.append(old[1])
+        screen.blit(surf, rect)
+        self.hud[key] = (content, rect)
+        self.dirty_rects.append(rect)
+
+    # Draws a line of HUD text if it differs from what key currently shows.
+    # anchor is a pygame.Rect position keyword such as topleft=(x, y).
+    def text(self, screen, key, label, size, color, **anchor):
+        content = (label, size, color)
+        if self.hud.get(key, (None,))[0] == content:
+            return
+        surf = render_text(label, size, color)
+        self.blit_hud(screen, key, content, surf, surf.get_rect(**anchor))
+
+    # Draws a HUD button if its label changed.
+    def button(self, screen, key, rect, label):
+        if self.hud.get(key, (None,))[0] == label:
+            return
+        surf = pygame.Surface(rect.size)
+        surf.fill((235, 235, 235)) # draw button's background
+        pygame.draw.rect(surf, (100, 100, 100), surf.get_rect(), 2) # draw dark gray border 2 pixels wide around button
+        txt = render_text(label, 28, (0, 0, 0)) # label text is black, default font at size 28
+        surf.blit(txt, txt.get_rect(center=surf.get_rect().center)) # draw text centered within button rectangle
+        self.blit_hud(screen, key, label, surf, rect)
+
+    # Draws a panel of text lines over the top-left of the board (e.g. the profiler's
+    # overlay). The panel only grows while shown, so no stale parts of it are left behind.
+    def overlay(self, screen, lines, size=20):
+        font = get_font(None, size)
+        step = font.get_linesize()
+        surfs = [font.render(line, True, (255, 255, 255)) for line in lines]
+        rect = pygame.Rect(0, GAME_STATE_OBJ_SIZE, max(s.get_width() for s in surfs) + 12, step * len(surfs) + 8)
+        if self.overlay_rect is not None:
+            rect.union_ip(self.overlay_rect)
+        rect = rect.clip(screen.get_rect())
+        screen.fill((30, 30, 30), rect)
+        for i, surf in enumerate(surfs):
+            screen.blit(surf, (rect.x + 6, rect.y + 4 + i * step))
+        self.overlay_rect = rect
+        self.dirty_rects.append(rect)
+
+    # Removes the overlay panel by repainting the window.
+    def hide_overlay(self):
+        self.overlay_rect = None
+        self.invalidate()
+
+    # Returns the screen rects changed since the last call, for pygame.display.update.
+    def flush(self):
+        rects, self.dirty_rects = self.dirty_rects, []
+        return rects
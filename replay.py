@@ -0,0 +1,157 @@
+'''
+File: replay.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Game replay logs and a headless replay player. A ReplayRecorder hooked into
+InputHandler logs every reveal and flag toggle (human or AI) with its time since the game
+started, next to the seed, board configuration and final board state. One game is one JSON
+line. The player re-runs logged games at full speed on a process pool, with no PyGame,
+and checks that every game ends in the same board state, so a corpus of real games doubles
+as a regression and performance test.
+Inputs: Replay log files (replays.jsonl).
+Outputs: Replay log lines; replay report on stdout (exits with status 1 on a mismatch).
+External Sources: None.
+'''
+
+# Imports.
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import board_class
+from inputHandler import InputHandler
+from noGuess import fixed_layout
+
+REPLAY_VERSION = 1
+# Board storages that can be logged and replayed (the endless board has no final state to compare).
+STORAGES = ("list", "packed", "array")
+# Event codes: bit 0 set for a flag toggle (clear for a reveal), bit 1 set for an AI action.
+FLAG_BIT = 1
+AI_BIT = 2
+
+# Final state of a board as logged: outcome, counters and a hash of every cell.
+def game_result(board):
+    return {"gameOver": board.gameOver, "victory": board.victory,
+            "revealed": board.revealed_count, "flags": board.flags_placed,
+            "digest": hashlib.sha1(board.cell_bytes()).hexdigest()}
+
+# Records the actions of one game. Events are a flat list of
+# [milliseconds since the previous event, code, row, col] groups.
+class ReplayRecorder:
+    def __init__(self, board, handler=None):
+        if board.storage not in STORAGES:
+            raise ValueError(f"{board.storage} boards can't be replayed")
+        self.board = board
+        self.events = []
+        self.start = time.perf_counter() # game start
+        self.last_ms = 0 # time of the previous event
+        self.saved = False
+        if handler is not None:
+            handler.recorder = self
+
+    # Called by InputHandler after an action changed the board.
+    def record(self, action, actor, row, col):
+        ms = int((time.perf_counter() - self.start) * 1000)
+        code = (FLAG_BIT if action == "flag" else 0) | (AI_BIT if actor == "ai" else 0)
+        self.events.extend((ms - self.last_ms, code, row, col))
+        self.last_ms = ms
+
+    # The log entry for this game so far. Games on a no-guess layout also log its id.
+    def to_record(self):
+        board = self.board
+        record = {"v": REPLAY_VERSION, "time": round(time.time()), "storage": board.storage,
+                  "rows": board.rows, "cols": board.cols, "mines": board.mine_count, "seed": board.seed,
+                  "ai_mode": board.ai_mode, "difficulty": board.difficulty, "player": board.player_name,
+                  "events": self.events, "result": game_result(board)}
+        if board.layout_id is not None:
+            record["layout"] = board.layout_id
+        return record
+
+    # Appends the game to a log file in one write. Games are saved once, and only if
+    # something happened.
+    def save(self, path):
+        if self.saved or not self.events:
+            return
+        line = json.dumps(self.to_record(), separators=(",", ":")) + "\n"
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+        self.saved = True
+
+# Re-runs one logged game and compares its final state with the log.
+def replay_game(job):
+    source, record = job
+    if record["storage"] not in STORAGES:
+        raise ValueError(f"{record['storage']} boards can't be replayed")
+    board = board_class(record["storage"])(record["rows"], record["cols"], record["mines"],
+                                           record["ai_mode"], record["difficulty"], seed=record["seed"])
+    if record.get("layout") is not None:
+        board.layout_source = fixed_layout(record["layout"])
+    handler = InputHandler(board)
+    events = record["events"]
+    start = time.perf_counter()
+    for i in range(0, len(events), 4):
+        code, row, col = events[i + 1], events[i + 2], events[i + 3]
+        actor = "ai" if code & AI_BIT else "human"
+        if code & FLAG_BIT:
+            handler.toggle_flag(row, col, actor)
+        else:
+            handler.reveal_cell(row, col, actor)
+        # The game loop checks for a win every frame
+        board.victoryCheck()
+    seconds = time.perf_counter() - start
+    return {"source": source, "ok": game_result(board) == record["result"],
+            "events": len(events) // 4, "seconds": seconds}
+
+# Yields (source, record) for every game in the log files. A cut-off last line (from a
+# crash mid-write) is skipped.
+def read_logs(paths):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for n, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    print(f"{path}:{n}: unreadable line skipped")
+                    continue
+                if record.get("v") != REPLAY_VERSION:
+                    print(f"{path}:{n}: unsupported replay version skipped")
+                    continue
+                if record.get("storage") not in STORAGES:
+                    print(f"{path}:{n}: {record.get('storage')} board can't be replayed, skipped")
+                    continue
+                yield f"{path}:{n}", record
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay logged games headlessly and check their final states.")
+    parser.add_argument("logs", nargs="+", help="replay log files")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--limit", type=int, help="replay at most this many games")
+    args = parser.parse_args(argv)
+
+    jobs = list(read_logs(args.logs))[:args.limit]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        chunk = max(1, len(jobs) // (4 * (args.workers or 1)))
+        results = list(pool.map(replay_game, jobs, chunksize=chunk))
+    wall = time.perf_counter() - start
+
+    mismatches = [res["source"] for res in results if not res["ok"]]
+    for source in mismatches:
+        print(f"{source}: final board state differs from the log")
+    events = sum(res["events"] for res in results)
+    busy = sum(res["seconds"] for res in results)
+    print(f"{len(results)} games, {events} actions replayed in {wall:.2f}s "
+          f"({len(results) / wall if wall > 0 else 0:.0f} games/s, "
+          f"{events / busy if busy > 0 else 0:.0f} actions/s per worker), {len(mismatches)} mismatched")
+    if mismatches:
+        sys.exit(1)
+
+# Calls main function.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+'''
+File: saveGame.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Binary save and restore of an in-progress game. A snapshot is a fixed header
+(board size, seed, counters, flags and timer), three short strings, then the board's
+cell_bytes(): one byte per cell with the revealed, flag and mine bits and the adjacent
+count. Loading hands that block straight to the board, so packed and NumPy boards restore
+without any per-cell Python work and take milliseconds even with millions of cells.
+Inputs: Snapshot files.
+Outputs: Snapshot files.
+External Sources: None.
+'''
+
+# Imports.
+import os
+import struct
+import time
+from board import board_class
+from inputHandler import InputHandler
+
+MAGIC = b"MSWP"
+SAVE_VERSION = 1
+# magic, version, storage, state flags, rows, cols, mines, seed, revealed, flags placed,
+# covered safe cells, elapsed seconds
+HEADER = struct.Struct("<4sBBHIIIQIIId")
+STORAGES = ("list", "packed", "array")
+# State flag bits.
+GAME_OVER = 1
+VICTORY = 2
+FIRST_CLICK = 4 # InputHandler.firstClick: no mines placed yet
+
+# Length-prefixed UTF-8 string.
+def pack_text(text):
+    data = text.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+# Reads a length-prefixed string at offset; returns (text, next offset). Raises ValueError
+# if the prefix or the text runs past the end of buf.
+def unpack_text(buf, offset):
+    if offset + 2 > len(buf):
+        raise ValueError("truncated save")
+    (n,) = struct.unpack_from("<H", buf, offset)
+    offset += 2
+    if offset + n > len(buf):
+        raise ValueError("truncated save")
+    return bytes(buf[offset:offset + n]).decode("utf-8"), offset + n
+
+# Writes a snapshot of the game to path. The file is written next to the target and
+# atomically moved over it, so an old save survives a crash mid-write.
+def save_game(path, board, handler):
+    if board.storage not in STORAGES:
+        raise ValueError(f"{board.storage} boards can't be saved")
+    board.update_timer()
+    state = ((GAME_OVER if board.gameOver else 0) | (VICTORY if board.victory else 0) |
+             (FIRST_CLICK if handler.firstClick else 0))
+    header = HEADER.pack(MAGIC, SAVE_VERSION, STORAGES.index(board.storage), state,
+                         board.rows, board.cols, board.mine_count, board.seed,
+                         board.revealed_count, board.flags_placed, board.covered_safe,
+                         board.elapsed_time_seconds)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(pack_text(board.ai_mode) + pack_text(board.difficulty) + pack_text(board.player_name))
+        f.write(board.cell_bytes())
+    os.replace(tmp, path)
+
+# Restores a snapshot written by save_game. Returns (board, handler), with the timer
+# running on from the saved time unless the game was over. Raises ValueError for files
+# that aren't snapshots, are cut short, or need a storage that can't be loaded here.
+def load_game(path):
+    with open(path, "rb") as f:
+        buf = memoryview(f.read())
+    if len(buf) < HEADER.size:
+        raise ValueError(f"{path} is not a saved game")
+    (magic, version, storage, state, rows, cols, mines, seed,
+     revealed, flags, covered, elapsed) = HEADER.unpack_from(buf)
+    if magic != MAGIC or version != SAVE_VERSION or storage >= len(STORAGES):
+        raise ValueError(f"{path} is not a saved game")
+    offset = HEADER.size
+    ai_mode, offset = unpack_text(buf, offset)
+    difficulty, offset = unpack_text(buf, offset)
+    player, offset = unpack_text(buf, offset)
+    cells = buf[offset:]
+    if len(cells) != rows * cols:
+        raise ValueError("truncated save")
+
+    try:
+        board = board_class(STORAGES[storage])(rows, cols, mines, ai_mode, difficulty, seed=seed)
+    # an array save needs NumPy to load
+    except ImportError as e:
+        raise ValueError(f"{path} can't be loaded: {e}")
+    board.load_cell_bytes(cells)
+    board.set_player_name(player)
+    board.revealed_count = revealed
+    board.flags_placed = flags
+    board.covered_safe = covered
+    board.gameOver = bool(state & GAME_OVER)
+    board.victory = bool(state & VICTORY)
+    board.elapsed_time_seconds = elapsed
+    handler = InputHandler(board)
+    handler.firstClick = bool(state & FIRST_CLICK)
+    if not handler.firstClick:
+        board.minesPlaced = True
+    if not board.gameOver:
+        board.start_time = time.time() - elapsed
+    return board, handler
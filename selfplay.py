@@ -0,0 +1,142 @@
+'''
+File: selfplay.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Batch AI self-play benchmark. Plays N seeded games per (difficulty, board size,
+mine count) configuration on a process pool, with no display and no move delay, and reports
+win rate, average moves and moves per second.
+Inputs: Command line options (see --help).
+Outputs: Summary table on stdout; optional JSON summary and per-game CSV files.
+External Sources: None.
+'''
+
+# Imports.
+import argparse
+import csv
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+from inputHandler import InputHandler
+from ai import AI
+
+# Plays one AI-only game. The seed fixes both the mine layout and the AI's random choices,
+# so any game can be replayed exactly.
+def play_game(job):
+    difficulty, rows, cols, mines, seed, use_array = job
+    random.seed(seed)
+    if use_array:
+        from arrayBoard import ArrayBoard
+        board = ArrayBoard(rows, cols, mines, "y", difficulty, seed=seed)
+    else:
+        board = Board(rows, cols, mines, "y", difficulty, seed=seed)
+    handler = InputHandler(board)
+    ai = AI(board, difficulty)
+    moves = 0 # cells clicked, counted one by one so batches compare with single reveals
+    batches = 0 # AI decisions (a reveal_many batch is one)
+    start = time.perf_counter()
+    while not board.gameOver:
+        action, rc = ai.make_move()
+        if action == "reveal_many":
+            # A cell already opened by an earlier cell's flood fill isn't a click
+            for r, c in rc:
+                moves += handler.reveal_cell(r, c)
+        elif action == "reveal" and rc is not None:
+            moves += handler.reveal_cell(*rc)
+        else:
+            break
+        board.victoryCheck()
+        batches += 1
+    seconds = time.perf_counter() - start
+    return {"difficulty": difficulty, "rows": rows, "cols": cols, "mines": mines, "seed": seed,
+            "won": board.victory, "moves": moves, "batches": batches, "seconds": seconds}
+
+# Aggregates per-game results into one summary row per configuration.
+def summarize(results):
+    groups = {}
+    for res in results:
+        key = (res["difficulty"], res["rows"], res["cols"], res["mines"])
+        groups.setdefault(key, []).append(res)
+    summary = []
+    for (difficulty, rows, cols, mines), games in groups.items():
+        moves = sum(g["moves"] for g in games)
+        seconds = sum(g["seconds"] for g in games)
+        summary.append({
+            "difficulty": difficulty, "rows": rows, "cols": cols, "mines": mines,
+            "games": len(games),
+            "win_rate": sum(g["won"] for g in games) / len(games),
+            "avg_moves": moves / len(games),
+            "avg_batches": sum(g["batches"] for g in games) / len(games),
+            "moves_per_sec": moves / seconds if seconds > 0 else 0.0,
+        })
+    return summary
+
+# Prints the summary as a fixed-width table.
+def print_table(summary):
+    print(f"{'difficulty':<10} {'board':>11} {'mines':>7} {'games':>7} {'win %':>7} {'avg moves':>10} {'avg batches':>12} {'moves/s':>10}")
+    for row in summary:
+        board = f"{row['rows']}x{row['cols']}"
+        print(f"{row['difficulty']:<10} {board:>11} {row['mines']:>7} {row['games']:>7} "
+              f"{100 * row['win_rate']:>6.1f}% {row['avg_moves']:>10.1f} {row['avg_batches']:>12.1f} {row['moves_per_sec']:>10.0f}")
+
+# Parses "ROWSxCOLS" board sizes.
+def parse_size(text):
+    rows, _, cols = text.lower().partition("x")
+    try:
+        return int(rows), int(cols or rows)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"board size must look like 10x10, got {text!r}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded AI self-play games in parallel.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="games per configuration")
+    parser.add_argument("-d", "--difficulty", nargs="+", default=["easy", "medium", "hard"],
+                        choices=["easy", "medium", "hard"])
+    parser.add_argument("-s", "--size", nargs="+", type=parse_size, default=[(10, 10)], help="board sizes, e.g. 10x10 16x30")
+    parser.add_argument("-m", "--mines", nargs="+", type=int, default=[15], help="mine counts")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--array", action="store_true", help="use the NumPy-backed ArrayBoard")
+    parser.add_argument("--json", help="write the summary to this JSON file")
+    parser.add_argument("--csv", help="write one row per game to this CSV file")
+    args = parser.parse_args(argv)
+
+    # Skip boards that can't hold the mines outside a 3x3 first-click safe zone
+    configs = []
+    for rows, cols in args.size:
+        for mines in args.mines:
+            if mines > rows * cols - 9:
+                print(f"Skipping {rows}x{cols} with {mines} mines: too many mines for the board")
+            else:
+                configs.append((rows, cols, mines))
+    # Game i of every configuration shares a seed, so difficulties face the same layouts
+    jobs = [(difficulty, rows, cols, mines, args.seed + i, args.array)
+            for difficulty in args.difficulty
+            for rows, cols, mines in configs
+            for i in range(args.games)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        chunk = max(1, len(jobs) // (4 * (args.workers or 1)))
+        results = list(pool.map(play_game, jobs, chunksize=chunk))
+    wall = time.perf_counter() - start
+
+    summary = summarize(results)
+    print_table(summary)
+    if results:
+        print(f"{len(results)} games in {wall:.2f}s ({len(results) / wall:.0f} games/s, {args.workers} workers)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "games_per_config": args.games, "wall_seconds": wall,
+                       "configs": summary}, f, indent=2)
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()) if results else [])
+            writer.writeheader()
+            writer.writerows(results)
+
+# Calls main function.
+if __name__ == "__main__":
+    main()
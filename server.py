@@ -0,0 +1,195 @@
+'''
+File: server.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Multiplayer game server. One asyncio process hosts a Board/InputHandler session per
+connection, over local TCP or a UNIX socket. Clients send reveal, flag and chord actions (see
+protocol.py) and get back a delta with only the cells that action changed, collected through
+the board's listeners. Sessions use the byte-per-cell PackedBoard, so thousands fit in one
+process. Play it with client.py and measure it with loadGen.py.
+Inputs: Command line options (see --help); client connections.
+Outputs: Deltas to clients; statistics on stdout.
+External Sources: None.
+'''
+
+# Imports.
+import argparse
+import asyncio
+import os
+import signal
+import struct
+import time
+from board import board_class
+from config import *
+from inputHandler import InputHandler
+from protocol import *
+from settings import mine_bounds
+
+# One player's game: a board, its input handler and the cells changed since the last delta.
+class Session:
+    def __init__(self, storage="packed"):
+        self.storage = storage
+        self.board = None
+        self.handler = None
+        self.changed = [] # cells the board reported changed, filled by the board listener
+
+    # Starts a new game. Raises ValueError for a size or mine count the server won't host.
+    def new_game(self, rows, cols, mines):
+        if not (MIN_BOARD_SIZE <= rows <= MAX_BOARD_SIZE and MIN_BOARD_SIZE <= cols <= MAX_BOARD_SIZE):
+            raise ValueError(f"rows and cols must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}")
+        if rows * cols > SERVER_MAX_CELLS:
+            raise ValueError(f"boards are limited to {SERVER_MAX_CELLS} cells")
+        lo, hi = mine_bounds(rows, cols)
+        if not lo <= mines <= hi:
+            raise ValueError(f"mines must be between {lo} and {hi} on a {rows}x{cols} board")
+        self.board = board_class(self.storage)(rows, cols, mines, "n", "no_ai")
+        # Nothing is drawn here; dirty_all stays set so the board keeps no redraw list
+        self.board.listeners.append(self.changed.extend)
+        self.handler = InputHandler(self.board)
+        self.changed.clear()
+        self.board.start_timer()
+
+    # Applies a REVEAL, FLAG or CHORD action. Actions outside the board or after the game
+    # ended change nothing (and get an empty delta).
+    def act(self, msg_type, row, col):
+        board = self.board
+        if board is None:
+            raise ValueError("no game started")
+        if board.gameOver or not (0 <= row < board.rows and 0 <= col < board.cols):
+            return
+        if msg_type == REVEAL:
+            self.handler.reveal_cell(row, col)
+        elif msg_type == FLAG:
+            self.handler.toggle_flag(row, col)
+        else:
+            self.handler.chord(row, col)
+        board.victoryCheck()
+        if board.gameOver:
+            board.stop_timer()
+
+    # DELTA message for everything changed since the last one.
+    def delta(self):
+        board = self.board
+        cols = board.cols
+        positions = [cell.row * cols + cell.col for cell in self.changed]
+        self.changed.clear()
+        codes = board.cell_codes(positions).translate(VISIBLE)
+        status = (GAME_OVER if board.gameOver else 0) | (VICTORY if board.victory else 0)
+        return delta_message(status, board.flags_placed, positions, codes)
+
+# Accepts connections and runs one Session per connection.
+class GameServer:
+    def __init__(self, storage="packed"):
+        self.storage = storage
+        self.sessions = 0 # open sessions
+        self.peak_sessions = 0
+        self.actions = 0 # messages handled
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    # Reply to one message.
+    def handle(self, session, msg_type, payload):
+        try:
+            if msg_type in ACTIONS:
+                row, col = CELL_MSG.unpack(payload)
+                session.act(msg_type, row, col)
+                return session.delta()
+            if msg_type == NEW_GAME:
+                rows, cols, mines = GAME_MSG.unpack(payload)
+                session.new_game(rows, cols, mines)
+                return pack(GAME, payload)
+            if msg_type == STATS:
+                return pack(STATS_REPLY, STATS_MSG.pack(*self.stats()))
+            raise ValueError(f"unknown message type {msg_type}")
+        except (ValueError, struct.error) as e:
+            return pack(ERROR, str(e).encode("utf-8"))
+
+    # (open sessions, actions handled, CPU seconds, wall seconds) since the server started.
+    def stats(self):
+        return (self.sessions, self.actions, time.process_time() - self.cpu_started,
+                time.perf_counter() - self.started)
+
+    # Serves one connection until it closes or sends something malformed. Actions on boards
+    # over SERVER_INLINE_CELLS (a first click places every mine and counts the whole board,
+    # a flood fill can open most of it) run on the default thread pool so other sessions
+    # keep being served meanwhile; a session's own messages are still handled in order.
+    async def serve_client(self, reader, writer):
+        session = Session(self.storage)
+        loop = asyncio.get_running_loop()
+        self.sessions += 1
+        self.peak_sessions = max(self.peak_sessions, self.sessions)
+        try:
+            while True:
+                msg_type, payload = await read_message(reader, MAX_CLIENT_MESSAGE)
+                board = session.board
+                if msg_type in ACTIONS and board is not None and board.rows * board.cols > SERVER_INLINE_CELLS:
+                    reply = await loop.run_in_executor(None, self.handle, session, msg_type, payload)
+                else:
+                    reply = self.handle(session, msg_type, payload)
+                writer.write(reply)
+                self.actions += 1
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    # Prints a statistics line every `seconds`.
+    async def report(self, seconds):
+        last = self.stats()
+        while True:
+            await asyncio.sleep(seconds)
+            now = self.stats()
+            wall = now[3] - last[3]
+            print(f"{now[0]} sessions, {(now[1] - last[1]) / wall:.0f} actions/s, "
+                  f"CPU {(now[2] - last[2]) / wall:.0%}", flush=True)
+            last = now
+
+async def serve(args):
+    server = GameServer(args.storage)
+    if args.unix:
+        listener = await asyncio.start_unix_server(server.serve_client, args.unix, backlog=SERVER_BACKLOG)
+        where = args.unix
+    else:
+        listener = await asyncio.start_server(server.serve_client, args.host, args.port, backlog=SERVER_BACKLOG)
+        where = f"{args.host}:{args.port}"
+    print(f"Serving Minesweeper on {where}", flush=True)
+    loop = asyncio.get_running_loop()
+    if args.stats:
+        loop.create_task(server.report(args.stats))
+    # Ctrl-C or SIGTERM stops the server (signal handlers aren't available on Windows)
+    stopping = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stopping.set)
+    except NotImplementedError:
+        pass
+    try:
+        async with listener:
+            await stopping.wait()
+    finally:
+        sessions, actions, cpu, wall = server.stats()
+        print(f"{actions} actions in {wall:.0f}s, peak {server.peak_sessions} sessions, "
+              f"CPU {cpu:.1f}s")
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host Minesweeper sessions for client.py and loadGen.py.")
+    parser.add_argument("--host", default=SERVER_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="TCP port to listen on")
+    parser.add_argument("--unix", metavar="PATH", help="listen on this UNIX socket instead of TCP")
+    parser.add_argument("--storage", default="packed", choices=["list", "packed", "array"],
+                        help="board storage for sessions")
+    parser.add_argument("--stats", type=float, metavar="SECONDS", help="print statistics this often")
+    args = parser.parse_args(argv)
+
+    raise_file_limit()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+# Calls main function.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+'''
+File: settings.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Game settings from the command line or a settings file, so a game can start
+without the startup prompts. Settings are read from a JSON settings file (settings.json by
+default, if present) and then from command-line flags, which win; anything still unset is
+asked for at the prompts as before.
+Inputs: Command-line arguments, settings.json.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import argparse
+import json
+import math
+import os
+from config import *
+
+# Settings that can replace a startup prompt.
+SETTING_KEYS = ("name", "size", "mines", "ai", "sound", "no_guess")
+AI_CHOICES = ("none", "easy", "medium", "hard")
+
+# Parses a board size given as ROWSxCOLS, or "inf" for the endless board. Raises
+# ValueError if it isn't a valid size.
+def parse_board_size(text):
+    text = str(text).strip().lower()
+    if text == "inf":
+        return math.inf, math.inf
+    try:
+        rows, cols = (int(part) for part in text.split("x"))
+    except ValueError:
+        raise ValueError("Please enter the size like 16x30.")
+    if MIN_BOARD_SIZE <= rows <= MAX_BOARD_SIZE and MIN_BOARD_SIZE <= cols <= MAX_BOARD_SIZE:
+        return rows, cols
+    raise ValueError(f"Rows and cols must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}.")
+
+# Allowed mine counts for a board: 10-20% of the cells (10-20 on the default 10x10),
+# leaving room for the safe first click.
+def mine_bounds(rows, cols):
+    cells = rows * cols
+    lo = max(1, cells // 10)
+    hi = max(lo, min(cells // 5, cells - 9))
+    return lo, hi
+
+# Player name with only basic characters kept (to avoid weird font issues), or None if it
+# isn't 1-20 characters long.
+def clean_name(name):
+    name = str(name).strip()
+    if not 1 <= len(name) <= 20:
+        return None
+    return "".join(ch for ch in name if ch.isalnum() or ch in " _-")
+
+# Checks raw settings and converts them: size becomes (rows, cols), mines an int, ai one of
+# AI_CHOICES, and sound and no_guess bools. Raises ValueError naming the bad setting.
+def validate(settings):
+    unknown = set(settings) - set(SETTING_KEYS)
+    if unknown:
+        raise ValueError(f"unknown setting {sorted(unknown)[0]!r}")
+    result = {}
+    if settings.get("name") is not None:
+        result["name"] = clean_name(settings["name"])
+        if result["name"] is None:
+            raise ValueError("name must be 1-20 characters")
+    if settings.get("size") is not None:
+        result["size"] = parse_board_size(settings["size"])
+    if settings.get("mines") is not None:
+        if isinstance(settings["mines"], bool) or not isinstance(settings["mines"], int):
+            raise ValueError("mines must be a whole number")
+        result["mines"] = settings["mines"]
+    if settings.get("ai") is not None:
+        ai = str(settings["ai"]).strip().lower()
+        if ai not in AI_CHOICES:
+            raise ValueError(f"ai must be one of {', '.join(AI_CHOICES)}")
+        result["ai"] = ai
+    for key in ("sound", "no_guess"):
+        if settings.get(key) is not None:
+            if not isinstance(settings[key], bool):
+                raise ValueError(f"{key} must be true or false")
+            result[key] = settings[key]
+    return result
+
+# Reads a settings file: a JSON object with any of SETTING_KEYS.
+def load_settings(path):
+    with open(path, "r", encoding="utf-8") as f:
+        settings = json.load(f)
+    if not isinstance(settings, dict):
+        raise ValueError("expected a JSON object")
+    return settings
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Minesweeper. Settings not given here or in the settings file are asked for at startup.")
+    parser.add_argument("--name", help="player name (1-20 characters)")
+    parser.add_argument("--size", help="board size as ROWSxCOLS, or inf for the endless board")
+    parser.add_argument("--mines", type=int, help="number of mines")
+    parser.add_argument("--ai", type=str.lower, choices=AI_CHOICES, help="AI opponent difficulty, or none")
+    parser.add_argument("--no-guess", dest="no_guess", action="store_const", const=True,
+                        help="only deal boards that can be cleared without guessing")
+    parser.add_argument("--no-sound", dest="sound", action="store_const", const=False, help="never start the audio mixer")
+    parser.add_argument("--settings", metavar="FILE", help="settings file (JSON) to read instead of settings.json")
+    parser.add_argument("--startup-report", nargs="?", const="", metavar="LOG",
+                        help="print how long startup took up to the first frame, and append it as a JSON line to LOG if given")
+    parser.add_argument("--quit-after-first-frame", action="store_true", help="exit once the first frame is shown (for timing startup)")
+    return parser
+
+# Returns (settings, options): the validated settings from the settings file and the flags,
+# and the parsed command line. default_path is only read if it exists.
+def startup_settings(argv=None, default_path=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    raw = {}
+    path = options.settings or default_path
+    if path is not None and (options.settings or os.path.exists(path)):
+        try:
+            raw.update(load_settings(path))
+        except (OSError, ValueError) as e:
+            parser.error(f"can't read settings file {path}: {e}")
+    for key in SETTING_KEYS:
+        value = getattr(options, key)
+        if value is not None:
+            raw[key] = value
+    try:
+        settings = validate(raw)
+    except ValueError as e:
+        parser.error(str(e))
+    return settings, options
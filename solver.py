@@ -0,0 +1,317 @@
+'''
+File: solver.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Mine probability solver for the hard AI. Uses only what a player can see: revealed
+numbers, flags and the total mine count. Single-number and subset deductions are applied
+first, the rest of the frontier is split into independent constraint components,
+consistent mine assignments are counted per component, and the components are combined
+with the global mine total to get an exact mine probability for every covered cell.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import math
+import random
+
+# Components with more cell groups than this are estimated locally instead of enumerated,
+# which keeps the worst-case time per move bounded.
+MAX_COMPONENT_GROUPS = 24
+
+# Raised when a caller's should_stop() asks a running computation to give up.
+class SolverCancelled(Exception):
+    pass
+
+# Class that computes mine probabilities from a FrontierIndex.
+class ProbabilitySolver:
+    def __init__(self, board, frontier):
+        self.board = board
+        self.frontier = frontier
+        # Guesses off the frontier follow the board's seed (a stream of their own, so they
+        # don't mirror the generator that placed the mines)
+        self.rng = random.Random(f"solver:{board.seed}")
+        self.cache = {} # component key -> (cell groups, {mines: (weight, mine weight per group)})
+
+    # Returns ({(r, c): probability} for covered cells next to a number, probability for
+    # every other covered cell). Flags are treated as mines. should_stop is polled during
+    # enumeration; SolverCancelled is raised once it returns True.
+    def probabilities(self, should_stop=None):
+        board = self.board
+        constraints, frontierCells = self.constraints()
+        safe, mines = self.deduce(constraints)
+        # Covered, unflagged cells that no number touches
+        others = board.rows * board.cols - board.revealed_count - board.flags_placed - frontierCells
+        remaining = board.mine_count - board.flags_placed - len(mines) # mines not yet accounted for
+
+        probs = dict.fromkeys(safe, 0.0)
+        probs.update(dict.fromkeys(mines, 1.0))
+        exact = [] # (groups, distribution) for enumerated components
+        keep = {}
+        for component in self.components(constraints):
+            key = tuple(sorted(component))
+            if key not in self.cache:
+                self.cache[key] = self.enumerate(component, should_stop)
+            keep[key] = self.cache[key]
+            groups, dist = self.cache[key]
+            if dist is None:
+                # Too big to enumerate: local estimate from each cell's tightest constraint
+                estimate = {}
+                for need, vars in component:
+                    for v in vars:
+                        estimate[v] = max(estimate.get(v, 0.0), need / len(vars))
+                probs.update(estimate)
+                remaining -= round(sum(estimate.values()))
+            elif not dist:
+                # No consistent assignment (a flag must be wrong): no information here
+                for _, vars in component:
+                    probs.update(dict.fromkeys(vars, 0.5))
+            else:
+                exact.append((groups, dist))
+        # Only components that still exist stay memoized
+        self.cache = keep
+
+        # Relative weight of placing t mines among the off-frontier cells: C(others, t)
+        maxK = sum(max(dist) for _, dist in exact)
+        logs = {t: self.log_comb(others, t) for t in range(remaining - maxK, remaining + 1) if 0 <= t <= others}
+        base = max(logs.values()) if logs else 0.0
+        def offWeight(t):
+            return math.exp(logs[t] - base) if t in logs else 0.0
+
+        # Mine-count distributions of each component, normalized to avoid float overflow
+        dists = []
+        for _, dist in exact:
+            top = max(weight for weight, _ in dist.values())
+            dists.append({k: weight / top for k, (weight, _) in dist.items()})
+        # Distribution of all other components combined, via prefix/suffix convolutions
+        prefix = [{0: 1.0}]
+        for d in dists:
+            prefix.append(self.convolve(prefix[-1], d))
+        suffix = [{0: 1.0}]
+        for d in reversed(dists):
+            suffix.append(self.convolve(suffix[-1], d))
+        suffix.reverse()
+
+        for i, (groups, dist) in enumerate(exact):
+            rest = self.convolve(prefix[i], suffix[i + 1])
+            top = max(weight for weight, _ in dist.values())
+            total = 0.0
+            mineWeight = [0.0] * len(groups)
+            for k, (weight, perGroup) in dist.items():
+                # Weight of this component holding k mines, given everything else
+                w = sum(r * offWeight(remaining - k - kk) for kk, r in rest.items()) / top
+                total += weight * w
+                for g, m in enumerate(perGroup):
+                    mineWeight[g] += m * w
+            for g, cells in enumerate(groups):
+                p = mineWeight[g] / total / len(cells) if total > 0 else 0.5
+                probs.update(dict.fromkeys(cells, p))
+
+        # Off-frontier cells share the expected number of leftover mines
+        offProb = 0.0
+        if others > 0:
+            total = expected = 0.0
+            for k, r in prefix[-1].items():
+                w = r * offWeight(remaining - k)
+                total += w
+                expected += w * (remaining - k)
+            offProb = expected / total / others if total > 0 else 0.5
+        return probs, offProb
+
+    # One constraint per frontier number: [mines still needed, set of covered unflagged
+    # neighbours]. Also returns how many distinct cells those constraints cover.
+    def constraints(self):
+        grid = self.board.grid
+        frontier = self.frontier
+        constraints = []
+        cells = set()
+        for pos in frontier.cells():
+            vars = {p for p in frontier.neighbors(*pos)
+                    if not grid[p[0]][p[1]].isClicked and not grid[p[0]][p[1]].isFlagged}
+            need = grid[pos[0]][pos[1]].adjMines - frontier.flagged[pos]
+            constraints.append([need, vars])
+            cells |= vars
+        return constraints, len(cells)
+
+    # Applies the single-number rules (need 0: all safe, need == cells: all mines) and, when
+    # those are stuck, the subset rule (one number's cells inside another's: the rest hold the
+    # difference) until nothing changes. Deduced cells are removed from the constraints in
+    # place. Components too big to enumerate are only estimated, so anything provable has to
+    # be found here.
+    def deduce(self, constraints):
+        owners = {} # cell -> constraints touching it
+        for con in constraints:
+            for v in con[1]:
+                owners.setdefault(v, []).append(con)
+        safe, mines = set(), set()
+        work = list(constraints)
+
+        def settle(v, isMine):
+            (mines if isMine else safe).add(v)
+            for con in owners[v]:
+                con[1].discard(v)
+                if isMine:
+                    con[0] -= 1
+                work.append(con)
+
+        while True:
+            while work:
+                need, vars = work.pop()
+                if not vars or not (need == 0 or need == len(vars)):
+                    continue
+                for v in list(vars):
+                    settle(v, need > 0)
+            found = {}
+            for con in constraints:
+                need, vars = con
+                if not vars:
+                    continue
+                near = {id(other): other for v in vars for other in owners[v] if other is not con}
+                for otherNeed, other in near.values():
+                    if len(other) > len(vars) and vars < other:
+                        rest = other - vars
+                        if otherNeed == need:
+                            found.update(dict.fromkeys(rest, False))
+                        elif otherNeed - need == len(rest):
+                            found.update(dict.fromkeys(rest, True))
+            if not found:
+                return safe, mines
+            for v, isMine in found.items():
+                if v not in safe and v not in mines:
+                    settle(v, isMine)
+
+    # Splits the remaining constraints into independent components, each a list of
+    # (need, cells) with the cells as a sorted tuple.
+    def components(self, constraints):
+        owners = {}
+        live = [con for con in constraints if con[1]]
+        for i, (_, vars) in enumerate(live):
+            for v in vars:
+                owners.setdefault(v, []).append(i)
+        components = []
+        seen = set()
+        for start in range(len(live)):
+            if start in seen:
+                continue
+            seen.add(start)
+            queue = [start]
+            for i in queue:
+                for v in live[i][1]:
+                    for j in owners[v]:
+                        if j not in seen:
+                            seen.add(j)
+                            queue.append(j)
+            components.append([(live[i][0], tuple(sorted(live[i][1]))) for i in queue])
+        return components
+
+    # Counts the mine assignments of a component that satisfy its numbers. Cells touched by
+    # exactly the same numbers form one group, and a group holding k of its s cells counts
+    # C(s, k) ways. Returns (groups, {mines: (ways, [ways * mines in each group])}); the
+    # distribution is None if the component is too big to enumerate.
+    def enumerate(self, component, should_stop=None):
+        need = [n for n, _ in component]
+        touching = {} # cell -> ids of the numbers touching it
+        for ci, (_, vars) in enumerate(component):
+            for v in vars:
+                touching.setdefault(v, []).append(ci)
+        byKey = {}
+        for v, cis in touching.items():
+            byKey.setdefault(tuple(cis), []).append(v)
+        groups = list(byKey.values())
+        if len(groups) > MAX_COMPONENT_GROUPS:
+            return groups, None
+        groupCons = [touching[cells[0]] for cells in groups]
+        # Assign groups in order of their first number so constraints close early
+        order = sorted(range(len(groups)), key=lambda g: groupCons[g])
+        groups = [groups[g] for g in order]
+        groupCons = [groupCons[g] for g in order]
+        left = [len(vars) for _, vars in component] # unassigned cells per number
+        placed = [0] * len(component) # mines assigned per number
+        assignment = [0] * len(groups)
+        dist = {}
+
+        def search(g, mines, ways):
+            if should_stop is not None and should_stop():
+                raise SolverCancelled()
+            if g == len(groups):
+                total, perGroup = dist.get(mines, (0, [0] * len(groups)))
+                for j in range(len(groups)):
+                    perGroup[j] += ways * assignment[j]
+                dist[mines] = (total + ways, perGroup)
+                return
+            size = len(groups[g])
+            cons = groupCons[g]
+            for ci in cons:
+                left[ci] -= size
+            # Mines this group can hold without breaking any of its numbers
+            lo = max([0] + [need[ci] - placed[ci] - left[ci] for ci in cons])
+            hi = min([size] + [need[ci] - placed[ci] for ci in cons])
+            for k in range(lo, hi + 1):
+                for ci in cons:
+                    placed[ci] += k
+                assignment[g] = k
+                search(g + 1, mines + k, ways * math.comb(size, k))
+                for ci in cons:
+                    placed[ci] -= k
+            assignment[g] = 0
+            for ci in cons:
+                left[ci] += size
+
+        search(0, 0, 1)
+        return groups, dist
+
+    # Convolution of two {mines: weight} distributions, normalized to a max of 1.
+    @staticmethod
+    def convolve(a, b):
+        out = {}
+        for ka, wa in a.items():
+            for kb, wb in b.items():
+                out[ka + kb] = out.get(ka + kb, 0.0) + wa * wb
+        top = max(out.values()) if out else 0.0
+        if top > 0:
+            for k in out:
+                out[k] /= top
+        return out
+
+    @staticmethod
+    def log_comb(n, k):
+        return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+    # Covered cell with the lowest mine probability, or None if nothing is covered.
+    def best_cell(self, should_stop=None):
+        return self.pick(*self.probabilities(should_stop))
+
+    # Every covered cell proven safe (probability 0), in a fixed order; otherwise a list
+    # holding the best guess, or [] if nothing is covered.
+    def best_cells(self, should_stop=None):
+        probs, offProb = self.probabilities(should_stop)
+        safe = sorted(pos for pos, p in probs.items() if p == 0)
+        if safe:
+            return safe
+        best = self.pick(probs, offProb)
+        return [best] if best is not None else []
+
+    # Lowest-probability cell from probabilities() output, or None if nothing is covered.
+    def pick(self, probs, offProb):
+        best = min(probs, key=probs.get, default=None)
+        if best is None or offProb < probs[best]:
+            other = self.random_other_cell(probs)
+            if other is not None:
+                return other
+        return best
+
+    # A random covered, unflagged cell that no revealed number touches, or None.
+    def random_other_cell(self, frontierCells):
+        board = self.board
+        grid = board.grid
+        def isOther(r, c):
+            cell = grid[r][c]
+            return not cell.isClicked and not cell.isFlagged and (r, c) not in frontierCells
+        # Random probes almost always hit one unless the board is nearly cleared
+        for _ in range(64):
+            r, c = self.rng.randrange(board.rows), self.rng.randrange(board.cols)
+            if isOther(r, c):
+                return (r, c)
+        candidates = [(r, c) for r in range(board.rows) for c in range(board.cols) if isOther(r, c)]
+        return self.rng.choice(candidates) if candidates else None
@@ -0,0 +1,98 @@
+'''
+File: sounds.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Sound effects, loaded off the startup path. The WAV files are read on a background
+thread once the first frame is up, the mixer is only started the first time a sound plays,
+and each sound is decoded the first time it is played, so a game that never makes a sound
+never opens the audio device.
+Inputs: click.wav, flag.wav, mine.wav, victory.wav, and lose.wav.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+import io
+import os
+import threading
+import pygame
+
+# Sound name -> file in the audio folder.
+SOUND_FILES = {"click": "click.wav", "flag": "flag.wav", "mine": "mine.wav",
+               "victory": "victory.wav", "lose": "lose.wav"}
+MIXER_CHANNELS = 24 # sounds that can play at once
+EXCLUSIVE_CHANNEL = 5 # channel for sounds that cut off their previous play (flags)
+
+# Class that holds the game's sound effects.
+class SoundBank:
+    def __init__(self, folder, files=SOUND_FILES, enabled=True):
+        self.folder = folder # directory holding the sound files
+        self.files = files
+        self.enabled = enabled # False once audio is switched off or unavailable
+        self.data = {} # name -> file contents, filled by the loader thread
+        self.loader = None # background thread reading the files
+        self.sounds = None # name -> decoded pygame.mixer.Sound, once the mixer is running
+        self.channel = None # dedicated channel for exclusive sounds
+
+    # Starts reading the sound files in the background.
+    def start(self):
+        if self.enabled and self.loader is None:
+            self.loader = threading.Thread(target=self.read_files, name="sound-loader", daemon=True)
+            self.loader.start()
+
+    def read_files(self):
+        for name, file in self.files.items():
+            path = os.path.join(self.folder, file)
+            try:
+                with open(path, "rb") as f:
+                    self.data[name] = f.read()
+            # missing sounds are skipped instead of crashing
+            except OSError as e:
+                print(f"Sound not loaded: {path} -> {e}")
+
+    # Starts the mixer the first time a sound is needed. Returns False if there is no audio.
+    def ready(self):
+        if self.sounds is not None:
+            return True
+        if not self.enabled:
+            return False
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.set_num_channels(MIXER_CHANNELS)
+            self.channel = pygame.mixer.Channel(EXCLUSIVE_CHANNEL)
+        except Exception as e:
+            print("Mixer init failed:", e)
+            self.enabled = False
+            return False
+        self.sounds = {}
+        return True
+
+    # The decoded sound for a name, or None if it couldn't be loaded.
+    def sound(self, name):
+        if name not in self.sounds:
+            self.start()
+            # reading finishes within milliseconds of the first frame, so this rarely waits
+            self.loader.join()
+            data = self.data.pop(name, None)
+            self.sounds[name] = None
+            if data is not None:
+                try:
+                    self.sounds[name] = pygame.mixer.Sound(file=io.BytesIO(data))
+                except Exception as e:
+                    print(f"Sound not loaded: {self.files[name]} -> {e}")
+        return self.sounds[name]
+
+    # Plays a sound. An exclusive sound plays on its own channel, stopping the previous one.
+    def play(self, name, exclusive=False):
+        if not self.ready():
+            return
+        sound = self.sound(name)
+        if sound is None:
+            return
+        if exclusive:
+            if self.channel.get_busy():
+                self.channel.stop()
+            self.channel.play(sound)
+        else:
+            sound.play()
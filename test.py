@@ -0,0 +1,1837 @@
+'''
+File: test.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Behaviour tests for the headless game engine: flood fill, board counters, mine
+placement, the endless chunked board, the AI's frontier index, probability solver and
+background worker, batch reveals, chording, no-guess layouts, the game server's protocol and
+sessions, flags and whole games played through InputHandler and the AI, on every board
+storage, the high-score store, replay logs, binary saves, the self-play and benchmark
+runners, the frame and startup profilers, startup settings, lazily loaded sounds and the
+game loop's idle pacing, plus the renderer's partial redraws, viewport, text cache and tile
+atlas on an off-screen surface. Run with `python -m unittest test` or `python -m pytest
+test.py`; nothing here needs a display.
+Inputs: None.
+Outputs: Test results.
+External Sources: None.
+'''
+
+# Imports.
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from itertools import combinations
+from board import Board, board_class
+from inputHandler import InputHandler
+from ai import AI
+from chunkedBoard import ChunkedBoard
+from config import MAX_UNTOUCHED_CHUNKS
+from frontier import FrontierIndex
+from packedBoard import PackedBoard
+from solver import ProbabilitySolver
+from aiWorker import AIWorker
+from profiler import FrameProfiler, StartupTimer, percentile
+from settings import clean_name, mine_bounds, parse_board_size, startup_settings, validate
+from highScores import HighScoreStore
+from protocol import *
+from server import GameServer, Session
+from noGuess import (LayoutPool, adjacent_counts, find_layout, fixed_layout, good_starts,
+                     layout_positions, neighbour_table, solvable, symmetries, transform)
+from replay import ReplayRecorder, main as replay_main, read_logs, replay_game
+from saveGame import HEADER as SAVE_HEADER, load_game, save_game
+import selfplay
+import benchmark
+
+try:
+    import numpy
+    from arrayBoard import ArrayBoard
+except ImportError:
+    numpy = None
+
+# The renderer tests draw off-screen and the sound tests play to no device, so PyGame never
+# needs a real display or speakers.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+try:
+    import pygame
+    from config import (WIDTH, HEIGHT, CELL_SIZE, GAME_STATE_OBJ_SIZE, TEXT_CACHE_SIZE, MAX_VISIBLE_ROWS,
+                        MAX_VISIBLE_COLS)
+    from renderer import BoardRenderer, column_label, TILE_COUNT, TILE_COVERED, TILE_FLAG, TILE_MINE, tile_atlas, tile_index
+    from textCache import get_font, render_text
+    from sounds import SoundBank
+except ImportError:
+    pygame = None
+
+# Board classes every test runs on (ArrayBoard only when NumPy is installed).
+BOARDS = [Board, PackedBoard] + ([ArrayBoard] if numpy is not None else [])
+
+# Board with mines at exactly the given (row, col) cells, as if the first click had
+# already placed them.
+def board_with_mines(rows, cols, mines, cls=Board):
+    board = cls(rows, cols, len(mines), "n", "no_ai")
+    for r, c in mines:
+        board.grid[r][c].cellState = 3
+    board.covered_safe -= len(mines)
+    board.compute_adjacents()
+    return board
+
+# (revealed, flagged, covered safe) counts from a full scan of the grid.
+def scan_counts(board):
+    revealed = flagged = coveredSafe = 0
+    for row in board.grid:
+        for cell in row:
+            revealed += cell.isClicked
+            flagged += cell.isFlagged
+            coveredSafe += not cell.isClicked and cell.cellState != 3
+    return revealed, flagged, coveredSafe
+
+# Input handler for a board whose mines are already placed.
+def started_handler(board):
+    handler = InputHandler(board)
+    handler.firstClick = False
+    return handler
+
+# Plays the AI's moves through handler until the game ends; returns the number of moves.
+def play_ai(handler, ai):
+    board = handler.board
+    moves = 0
+    while not board.gameOver:
+        action, rc = ai.make_move()
+        if action == "reveal":
+            handler.reveal_cell(*rc)
+        elif action == "reveal_many":
+            handler.reveal_cells(rc)
+        else:
+            break
+        board.victoryCheck()
+        moves += 1
+    return moves
+
+# The game logic on its own: no PyGame, no window.
+class HeadlessTests(unittest.TestCase):
+    # The board, cell, input and AI modules load without importing PyGame.
+    def test_no_pygame_import(self):
+        code = "import sys, board, cell, inputHandler, ai; print('pygame' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+    # The first click places the mines away from itself and opens its neighbours.
+    def test_first_click_is_safe(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                board = Board(10, 10, 15, "n", "no_ai", seed=seed)
+                handler = InputHandler(board)
+                self.assertTrue(handler.reveal_cell(5, 5))
+                self.assertFalse(board.gameOver)
+                self.assertEqual(sum(cell.cellState == 3 for row in board.grid for cell in row), 15)
+                for r in range(4, 7):
+                    for c in range(4, 7):
+                        self.assertTrue(board.grid[r][c].isClicked)
+
+    # Flags toggle on covered cells only, and a flagged cell can't be revealed.
+    def test_flags(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(10, 10, [(0, 0)], cls)
+                handler = started_handler(board)
+                self.assertTrue(handler.toggle_flag(0, 0))
+                self.assertTrue(board.grid[0][0].isFlagged)
+                self.assertFalse(handler.reveal_cell(0, 0))
+                self.assertFalse(board.gameOver)
+                self.assertTrue(handler.reveal_cell(1, 1))
+                self.assertFalse(handler.toggle_flag(1, 1))
+                self.assertFalse(handler.toggle_flag(-1, 0))
+                self.assertTrue(handler.toggle_flag(0, 0))
+                self.assertFalse(board.grid[0][0].isFlagged)
+
+    # Revealing a mine ends the game and shows every mine.
+    def test_mine_ends_game(self):
+        mines = [(0, 0), (9, 9), (5, 2)]
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(10, 10, mines, cls)
+                handler = started_handler(board)
+                handler.reveal_cell(5, 2)
+                self.assertTrue(board.gameOver)
+                self.assertFalse(board.victory)
+                self.assertTrue(all(board.grid[r][c].isClicked for r, c in mines))
+
+    # Whole games run headless and always end one way or the other, and the hard AI,
+    # playing only from what is revealed, wins far more often than random clicks.
+    def test_ai_games(self):
+        wins = {}
+        for difficulty in ("hard", "easy"):
+            wins[difficulty] = 0
+            for seed in range(20):
+                with self.subTest(difficulty=difficulty, seed=seed):
+                    random.seed(seed)
+                    board = Board(10, 10, 15, "y", difficulty, seed=seed)
+                    handler = InputHandler(board)
+                    moves = play_ai(handler, AI(board, difficulty))
+                    self.assertTrue(board.gameOver)
+                    self.assertLessEqual(moves, 100 - 15)
+                    wins[difficulty] += board.victory
+        self.assertGreaterEqual(wins["hard"], 12)
+        self.assertGreater(wins["hard"], wins["easy"])
+
+    # Boards of any size can be played through the input handler.
+    def test_other_board_sizes(self):
+        board = board_with_mines(5, 20, [(0, 0)])
+        handler = started_handler(board)
+        self.assertTrue(handler.reveal_cell(4, 19))
+        self.assertTrue(handler.toggle_flag(0, 0))
+        self.assertFalse(handler.reveal_cell(5, 0))
+        self.assertFalse(handler.toggle_flag(0, 20))
+        board.victoryCheck()
+        self.assertTrue(board.victory)
+
+# Cells a flood fill from (row, col) should reveal, found by a plain breadth-first search.
+def expected_fill(board, row, col):
+    grid = board.grid
+    if grid[row][col].isClicked or grid[row][col].isFlagged:
+        return set()
+    seen = {(row, col)}
+    queue = [(row, col)]
+    for r, c in queue:
+        if grid[r][c].cellState == 3 or grid[r][c].adjMines:
+            continue
+        for nr in range(max(r - 1, 0), min(r + 2, board.rows)):
+            for nc in range(max(c - 1, 0), min(c + 2, board.cols)):
+                cell = grid[nr][nc]
+                if (nr, nc) not in seen and not cell.isClicked and not cell.isFlagged:
+                    seen.add((nr, nc))
+                    queue.append((nr, nc))
+    return seen
+
+# Flood fill on every storage.
+class FloodFillTests(unittest.TestCase):
+    # Opening a corner of an almost empty board clears it and wins.
+    def test_fill_clears_open_board(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(5, 5, [(4, 4)], cls)
+                revealed = board.reveal(0, 0)
+                self.assertEqual(len(revealed), 24)
+                self.assertEqual((board.revealed_count, board.covered_safe), (24, 0))
+                self.assertFalse(board.grid[4][4].isClicked)
+                board.victoryCheck()
+                self.assertTrue(board.victory)
+
+    # The fill stops at numbers and never opens flagged cells.
+    def test_fill_stops_at_numbers_and_flags(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                # A column of mines splits the board; the right side stays covered
+                board = board_with_mines(4, 6, [(r, 3) for r in range(4)], cls)
+                board.toggle_flag(0, 0)
+                board.reveal(3, 0)
+                opened = {(r, c) for r in range(4) for c in range(6) if board.grid[r][c].isClicked}
+                self.assertEqual(opened, {(r, c) for r in range(4) for c in range(3)} - {(0, 0)})
+                self.assertEqual(board.grid[1][2].adjMines, 3)
+                self.assertEqual(scan_counts(board), (board.revealed_count, 1, board.covered_safe))
+
+    # Clicking a number reveals only that cell; clicking it again changes nothing.
+    def test_number_reveals_itself(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(3, 3, [(0, 0)], cls)
+                self.assertEqual(len(board.reveal(1, 1)), 1)
+                self.assertEqual(len(board.reveal(1, 1)), 0)
+
+    # A fill over a large open board doesn't recurse.
+    def test_large_fill(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(300, 300, [(299, 299)], cls)
+                self.assertEqual(len(board.reveal(0, 0)), 300 * 300 - 1)
+
+    # Fills from random clicks on random boards, some cells flagged or already open,
+    # reveal exactly the cells a breadth-first search finds.
+    def test_fill_matches_search(self):
+        rng = random.Random(4)
+        for cls in BOARDS:
+            for game in range(30):
+                with self.subTest(board=cls.__name__, game=game):
+                    rows, cols = rng.randint(1, 20), rng.randint(1, 20)
+                    cells = [(r, c) for r in range(rows) for c in range(cols)]
+                    board = board_with_mines(rows, cols, rng.sample(cells, len(cells) // 8), cls)
+                    for r, c in rng.sample(cells, len(cells) // 10):
+                        board.toggle_flag(r, c)
+                    for _ in range(3):
+                        r, c = rng.choice(cells)
+                        expected = expected_fill(board, r, c)
+                        revealed = board.reveal(r, c)
+                        self.assertEqual({(cell.row, cell.col) for cell in revealed}, expected)
+                        self.assertEqual(len(revealed), len(expected))
+                    self.assertEqual(scan_counts(board), (board.revealed_count, board.flags_placed,
+                                                          board.covered_safe))
+
+    # Regions spanning far more than the first window a fill looks at, with flags and
+    # earlier openings in the way, reveal exactly what a breadth-first search finds.
+    def test_big_regions_match_search(self):
+        rng = random.Random(6)
+        cells = [(r, c) for r in range(200) for c in range(200)]
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(200, 200, rng.sample(cells, 600), cls)
+                for r, c in rng.sample(cells, 200):
+                    board.toggle_flag(r, c)
+                for _ in range(8):
+                    r, c = rng.choice(cells)
+                    expected = expected_fill(board, r, c)
+                    self.assertEqual({(cell.row, cell.col) for cell in board.reveal(r, c)}, expected)
+                self.assertEqual(scan_counts(board), (board.revealed_count, board.flags_placed,
+                                                      board.covered_safe))
+
+    # The counters and flags-left count match a full scan through random play, a lost game
+    # included.
+    def test_counters_match_scan(self):
+        rng = random.Random(7)
+        for cls in BOARDS:
+            for game in range(5):
+                with self.subTest(board=cls.__name__, game=game):
+                    mines = rng.sample([(r, c) for r in range(10) for c in range(10)], 15)
+                    board = board_with_mines(10, 10, mines, cls)
+                    handler = started_handler(board)
+                    while not board.gameOver:
+                        r, c = rng.randrange(10), rng.randrange(10)
+                        if rng.random() < 0.3:
+                            handler.toggle_flag(r, c)
+                        else:
+                            handler.reveal_cell(r, c)
+                        board.victoryCheck()
+                        self.assertEqual(scan_counts(board), (board.revealed_count, board.flags_placed,
+                                                              board.covered_safe))
+                        self.assertEqual(board.flag_count(), max(15 - board.flags_placed, 0))
+                    self.assertEqual(board.victory, board.covered_safe == 0)
+
+# Batch reveals and chording.
+class BatchRevealTests(unittest.TestCase):
+    # A batch reveals what the same reveals one at a time would, with one notification.
+    def test_batch_matches_single_reveals(self):
+        rng = random.Random(8)
+        for cls in BOARDS:
+            for game in range(10):
+                with self.subTest(storage=cls.storage, game=game):
+                    mines = rng.sample([(r, c) for r in range(12) for c in range(12)], 15)
+                    positions = [(rng.randrange(12), rng.randrange(12)) for _ in range(6)]
+                    positions = [rc for rc in positions if rc not in mines]
+                    one, batch = board_with_mines(12, 12, mines, cls), board_with_mines(12, 12, mines, cls)
+                    for rc in positions:
+                        one.reveal(*rc)
+                    calls = []
+                    batch.listeners.append(calls.append)
+                    revealed = batch.reveal_many(positions)
+                    self.assertEqual(len(calls), 1 if revealed else 0)
+                    self.assertEqual(batch.cell_bytes(), one.cell_bytes())
+                    self.assertEqual(scan_counts(batch), (batch.revealed_count, batch.flags_placed,
+                                                          batch.covered_safe))
+                    self.assertEqual(batch.revealed_count, one.revealed_count)
+
+    # The first cell of the first batch is the safe first click; mines in a batch end the
+    # game; the replay log gets one event per cell.
+    def test_reveal_cells(self):
+        board = Board(10, 10, 10, "n", "no_ai", seed=4)
+        handler = InputHandler(board)
+        recorder = ReplayRecorder(board, handler)
+        self.assertTrue(handler.reveal_cells([(5, 5), (5, 5), (-1, 3), (4, 6)]))
+        self.assertEqual(board.grid[5][5].adjMines, 0)
+        self.assertFalse(board.gameOver)
+        self.assertEqual(list(zip(recorder.events[2::4], recorder.events[3::4])), [(5, 5), (4, 6)])
+        self.assertFalse(handler.reveal_cells([(5, 5)]))
+        mine = next(rc for rc in mine_cells(board))
+        safe = next((r, c) for r in range(10) for c in range(10)
+                    if not board.grid[r][c].isClicked and board.grid[r][c].cellState != 3)
+        self.assertTrue(handler.reveal_cells([safe, mine]))
+        self.assertTrue(board.gameOver)
+
+    # Chording a number with all its mines flagged reveals its other covered neighbours.
+    def test_chord_satisfied(self):
+        board = board_with_mines(5, 5, [(0, 0), (2, 3), (3, 1)])
+        handler = started_handler(board)
+        handler.reveal_cell(2, 2)
+        handler.toggle_flag(2, 3)
+        handler.toggle_flag(3, 1)
+        self.assertEqual(board.grid[2][2].adjMines, 2)
+        self.assertTrue(handler.chord(2, 2))
+        # Exactly the covered, unflagged neighbours are clicked; the flags stay
+        self.assertEqual(handler.last_revealed, [(1, 1), (1, 2), (1, 3), (2, 1), (3, 2), (3, 3)])
+        self.assertEqual(board.revealed_count, 7)
+        self.assertTrue(board.grid[2][3].isFlagged and board.grid[3][1].isFlagged)
+        self.assertFalse(board.grid[0][0].isClicked)
+        self.assertFalse(board.gameOver)
+        self.assertEqual(scan_counts(board), (board.revealed_count, board.flags_placed, board.covered_safe))
+
+    # Too few flags, a covered cell or a blank cell: chording does nothing.
+    def test_chord_unsatisfied(self):
+        board = board_with_mines(3, 3, [(0, 0), (0, 1)])
+        handler = started_handler(board)
+        handler.reveal_cell(1, 1)
+        handler.toggle_flag(0, 0)
+        before = board.cell_bytes()
+        self.assertFalse(handler.chord(1, 1))
+        self.assertFalse(handler.chord(2, 2))
+        self.assertEqual(board.cell_bytes(), before)
+        self.assertFalse(board.gameOver)
+        board = board_with_mines(3, 3, [(0, 0)])
+        handler = started_handler(board)
+        handler.reveal_cell(2, 2)
+        before = board.cell_bytes()
+        self.assertFalse(handler.chord(2, 2))
+        self.assertEqual(board.cell_bytes(), before)
+
+    # A flag on the wrong cell makes the chord uncover the real mine and lose; the mine is
+    # among the cells the chord clicked, so the game knows it hit one.
+    def test_chord_wrong_flag(self):
+        board = board_with_mines(3, 3, [(0, 0)])
+        handler = started_handler(board)
+        handler.reveal_cell(1, 1)
+        handler.toggle_flag(0, 1)
+        self.assertTrue(handler.chord(1, 1))
+        self.assertTrue(board.gameOver)
+        self.assertFalse(board.victory)
+        self.assertTrue(board.grid[0][0].isClicked)
+        self.assertIn((0, 0), handler.last_revealed)
+        self.assertTrue(board.grid[0][1].isFlagged)
+
+# (row, col) of every mine on board.
+def mine_cells(board):
+    return {(cell.row, cell.col) for row in board.grid for cell in row if cell.cellState == 3}
+
+# Mine placement around the first click.
+class MinePlacementTests(unittest.TestCase):
+    # mine_count distinct positions, none on the first click or its neighbours, at any
+    # density and wherever the click is.
+    def test_mines_avoid_safe_zone(self):
+        for cls in BOARDS:
+            for safe_rc in [(0, 0), (0, 7), (4, 4), (8, 8)]:
+                for mines in (1, 30, 72):
+                    with self.subTest(board=cls.__name__, safe_rc=safe_rc, mines=mines):
+                        board = cls(9, 9, mines, "n", "no_ai", seed=11)
+                        positions = [int(p) for p in board.mine_positions(safe_rc)]
+                        self.assertEqual(len(set(positions)), mines)
+                        zone, allowed = board.safe_zone(safe_rc)
+                        self.assertFalse(set(zone) & set(positions))
+                        self.assertTrue(all(0 <= p < 81 for p in positions))
+
+    # The seed decides the layout; the board's counters start from it.
+    def test_layout_follows_seed(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                a, b, c = (cls(16, 30, 99, "n", "no_ai", seed=s) for s in (5, 5, 6))
+                for board in (a, b, c):
+                    board.insertMines((8, 15))
+                self.assertEqual(mine_cells(a), mine_cells(b))
+                self.assertNotEqual(mine_cells(a), mine_cells(c))
+                self.assertEqual(len(mine_cells(a)), 99)
+                self.assertEqual(a.covered_safe, 16 * 30 - 99)
+                self.assertIsNotNone(Board(4, 4, 2, "n", "no_ai").seed)
+
+    # A nearly full board places in bounded time.
+    def test_dense_board(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = cls(200, 200, 200 * 200 - 9, "n", "no_ai", seed=1)
+                board.insertMines((100, 100))
+                self.assertEqual(board.covered_safe, 9)
+                self.assertEqual(len(mine_cells(board)), 200 * 200 - 9)
+
+    # More mines than cells outside the safe zone is an error, not an endless loop.
+    def test_too_many_mines(self):
+        board = Board(3, 3, 1, "n", "no_ai")
+        with self.assertRaises(ValueError):
+            board.mine_positions((1, 1))
+
+# The endless board, generated chunk by chunk.
+class ChunkedBoardTests(unittest.TestCase):
+    # The seed alone decides the world, at the configured density.
+    def test_world_follows_seed(self):
+        worlds = []
+        for seed in (4, 4, 5):
+            board = ChunkedBoard("n", "no_ai", seed=seed)
+            board.insertMines((0, 0))
+            worlds.append([board.is_mine(r, c) for r in range(100) for c in range(100)])
+        self.assertEqual(worlds[0], worlds[1])
+        self.assertNotEqual(worlds[0], worlds[2])
+        self.assertAlmostEqual(sum(worlds[0]) / 10000, 0.15, delta=0.02)
+        with self.assertRaises(ValueError):
+            ChunkedBoard("n", "no_ai", density=0.05)
+
+    # Over a window of the world, across 25 seeds and with chunks evicted and regenerated,
+    # the endless board reads and plays like a list Board built from the same mines.
+    def test_matches_list_board(self):
+        size = 100
+        for seed in range(25):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                board = ChunkedBoard("n", "no_ai", seed=seed, chunk_size=8)
+                handler = InputHandler(board)
+                handler.reveal_cell(50, 50)
+                mines = [(r, c) for r in range(size) for c in range(size) if board.is_mine(r, c)]
+                # Reading 169 chunks' mines leaves at most MAX_UNTOUCHED_CHUNKS untouched ones loaded
+                self.assertLessEqual(len(board.chunks) - board.touched_chunks, MAX_UNTOUCHED_CHUNKS)
+                expected = board_with_mines(size, size, mines)
+                self.assertFalse({(r, c) for r in range(49, 52) for c in range(49, 52)} & set(mines))
+                expected.reveal(50, 50)
+                for _ in range(300):
+                    r, c = rng.randrange(size - 1), rng.randrange(size - 1)
+                    self.assertEqual(board.grid[r][c].adjMines, expected.grid[r][c].adjMines)
+                # Reveals and flags in the middle of the window open the same cells, as long as
+                # the fill stays clear of the window's open right and bottom edges
+                for _ in range(20):
+                    r, c = rng.randrange(30, 70), rng.randrange(30, 70)
+                    if rng.random() < 0.3:
+                        self.assertEqual(handler.toggle_flag(r, c), expected.toggle_flag(r, c))
+                        continue
+                    if (r, c) in mines:
+                        continue
+                    fill = expected_fill(expected, r, c)
+                    if any(fr == size - 1 or fc == size - 1 for fr, fc in fill):
+                        break
+                    self.assertEqual({(cell.row, cell.col) for cell in board.reveal(r, c)},
+                                     {(cell.row, cell.col) for cell in expected.reveal(r, c)})
+                self.assertEqual((board.revealed_count, board.flags_placed),
+                                 (expected.revealed_count, expected.flags_placed))
+                # Evicted chunks come back with the same mines
+                for r in range(500, 600, 7):
+                    board.is_mine(r, r)
+                self.assertEqual([(r, c) for r in range(size) for c in range(size) if board.is_mine(r, c)], mines)
+
+    # The endless board has no cell array to encode or restore, so saves and replay logs
+    # refuse it up front.
+    def test_no_cell_array(self):
+        board = ChunkedBoard("n", "no_ai", seed=2)
+        handler = InputHandler(board)
+        handler.reveal_cell(0, 0)
+        for call in (board.cell_bytes, lambda: board.load_cell_bytes(b"\x01"),
+                     lambda: board.cell_codes([0]), lambda: board.load_cell_codes([0], b"\x01")):
+            with self.assertRaises(TypeError):
+                call()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "game")
+            with self.assertRaises(ValueError):
+                save_game(path, board, handler)
+            self.assertFalse(os.path.exists(path))
+            with self.assertRaises(ValueError):
+                ReplayRecorder(board, handler)
+            self.assertIsNone(handler.recorder)
+            record = ReplayRecorder(Board(9, 9, 10, "n", "no_ai", seed=2)).to_record()
+            record["storage"] = "chunked"
+            with self.assertRaises(ValueError):
+                replay_game(("log:1", record))
+            with open(path, "w") as f:
+                f.write(json.dumps(record) + "\n")
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(list(read_logs([path])), [])
+            self.assertIn("can't be replayed", out.getvalue())
+
+    # Looking at cells never loads or evicts a chunk; only reveals and flags do.
+    def test_reads_load_nothing(self):
+        board = ChunkedBoard("n", "no_ai", seed=3, chunk_size=8)
+        handler = InputHandler(board)
+        handler.reveal_cell(0, 0)
+        loaded = list(board.chunks)
+        cells = [(r, c) for r in range(200, 240) for c in range(300, 340)]
+        seen = [(board.grid[r][c].isClicked, board.grid[r][c].isFlagged, board.grid[r][c].adjMines,
+                 board.is_mine(r, c)) for r, c in cells]
+        self.assertEqual(list(board.chunks), loaded)
+        self.assertFalse(any(clicked or flagged for clicked, flagged, _, _ in seen))
+        # The same cells read from loaded chunks give the same mines and counts
+        handler.toggle_flag(220, 320)
+        self.assertIn((220 // 8, 320 // 8), board.chunks)
+        handler.toggle_flag(220, 320)
+        self.assertEqual([(board.grid[r][c].adjMines, board.is_mine(r, c)) for r, c in cells],
+                         [(adj, mine) for _, _, adj, mine in seen])
+
+# The frontier index kept up to date from board changes.
+class FrontierTests(unittest.TestCase):
+    # Counts, satisfied cells and the zero flag of an index.
+    def state(self, index):
+        return dict(index.covered), dict(index.flagged), set(index.satisfied), index.zero_revealed
+
+    # After every move the incrementally updated index equals one built from scratch.
+    def test_incremental_matches_rebuild(self):
+        rng = random.Random(9)
+        for cls in BOARDS:
+            for game in range(5):
+                with self.subTest(board=cls.__name__, game=game):
+                    mines = rng.sample([(r, c) for r in range(10) for c in range(10)], 15)
+                    board = board_with_mines(10, 10, mines, cls)
+                    index = FrontierIndex(board)
+                    handler = started_handler(board)
+                    while not board.gameOver:
+                        r, c = rng.randrange(10), rng.randrange(10)
+                        if rng.random() < 0.3:
+                            handler.toggle_flag(r, c)
+                        else:
+                            handler.reveal_cell(r, c)
+                        board.victoryCheck()
+                        fresh = FrontierIndex(board)
+                        self.assertEqual(self.state(index), self.state(fresh))
+                        for pos in index.cells():
+                            self.assertTrue(board.grid[pos[0]][pos[1]].isClicked)
+                            self.assertGreater(index.covered[pos], 0)
+
+    # Before the first reveal or flag the index starts empty without scanning the grid; made
+    # mid-game it picks up the cells already revealed and flagged.
+    def test_starts_without_scan(self):
+        class NoScan(list):
+            def __iter__(self):
+                raise AssertionError("grid scanned")
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(50, 50, [(0, 0), (10, 10), (20, 30)], cls)
+                grid = board.grid
+                board.grid = NoScan(grid)
+                index = FrontierIndex(board)
+                self.assertEqual(self.state(index), ({}, {}, set(), False))
+                board.grid = grid
+                handler = started_handler(board)
+                handler.reveal_cell(49, 49)
+                handler.toggle_flag(0, 0)
+                self.assertEqual(self.state(FrontierIndex(board)), self.state(index))
+
+    # The medium AI's fallback guess is a random covered, unflagged cell, found by probing
+    # rather than by listing every covered cell, except on a nearly cleared board.
+    def test_medium_guess(self):
+        board = Board(200, 200, 10, "y", "medium", seed=1)
+        handler = InputHandler(board)
+        handler.toggle_flag(0, 0)
+        ai = AI(board, "medium")
+        with mock.patch.object(AI, "_covered_cells", side_effect=AssertionError("scanned")):
+            for _ in range(20):
+                action, (r, c) = ai.make_move()
+                self.assertEqual(action, "reveal")
+                self.assertNotEqual((r, c), (0, 0))
+        board = board_with_mines(2, 3, [(0, 0), (0, 2)])
+        handler = started_handler(board)
+        handler.toggle_flag(0, 0)
+        handler.toggle_flag(0, 2)
+        for r, c in [(0, 1), (1, 0), (1, 1)]:
+            handler.reveal_cell(r, c)
+        self.assertEqual(AI(board, "medium").make_move(), ("reveal", (1, 2)))
+        handler.reveal_cell(1, 2)
+        self.assertEqual(AI(board, "medium").make_move(), ("none", None))
+
+    # With only correct flags, the cell the medium AI is offered as safe never holds a mine.
+    def test_safe_cell_is_safe(self):
+        rng = random.Random(10)
+        for game in range(20):
+            with self.subTest(game=game):
+                mines = rng.sample([(r, c) for r in range(10) for c in range(10)], 12)
+                board = board_with_mines(10, 10, mines)
+                handler = started_handler(board)
+                ai = AI(board, "medium")
+                safe = [(r, c) for r in range(10) for c in range(10) if (r, c) not in mines]
+                handler.reveal_cell(*rng.choice(safe))
+                for rc in mines:
+                    if rng.random() < 0.5:
+                        handler.toggle_flag(*rc)
+                while True:
+                    cells = ai.frontier.safe_cells()
+                    if not cells:
+                        break
+                    self.assertEqual(cells, sorted(set(cells)))
+                    self.assertFalse(set(cells) & set(mines))
+                    handler.reveal_cells(cells)
+                self.assertFalse(board.gameOver)
+
+# Exact mine probability of every covered, unflagged cell, by trying every placement of
+# the unflagged mines that fits the revealed numbers (flags count as mines).
+def brute_force_probabilities(board):
+    grid, rows, cols = board.grid, board.rows, board.cols
+    covered = [(r, c) for r in range(rows) for c in range(cols)
+               if not grid[r][c].isClicked and not grid[r][c].isFlagged]
+    numbers = [(r, c) for r in range(rows) for c in range(cols)
+               if grid[r][c].isClicked and grid[r][c].cellState != 3]
+    counts = dict.fromkeys(covered, 0)
+    total = 0
+    for combo in combinations(covered, board.mine_count - board.flags_placed):
+        placed = set(combo)
+        if all(grid[r][c].adjMines == sum((nr, nc) in placed or grid[nr][nc].isFlagged
+                                          for nr in range(max(r - 1, 0), min(r + 2, rows))
+                                          for nc in range(max(c - 1, 0), min(c + 2, cols)))
+               for r, c in numbers):
+            total += 1
+            for pos in combo:
+                counts[pos] += 1
+    return {pos: n / total for pos, n in counts.items()}
+
+# The hard AI's probability solver on small positions worked out by hand or by brute force.
+class SolverTests(unittest.TestCase):
+    # Solver probability of every covered, unflagged cell.
+    def solve(self, board):
+        solver = ProbabilitySolver(board, FrontierIndex(board))
+        probs, offProb = solver.probabilities()
+        grid = board.grid
+        return {(r, c): probs.get((r, c), offProb)
+                for r in range(board.rows) for c in range(board.cols)
+                if not grid[r][c].isClicked and not grid[r][c].isFlagged}
+
+    # Two covered cells behind the same two 1s, one mine left: a coin flip.
+    def test_fifty_fifty(self):
+        board = board_with_mines(2, 3, [(0, 2)])
+        board.reveal(1, 0)
+        self.assertEqual(self.solve(board), {(0, 2): 0.5, (1, 2): 0.5})
+
+    # A 1 whose cells lie inside a 2's: the 2's extra cell is a mine, and the 1's other
+    # cells are safe once the 2 is accounted for (the subset rule).
+    def test_subset_rule(self):
+        # Row 0 revealed as 1 2 2 1 over four covered cells, mines under the two 2s
+        board = board_with_mines(3, 4, [(1, 1), (1, 2)])
+        for c in range(4):
+            board.reveal(0, c)
+        probs = self.solve(board)
+        self.assertEqual(probs[(1, 1)], 1.0)
+        self.assertEqual(probs[(1, 2)], 1.0)
+        self.assertEqual(probs[(1, 0)], 0.0)
+        self.assertEqual(probs[(1, 3)], 0.0)
+        solver = ProbabilitySolver(board, FrontierIndex(board))
+        self.assertIn(solver.best_cell(), [(1, 0), (1, 3)])
+        # Both safe cells come back as one batch, and the hard AI reveals them together
+        self.assertEqual(solver.best_cells(), [(1, 0), (1, 3)])
+        self.assertEqual(AI(board, "hard").make_move(), ("reveal_many", [(1, 0), (1, 3)]))
+        # With nothing proven safe, the batch is the single best guess
+        board = board_with_mines(2, 3, [(0, 2)])
+        board.reveal(1, 0)
+        self.assertEqual(len(ProbabilitySolver(board, FrontierIndex(board)).best_cells()), 1)
+
+    # Guesses off the frontier repeat with the board's seed and leave the global random
+    # module alone.
+    def test_guesses_follow_seed(self):
+        picks = []
+        state = random.getstate()
+        for seed in (3, 3, 4):
+            board = Board(30, 30, 100, "y", "hard", seed=seed)
+            solver = ProbabilitySolver(board, FrontierIndex(board))
+            picks.append([solver.random_other_cell(set()) for _ in range(10)])
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual(picks[0], picks[1])
+        self.assertNotEqual(picks[0], picks[2])
+
+    # The global mine count weighs frontier cells against the cells no number touches.
+    def test_matches_brute_force(self):
+        rng = random.Random(5)
+        for game in range(40):
+            with self.subTest(game=game):
+                rows, cols = rng.randint(3, 5), rng.randint(3, 5)
+                cells = [(r, c) for r in range(rows) for c in range(cols)]
+                mines = rng.sample(cells, rng.randint(2, 5))
+                board = board_with_mines(rows, cols, mines)
+                for rc in rng.sample([rc for rc in cells if rc not in mines], 3):
+                    board.reveal(*rc)
+                # Sometimes a correct flag too
+                if rng.random() < 0.5:
+                    board.toggle_flag(*mines[0])
+                expected = brute_force_probabilities(board)
+                probs = self.solve(board)
+                self.assertEqual(probs.keys(), expected.keys())
+                for pos, p in expected.items():
+                    self.assertAlmostEqual(probs[pos], p, places=9, msg=str(pos))
+
+# AI moves worked out on the background worker thread.
+class AIWorkerTests(unittest.TestCase):
+    def setUp(self):
+        self.worker = AIWorker()
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    # Waits for the worker's move.
+    def wait(self):
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            move = self.worker.result()
+            if move is not None:
+                return move
+            time.sleep(0.001)
+        self.fail("no AI move")
+
+    # The worker hands back the move the AI would make on the game loop, once.
+    def test_result(self):
+        board = board_with_mines(3, 4, [(1, 1), (1, 2)])
+        for c in range(4):
+            board.reveal(0, c)
+        ai = AI(board, "hard")
+        expected = ai.make_move()
+        self.worker.request(ai)
+        self.assertTrue(self.worker.busy)
+        self.assertEqual(self.wait(), expected)
+        self.assertFalse(self.worker.busy)
+        self.assertIsNone(self.worker.result())
+
+    # A cancelled move is dropped, and a search asked to stop gives up with no move.
+    def test_cancel(self):
+        board = Board(30, 30, 150, "y", "hard", seed=2)
+        InputHandler(board).reveal_cell(15, 15)
+        # (the medium AI's random probes take no time, so only its rare full scan is cancelled)
+        for difficulty in ("easy", "hard"):
+            with self.subTest(difficulty=difficulty):
+                self.assertEqual(AI(board, difficulty).make_move(lambda: True), ("none", None))
+        self.worker.request(AI(board, "hard"))
+        self.worker.cancel()
+        self.assertFalse(self.worker.busy)
+        self.assertIsNone(self.worker.result())
+        # A new request after a cancel still gets its move
+        self.worker.request(AI(board, "easy"))
+        action, rc = self.wait()
+        self.assertEqual(action, "reveal")
+        self.assertFalse(board.grid[rc[0]][rc[1]].isClicked)
+
+    # has_move is False exactly when make_move can only answer ("none", None).
+    def test_has_move(self):
+        board = board_with_mines(2, 2, [(0, 0)])
+        handler = started_handler(board)
+        ai = AI(board, "easy")
+        handler.reveal_cell(1, 1)
+        self.assertTrue(ai.has_move())
+        handler.toggle_flag(0, 0)
+        handler.toggle_flag(0, 1)
+        handler.toggle_flag(1, 0)
+        self.assertFalse(ai.has_move())
+        self.assertEqual(ai.make_move(), ("none", None))
+        handler.toggle_flag(0, 1)
+        self.assertTrue(ai.has_move())
+        self.assertEqual(ai.make_move(), ("reveal", (0, 1)))
+        board.gameOver = True
+        self.assertFalse(ai.has_move())
+
+# Board storages agree with the list of Cell objects.
+class StorageTests(unittest.TestCase):
+    # ArrayBoard's vectorized adjacent counts match the cell-by-cell count, edges included.
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_array_adjacent_counts(self):
+        rng = random.Random(2)
+        for game in range(20):
+            with self.subTest(game=game):
+                rows, cols = rng.randint(1, 15), rng.randint(1, 15)
+                cells = [(r, c) for r in range(rows) for c in range(cols)]
+                mines = rng.sample(cells, rng.randint(0, len(cells)))
+                expected = board_with_mines(rows, cols, mines)
+                board = board_with_mines(rows, cols, mines, ArrayBoard)
+                for r, c in cells:
+                    self.assertEqual(board.grid[r][c].adjMines, expected.grid[r][c].adjMines)
+                    self.assertEqual(board.grid[r][c].cellState, expected.grid[r][c].cellState)
+
+    # Every storage is found by its name and encodes cells the same way.
+    def test_cell_bytes(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                self.assertIs(board_class(cls.storage), cls)
+                board = board_with_mines(2, 3, [(0, 2)], cls)
+                board.reveal(1, 0)
+                board.toggle_flag(1, 2)
+                # Revealed, flagged and mine bits, then the adjacent count from bit 3 up
+                self.assertEqual(board.cell_bytes(), bytes([1, 1 | 8, 4, 1, 1 | 8, 2 | 8]))
+        self.assertIs(board_class("chunked"), ChunkedBoard)
+
+    # A list-board cell carries no per-instance dict, and a packed board holds one byte per cell.
+    def test_compact_cells(self):
+        cell = Board(4, 4, 1, "n", "no_ai").grid[0][0]
+        self.assertFalse(hasattr(cell, "__dict__"))
+        self.assertEqual((cell.rowSize, cell.colSize), (0, 0))
+        board = board_with_mines(30, 40, [(3, 4), (29, 39)], PackedBoard)
+        self.assertEqual(len(board.cells), 30 * 40)
+        self.assertEqual((board.grid[3][4].cellState, board.grid[2][4].adjMines, board.grid[28][38].adjMines), (3, 1, 1))
+
+    # The same layout and moves leave every storage with the same revealed and flagged cells.
+    def test_storages_agree(self):
+        rng = random.Random(3)
+        for game in range(5):
+            mines = rng.sample([(r, c) for r in range(10) for c in range(10)], 12)
+            boards = [board_with_mines(10, 10, mines, cls) for cls in BOARDS]
+            handlers = [started_handler(board) for board in boards]
+            for _ in range(30):
+                r, c = rng.randrange(10), rng.randrange(10)
+                flag = rng.random() < 0.2
+                for handler in handlers:
+                    if flag:
+                        handler.toggle_flag(r, c)
+                    else:
+                        handler.reveal_cell(r, c)
+            expected = boards[0].cell_bytes()
+            for board in boards[1:]:
+                with self.subTest(game=game, board=type(board).__name__):
+                    self.assertEqual(board.cell_bytes(), expected)
+                    self.assertEqual((board.revealed_count, board.flags_placed, board.covered_safe, board.gameOver),
+                                     (boards[0].revealed_count, boards[0].flags_placed,
+                                      boards[0].covered_safe, boards[0].gameOver))
+
+# No-guess layouts: the solvability check, symmetries and the hard AI on solvable boards.
+class NoGuessTests(unittest.TestCase):
+    # solvable() for a layout given as a list of (row, col) mines, opened at start.
+    def solvable_from(self, rows, cols, mines, start):
+        nbrs = neighbour_table(rows, cols)
+        mine = bytearray(rows * cols)
+        for r, c in mines:
+            mine[r * cols + c] = 1
+        return solvable(mine, adjacent_counts(mine, nbrs), nbrs, start[0] * cols + start[1])
+
+    # Known layouts: solved by the opening, by a number, by the mine count, or not at all.
+    def test_known_layouts(self):
+        # Opening the far corner reveals every safe cell
+        self.assertTrue(self.solvable_from(3, 3, [(0, 0)], (2, 2)))
+        # The opening leaves 2s beside two covered cells: both must be mines
+        self.assertTrue(self.solvable_from(2, 4, [(0, 3), (1, 3)], (0, 0)))
+        # The opening leaves two 1s beside two covered cells and one mine: a guess
+        self.assertFalse(self.solvable_from(2, 4, [(0, 3)], (0, 0)))
+        # Cells walled off by known mines are opened by the mine count...
+        self.assertTrue(self.solvable_from(2, 4, [(0, 2), (1, 2)], (0, 0)))
+        # ...unless a mine is left among them
+        self.assertFalse(self.solvable_from(2, 4, [(0, 2), (1, 2), (0, 3)], (0, 0)))
+
+    # A flipped or transposed layout can be solved from the matching flipped first clicks.
+    def test_symmetries_keep_good_starts(self):
+        for rows, cols in [(9, 9), (8, 12)]:
+            seed, starts = find_layout((rows, cols, rows * cols // 6, 1, 200))
+            for t in symmetries(rows, cols):
+                with self.subTest(size=(rows, cols), symmetry=t):
+                    placed = layout_positions(rows, cols, rows * cols // 6, [seed, t, None])
+                    moved = good_starts(rows, cols, placed)
+                    for p in range(rows * cols):
+                        r, c = transform(t, *divmod(p, cols), rows, cols)
+                        self.assertEqual(moved[r * cols + c], starts[p])
+
+    # The hard AI clears no-guess boards without guessing, including one it used to lose
+    # when subset deductions weren't made before estimating a big component.
+    def test_hard_ai_clears_no_guess_boards(self):
+        for game in (22, 1, 2):
+            with self.subTest(game=game):
+                seed, starts = find_layout((30, 30, 150, game, 200))
+                board = Board(30, 30, 150, "y", "hard", seed=game)
+                board.layout_source = fixed_layout([seed, 0, None])
+                handler = InputHandler(board)
+                ai = AI(board, "hard")
+                handler.reveal_cell(*divmod(starts.index(1), 30))
+                board.victoryCheck()
+                while not board.gameOver:
+                    action, rc = ai.make_move()
+                    if action == "reveal_many":
+                        handler.reveal_cells(rc)
+                    elif action == "reveal":
+                        handler.reveal_cell(*rc)
+                    else:
+                        break
+                    board.victoryCheck()
+                self.assertTrue(board.victory)
+
+    # layout_for never waits: with nothing pooled a first click gets a random layout at
+    # once, and after start_search it gets the layout found for that click.
+    def test_pool_never_blocks(self):
+        pool = LayoutPool(size=1, workers=1)
+        try:
+            board = Board(16, 16, 50, "n", "no_ai", seed=4)
+            start = time.perf_counter()
+            self.assertIsNone(pool.layout_for(board, (0, 0)))
+            self.assertLess(time.perf_counter() - start, 0.5)
+            pool.ready.clear()
+            pool.start_search(board, (8, 8))
+            while pool.searching:
+                time.sleep(0.01)
+            # Another click doesn't get the search's layout
+            self.assertIsNone(pool.layout_for(board, (3, 3)))
+            board.layout_source = pool.layout_for
+            InputHandler(board).reveal_cell(8, 8)
+            self.assertIsNotNone(board.layout_id)
+            self.assertEqual(board.layout_id[2], [8, 8])
+            self.assertTrue(self.solvable_from(16, 16, [(r, c) for r in range(16) for c in range(16)
+                                                        if board.grid[r][c].cellState == 3], (8, 8)))
+        finally:
+            pool.shutdown()
+
+# The server's wire format, sessions and deltas.
+class ProtocolTests(unittest.TestCase):
+    # Framed messages split back out of a byte stream however it arrives.
+    def test_framing(self):
+        stream = (new_game_message(16, 30, 99) + action_message(REVEAL, 3, 4) + pack(STATS)
+                  + action_message(FLAG, 65535, 0))
+        buffer = bytearray()
+        messages = []
+        for k in range(0, len(stream), 3):
+            buffer += stream[k:k + 3]
+            messages += split_messages(buffer)
+        self.assertEqual(buffer, b"")
+        self.assertEqual([t for t, _ in messages], [NEW_GAME, REVEAL, STATS, FLAG])
+        self.assertEqual(GAME_MSG.unpack(messages[0][1]), (16, 30, 99))
+        self.assertEqual(CELL_MSG.unpack(messages[1][1]), (3, 4))
+        self.assertEqual(messages[2][1], b"")
+        self.assertEqual(CELL_MSG.unpack(messages[3][1]), (65535, 0))
+        with self.assertRaises(ProtocolError):
+            split_messages(bytearray(HEADER.pack(0, REVEAL)))
+
+    # Deltas carry the status, flag count, positions and codes; bad lengths are refused.
+    def test_delta_encoding(self):
+        message = delta_message(GAME_OVER | VICTORY, 7, [0, 70000, 4294967295], b"\x01\x0b\x02")
+        (msg_type, payload), = split_messages(bytearray(message))
+        self.assertEqual(msg_type, DELTA)
+        status, flags, positions, codes = read_delta(payload)
+        self.assertEqual((status, flags, list(positions), codes), (3, 7, [0, 70000, 4294967295], b"\x01\x0b\x02"))
+        self.assertEqual(len(payload), DELTA_MSG.size + 5 * 3)
+        with self.assertRaises(ProtocolError):
+            read_delta(payload[:-1])
+
+    # Covered cells show only their flag; revealed cells show everything.
+    def test_visible_codes(self):
+        for code in range(128):
+            if code & 1:
+                self.assertEqual(VISIBLE[code], code)
+            else:
+                self.assertEqual(VISIBLE[code], code & 2)
+
+    # A client board built only from deltas matches what the server's board lets the player
+    # see, and each delta holds just the cells its action changed.
+    def test_deltas_mirror_the_game(self):
+        rng = random.Random(9)
+        for game in range(5):
+            with self.subTest(game=game):
+                session = Session()
+                session.new_game(16, 30, 70)
+                mirror = PackedBoard(16, 30, 70, "n", "no_ai")
+                while not session.board.gameOver:
+                    before = session.board.cell_bytes().translate(VISIBLE)
+                    msg_type = FLAG if rng.random() < 0.2 else REVEAL
+                    session.act(msg_type, rng.randrange(16), rng.randrange(30))
+                    (kind, payload), = split_messages(bytearray(session.delta()))
+                    self.assertEqual(kind, DELTA)
+                    status, flags, positions, codes = read_delta(payload)
+                    after = session.board.cell_bytes().translate(VISIBLE)
+                    self.assertEqual(sorted(positions), [i for i in range(16 * 30) if before[i] != after[i]])
+                    mirror.load_cell_codes(positions, codes)
+                    self.assertEqual(flags, session.board.flags_placed)
+                    self.assertEqual(bool(status & GAME_OVER), session.board.gameOver)
+                    self.assertEqual(bool(status & VICTORY), session.board.victory)
+                self.assertEqual(mirror.cell_bytes(), session.board.cell_bytes().translate(VISIBLE))
+
+    # Sizes and mine counts the server won't host are refused.
+    def test_new_game_limits(self):
+        session = Session()
+        for rows, cols, mines in [(1, 10, 1), (10, 10, 99), (10, 10, 0), (600, 600, 40000)]:
+            with self.subTest(size=(rows, cols, mines)):
+                with self.assertRaises(ValueError):
+                    session.new_game(rows, cols, mines)
+        with self.assertRaises(ValueError):
+            session.act(REVEAL, 0, 0)
+
+    # A client talks to a running server over TCP: games, deltas (also for a board big
+    # enough to be played off the event loop), statistics and errors.
+    def test_server_round_trip(self):
+        async def run():
+            server = GameServer()
+            listener = await asyncio.start_server(server.serve_client, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            async def request(message):
+                writer.write(message)
+                await writer.drain()
+                return await read_message(reader)
+
+            try:
+                replies = [await request(new_game_message(9, 9, 10)),
+                           await request(action_message(REVEAL, 4, 4)),
+                           await request(new_game_message(200, 200, 4000)),
+                           await request(action_message(REVEAL, 100, 100)),
+                           await request(pack(STATS)),
+                           await request(pack(99)),
+                           await request(new_game_message(9, 9, 500))]
+            finally:
+                writer.close()
+                await writer.wait_closed()
+                listener.close()
+                await listener.wait_closed()
+            return replies
+
+        replies = asyncio.run(run())
+        self.assertEqual([t for t, _ in replies], [GAME, DELTA, GAME, DELTA, STATS_REPLY, ERROR, ERROR])
+        self.assertEqual(GAME_MSG.unpack(replies[0][1]), (9, 9, 10))
+        for _, payload in (replies[1], replies[3]):
+            status, flags, positions, codes = read_delta(payload)
+            self.assertGreater(len(positions), 0)
+            self.assertTrue(all(code & 1 for code in codes))
+        sessions, actions, cpu, wall = STATS_MSG.unpack(replies[4][1])
+        self.assertEqual((sessions, actions), (1, 4))
+        self.assertIn(b"unknown message type", replies[5][1])
+
+# The high-score log: leaderboards, compaction and torn lines.
+class HighScoreTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "highscores.txt")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def lines(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    # Scores rank per configuration, only the top N are kept, and a new store reads the
+    # same leaderboards back.
+    def test_leaderboards(self):
+        store = HighScoreStore(self.path, top_n=3)
+        self.assertEqual(store.record("Ann", 30, "easy", 9, 9, 10), 1)
+        self.assertEqual(store.record("Bo", 20, "easy", 9, 9, 10), 1)
+        self.assertEqual(store.record("Cy", 25, "easy", 9, 9, 10), 2)
+        self.assertIsNone(store.record("Di", 40, "easy", 9, 9, 10))
+        self.assertEqual(store.record("Ed", 50, "easy", 9, 9, 11), 1)
+        self.assertEqual(store.top("easy", 9, 9, 10), [(20, "Bo"), (25, "Cy"), (30, "Ann")])
+        self.assertEqual(len(self.lines()), 4)
+        again = HighScoreStore(self.path, top_n=3)
+        self.assertEqual(again.top("easy", 9, 9, 10), store.top("easy", 9, 9, 10))
+        self.assertEqual(again.best("easy", 9, 9, 11), (50, "Ed"))
+        self.assertEqual(again.best("hard", 9, 9, 10), (None, None))
+
+    # A log that grew far past what the leaderboards keep is rewritten with just those.
+    def test_compaction(self):
+        store = HighScoreStore(self.path, top_n=2)
+        for i in range(150):
+            store.record(f"P{i}", 1000 - i, "medium", 16, 16, 40)
+        self.assertLess(len(self.lines()), 100)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        self.assertEqual(HighScoreStore(self.path, top_n=2).top("medium", 16, 16, 40),
+                         [(851, "P149"), (852, "P148")])
+
+    # A cut-off last line is skipped and dropped before the next score is appended.
+    def test_torn_line(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("easy,9,9,10,12.000,Ann\neasy,9,9,10,8.0")
+        store = HighScoreStore(self.path)
+        self.assertEqual(store.top("easy", 9, 9, 10), [(12, "Ann")])
+        store.record("Bo", 15, "easy", 9, 9, 10)
+        self.assertEqual(self.lines(), ["easy,9,9,10,12.000,Ann", "easy,9,9,10,15.000,Bo"])
+
+    # Old one-line-per-difficulty scores (empty ones dropped) are read as 10x10 scores of
+    # unknown mine count and ranked on every 10x10 leaderboard of their difficulty;
+    # compaction rewrites them in the new format.
+    def test_old_format_scores(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("1,42.5,Ann\n2,0,\n3,99.0,Bo\n")
+        store = HighScoreStore(self.path, top_n=2)
+        self.assertEqual(store.best("easy", 10, 10, 10), (42.5, "Ann"))
+        self.assertEqual(store.best("easy", 10, 10, 20), (42.5, "Ann"))
+        self.assertEqual(store.best("hard", 10, 10, 15), (99, "Bo"))
+        self.assertEqual(store.best("easy", 9, 9, 10), (None, None))
+        self.assertEqual(store.best("medium", 10, 10, 10), (None, None))
+        # New scores rank around them
+        self.assertEqual(store.record("Cy", 30, "easy", 10, 10, 12), 1)
+        self.assertEqual(store.record("Di", 50, "easy", 10, 10, 12), None)
+        self.assertEqual(store.record("Ed", 45, "easy", 10, 10, 15), 2)
+        self.assertEqual(store.top("easy", 10, 10, 12), [(30, "Cy"), (42.5, "Ann")])
+        self.assertEqual(store.top("easy", 10, 10, 15), [(42.5, "Ann"), (45, "Ed")])
+        for i in range(150):
+            store.record("Fay", 40 - i / 10, "easy", 10, 10, 10)
+        lines = self.lines()
+        self.assertIn("hard,10,10,?,99.000,Bo", lines)
+        self.assertFalse([line for line in lines if line.startswith(("1,", "3,"))])
+        again = HighScoreStore(self.path, top_n=2)
+        self.assertEqual(again.top("easy", 10, 10, 15), [(42.5, "Ann"), (45, "Ed")])
+        self.assertEqual(again.best("hard", 10, 10, 10), (99, "Bo"))
+
+# Plays up to `moves` random reveals and flag toggles through handler, with the first
+# click at the centre; every fourth move is logged as the AI's.
+def play_random(handler, rng, moves=40):
+    board = handler.board
+    handler.reveal_cell(board.rows // 2, board.cols // 2)
+    for k in range(moves):
+        if board.gameOver:
+            break
+        r, c = rng.randrange(board.rows), rng.randrange(board.cols)
+        actor = "ai" if k % 4 == 3 else "human"
+        if rng.random() < 0.25:
+            handler.toggle_flag(r, c, actor)
+        else:
+            handler.reveal_cell(r, c, actor)
+        board.victoryCheck()
+
+# Replay logs: a logged game replays to the same final board.
+class ReplayTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "replays.jsonl")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    # Records a seeded random game, on a fixed no-guess layout if given, and saves it to the log.
+    def record_game(self, cls, seed, layout=None):
+        board = cls(12, 16, 30, "n", "no_ai", seed=seed)
+        if layout is not None:
+            board.layout_source = fixed_layout(layout)
+        handler = InputHandler(board)
+        recorder = ReplayRecorder(board, handler)
+        play_random(handler, random.Random(seed))
+        recorder.save(self.path)
+        return board, recorder
+
+    # Games on every storage replay to the same final board, in process and through the
+    # command line.
+    def test_round_trip(self):
+        games = []
+        for cls in BOARDS:
+            games.append(self.record_game(cls, 1))
+            games.append(self.record_game(cls, 2, layout=["test:0", 3, None]))
+        records = list(read_logs([self.path]))
+        self.assertEqual(len(records), len(games))
+        for (source, record), (board, recorder) in zip(records, games):
+            with self.subTest(source=source, storage=record["storage"]):
+                self.assertEqual(record["events"], recorder.events)
+                self.assertEqual(record.get("layout"), board.layout_id)
+                result = replay_game((source, record))
+                self.assertTrue(result["ok"])
+                self.assertEqual(result["events"], len(recorder.events) // 4)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            replay_main([self.path, "-j", "2"])
+        self.assertIn(f"{len(games)} games", out.getvalue())
+        self.assertIn("0 mismatched", out.getvalue())
+
+    # A log whose moves don't lead to its recorded result is reported as a mismatch.
+    def test_mismatch_detected(self):
+        self.record_game(Board, 4)
+        (source, record), = read_logs([self.path])
+        record["events"] = record["events"][:-4]
+        self.assertFalse(replay_game((source, record))["ok"])
+
+    # Games are saved once and only if something happened; a cut-off last line is skipped.
+    def test_saving_and_torn_lines(self):
+        board = Board(9, 9, 10, "n", "no_ai")
+        ReplayRecorder(board).save(self.path)
+        self.assertFalse(os.path.exists(self.path))
+        board, recorder = self.record_game(Board, 5)
+        recorder.save(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"v": 1, "rows"')
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(len(list(read_logs([self.path]))), 1)
+        self.assertIn("unreadable line skipped", out.getvalue())
+
+# Binary save and restore of games in progress.
+class SaveGameTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "savegame.bin")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    # Every stored field of a saved board comes back, and play goes on the same way.
+    def test_round_trip(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = cls(14, 20, 45, "y", "hard", seed=8)
+                board.set_player_name("Ann")
+                handler = InputHandler(board)
+                rng = random.Random(8)
+                play_random(handler, rng, moves=10)
+                save_game(self.path, board, handler)
+                loaded, loadedHandler = load_game(self.path)
+                self.assertIs(type(loaded), cls)
+                self.assertEqual((loaded.rows, loaded.cols, loaded.mine_count, loaded.seed), (14, 20, 45, 8))
+                self.assertEqual((loaded.ai_mode, loaded.difficulty, loaded.player_name), ("y", "hard", "Ann"))
+                self.assertFalse(loadedHandler.firstClick)
+                for b in (board, loaded):
+                    self.assertEqual(scan_counts(b), (b.revealed_count, b.flags_placed, b.covered_safe))
+                self.assertEqual(loaded.cell_bytes(), board.cell_bytes())
+                self.assertEqual((loaded.revealed_count, loaded.flags_placed, loaded.covered_safe, loaded.gameOver),
+                                 (board.revealed_count, board.flags_placed, board.covered_safe, board.gameOver))
+                # The same moves lead to the same board
+                state = rng.getstate()
+                play_random(handler, rng, moves=20)
+                rng.setstate(state)
+                play_random(loadedHandler, rng, moves=20)
+                self.assertEqual(loaded.cell_bytes(), board.cell_bytes())
+                self.assertEqual((loaded.gameOver, loaded.victory), (board.gameOver, board.victory))
+
+    # A game saved before its first click places the same mines when it's resumed.
+    def test_before_first_click(self):
+        board = Board(9, 9, 10, "n", "no_ai", seed=3)
+        handler = InputHandler(board)
+        save_game(self.path, board, handler)
+        loaded, loadedHandler = load_game(self.path)
+        self.assertTrue(loadedHandler.firstClick)
+        handler.reveal_cell(4, 4)
+        loadedHandler.reveal_cell(4, 4)
+        self.assertEqual(loaded.cell_bytes(), board.cell_bytes())
+
+    # A finished game stays finished, with its timer stopped at the saved time.
+    def test_finished_game(self):
+        board = board_with_mines(5, 5, [(4, 4)], PackedBoard)
+        board.reveal(0, 0)
+        board.victoryCheck()
+        board.elapsed_time_seconds = 12.5
+        save_game(self.path, board, started_handler(board))
+        loaded, _ = load_game(self.path)
+        self.assertTrue(loaded.gameOver and loaded.victory)
+        self.assertIsNone(loaded.start_time)
+        self.assertEqual(loaded.elapsed_time_seconds, 12.5)
+
+    # Other files and cut-off saves are refused with ValueError, and so is the endless board.
+    def test_bad_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"easy,9,9,10,12.000,Ann\n" * 4)
+        with self.assertRaises(ValueError):
+            load_game(self.path)
+        board = Board(9, 9, 10, "n", "no_ai")
+        save_game(self.path, board, InputHandler(board))
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # Cut off in the cells, in the strings' text, and in a string's length prefix
+        for size in (len(data) - 1, SAVE_HEADER.size + 3, SAVE_HEADER.size + 1):
+            with self.subTest(size=size):
+                with open(self.path, "wb") as f:
+                    f.write(data[:size])
+                with self.assertRaisesRegex(ValueError, "truncated save"):
+                    load_game(self.path)
+        endless = ChunkedBoard("n", "no_ai", seed=1)
+        with self.assertRaises(ValueError):
+            save_game(self.path, endless, InputHandler(endless))
+
+    # An array save on a machine without NumPy is refused like any other bad file.
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_array_save_without_numpy(self):
+        board = ArrayBoard(9, 9, 10, "n", "no_ai", seed=2)
+        save_game(self.path, board, InputHandler(board))
+        with mock.patch("arrayBoard.np", None), self.assertRaisesRegex(ValueError, "NumPy"):
+            load_game(self.path)
+
+# The seeded, parallel AI self-play runner.
+class SelfPlayTests(unittest.TestCase):
+    # A game is decided by its seed alone.
+    def test_games_repeat(self):
+        for difficulty in ("easy", "medium", "hard"):
+            with self.subTest(difficulty=difficulty):
+                job = (difficulty, 9, 9, 10, 3, False)
+                a, b = selfplay.play_game(job), selfplay.play_game(job)
+                self.assertEqual((a["won"], a["moves"], a["batches"]), (b["won"], b["moves"], b["batches"]))
+                self.assertGreater(a["moves"], 0)
+
+    # Moves count every cell the AI clicked, so a batch of safe cells counts once per cell
+    # (the batch itself counts once in batches).
+    def test_moves_count_cells(self):
+        easy = selfplay.play_game(("easy", 9, 9, 10, 3, False))
+        self.assertEqual(easy["moves"], easy["batches"])
+        hard = [selfplay.play_game(("hard", 16, 16, 40, seed, False)) for seed in range(5)]
+        self.assertGreater(sum(g["moves"] for g in hard), sum(g["batches"] for g in hard))
+
+    # Results are grouped per configuration into win rate and move averages.
+    def test_summary(self):
+        results = [{"difficulty": "easy", "rows": 9, "cols": 9, "mines": 10, "won": won, "moves": moves,
+                    "batches": moves, "seconds": 0.5}
+                   for won, moves in [(True, 10), (False, 4), (False, 1)]]
+        results.append({"difficulty": "hard", "rows": 9, "cols": 9, "mines": 10, "won": True, "moves": 7,
+                        "batches": 2, "seconds": 0})
+        easy, hard = selfplay.summarize(results)
+        self.assertEqual((easy["games"], easy["avg_moves"], easy["avg_batches"], easy["moves_per_sec"]), (3, 5, 5, 10))
+        self.assertEqual((hard["avg_moves"], hard["avg_batches"]), (7, 2))
+        self.assertAlmostEqual(easy["win_rate"], 1 / 3)
+        self.assertEqual((hard["games"], hard["win_rate"], hard["moves_per_sec"]), (1, 1, 0))
+
+    # The command line runs every configuration on the pool and writes both reports,
+    # skipping boards too small for their mines.
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as folder:
+            jsonPath, csvPath = os.path.join(folder, "summary.json"), os.path.join(folder, "games.csv")
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                selfplay.main(["-n", "4", "-d", "easy", "hard", "-s", "9x9", "3x3", "-m", "10", "-j", "2",
+                               "--json", jsonPath, "--csv", csvPath])
+            self.assertIn("Skipping 3x3 with 10 mines", out.getvalue())
+            with open(jsonPath, encoding="utf-8") as f:
+                summary = json.load(f)
+            self.assertEqual([(c["difficulty"], c["games"]) for c in summary["configs"]], [("easy", 4), ("hard", 4)])
+            with open(csvPath, encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 8)
+            self.assertEqual(sorted({int(row["seed"]) for row in rows}), [0, 1, 2, 3])
+
+# The engine micro-benchmarks and their baseline comparison.
+class BenchmarkTests(unittest.TestCase):
+    # Runs benchmark.main quietly; returns its output and exit status.
+    def run_main(self, argv):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            try:
+                benchmark.main(argv)
+            except SystemExit as e:
+                return out.getvalue(), e.code
+        return out.getvalue(), 0
+
+    # Every case runs and is saved; a baseline it beats passes, one it trails by more than
+    # the tolerance fails with status 1 and names the regressed cases.
+    def test_baseline_comparison(self):
+        storages = ["list"] + (["array"] if numpy is not None else [])
+        cases = [name for name in benchmark.CASES if name != "draw" or pygame is not None]
+        with tempfile.TemporaryDirectory() as folder:
+            saved = os.path.join(folder, "results.json")
+            out, status = self.run_main(["-s", "8", "-c", *cases, "--storage", *storages, "--save", saved])
+            self.assertEqual(status, 0)
+            with open(saved, encoding="utf-8") as f:
+                results = json.load(f)
+            self.assertEqual(len(results), len(cases) * len(storages))
+            self.assertTrue(all(res["seconds"] > 0 for res in results.values()))
+            baseline = os.path.join(folder, "baseline.json")
+            for factor, expected in ((10, 0), (0.1, 1)):
+                with self.subTest(factor=factor):
+                    with open(baseline, "w", encoding="utf-8") as f:
+                        json.dump({key: {"seconds": res["seconds"] * factor, "peak_bytes": res["peak_bytes"] * factor}
+                                   for key, res in results.items()}, f)
+                    out, status = self.run_main(["-s", "8", "-c", "reveal", "--baseline", baseline])
+                    self.assertEqual(status, expected)
+                    self.assertEqual("REGRESSED" in out, bool(expected))
+
+# Partial redraws: the renderer only repaints what changed, and the result looks the same as
+# a full repaint.
+@unittest.skipIf(pygame is None, "PyGame not installed")
+class RendererTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    # Draws board onto screen and returns the rects the frame changed.
+    def frame(self, renderer, screen):
+        renderer.draw(screen)
+        return renderer.flush()
+
+    # Screen rect of cell (row, col).
+    def cell_rect(self, row, col):
+        return pygame.Rect(col * CELL_SIZE, row * CELL_SIZE + GAME_STATE_OBJ_SIZE, CELL_SIZE, CELL_SIZE)
+
+    # The first frame repaints everything; an unchanged board repaints nothing; a reveal
+    # repaints just the revealed cells, and a flag its cell and the flag counter.
+    def test_only_changes_are_redrawn(self):
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(10, 10, [(0, 0), (9, 9)], cls)
+                renderer = BoardRenderer(board)
+                screen = pygame.Surface((WIDTH, HEIGHT))
+                self.assertIn(screen.get_rect(), self.frame(renderer, screen))
+                self.assertEqual(self.frame(renderer, screen), [])
+                board.reveal(1, 1)
+                self.assertEqual(self.frame(renderer, screen), [self.cell_rect(1, 1)])
+                board.toggle_flag(0, 0)
+                rects = self.frame(renderer, screen)
+                self.assertIn(self.cell_rect(0, 0), rects)
+                self.assertFalse(any(rect.colliderect(self.cell_rect(r, c)) for rect in rects
+                                     for r in range(10) for c in range(10) if (r, c) != (0, 0)))
+
+    # A fill past a quarter of the board falls back to one full repaint.
+    def test_big_change_repaints_all(self):
+        board = board_with_mines(10, 10, [(9, 9)])
+        renderer = BoardRenderer(board)
+        screen = pygame.Surface((WIDTH, HEIGHT))
+        self.frame(renderer, screen)
+        board.reveal(0, 0)
+        self.assertTrue(board.dirty_all)
+        self.assertEqual(board.dirty_cells, [])
+        self.assertIn(screen.get_rect(), self.frame(renderer, screen))
+
+    # After a game's worth of partial frames the screen matches a fresh full repaint.
+    def test_partial_frames_match_full_repaint(self):
+        rng = random.Random(6)
+        for cls in BOARDS:
+            with self.subTest(board=cls.__name__):
+                board = board_with_mines(10, 10, rng.sample([(r, c) for r in range(10) for c in range(10)], 20), cls)
+                handler = started_handler(board)
+                renderer = BoardRenderer(board)
+                screen = pygame.Surface((WIDTH, HEIGHT))
+                self.frame(renderer, screen)
+                for _ in range(25):
+                    r, c = rng.randrange(10), rng.randrange(10)
+                    if rng.random() < 0.3:
+                        handler.toggle_flag(r, c)
+                    elif board.grid[r][c].cellState != 3:
+                        handler.reveal_cell(r, c)
+                    self.frame(renderer, screen)
+                fresh = pygame.Surface((WIDTH, HEIGHT))
+                BoardRenderer(board).draw(fresh)
+                self.assertEqual(pygame.image.tobytes(screen, "RGB"), pygame.image.tobytes(fresh, "RGB"))
+
+# Big boards are drawn and clicked through a scrolling viewport.
+@unittest.skipIf(pygame is None, "PyGame not installed")
+class ViewportTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The wheel handler reads the keyboard modifiers, which needs the (dummy) display
+        pygame.display.init()
+        pygame.font.init()
+
+    # Window position of the centre of the cell shown at viewport position (i, j).
+    def pos(self, i, j):
+        return (j * CELL_SIZE + CELL_SIZE // 2, GAME_STATE_OBJ_SIZE + i * CELL_SIZE + CELL_SIZE // 2)
+
+    # Clicks map to the scrolled cell; the view stays on the board however far it scrolls.
+    def test_cell_at_and_clamping(self):
+        board = board_with_mines(100, 80, [(0, 0)])
+        renderer = BoardRenderer(board)
+        self.assertEqual((renderer.visible_rows, renderer.visible_cols), (MAX_VISIBLE_ROWS, MAX_VISIBLE_COLS))
+        renderer.scroll_to(50, 60)
+        self.assertEqual(renderer.cell_at(self.pos(0, 0)), (50, 60))
+        self.assertEqual(renderer.cell_at(self.pos(2, 3)), (52, 63))
+        self.assertIsNone(renderer.cell_at(self.pos(MAX_VISIBLE_ROWS, 0)))
+        self.assertIsNone(renderer.cell_at(self.pos(0, MAX_VISIBLE_COLS)))
+        self.assertIsNone(renderer.cell_at((5, GAME_STATE_OBJ_SIZE - 5)))
+        renderer.scroll(1000, 1000)
+        self.assertEqual((renderer.view_row, renderer.view_col), (100 - MAX_VISIBLE_ROWS, 80 - MAX_VISIBLE_COLS))
+        renderer.scroll(-1000, -1000)
+        self.assertEqual((renderer.view_row, renderer.view_col), (0, 0))
+        small = BoardRenderer(board_with_mines(6, 8, [(0, 0)]))
+        self.assertEqual((small.visible_rows, small.visible_cols, small.width, small.height), (6, 8, WIDTH, HEIGHT))
+
+    # Keys, Shift+keys (a page), the wheel and a middle-button drag move the view.
+    def test_scroll_input(self):
+        renderer = BoardRenderer(board_with_mines(100, 100, [(0, 0)]))
+        event = pygame.event.Event
+        self.assertTrue(renderer.handle_scroll(event(pygame.KEYDOWN, key=pygame.K_DOWN, mod=0)))
+        self.assertTrue(renderer.handle_scroll(event(pygame.KEYDOWN, key=pygame.K_d, mod=0)))
+        self.assertEqual((renderer.view_row, renderer.view_col), (1, 1))
+        renderer.handle_scroll(event(pygame.KEYDOWN, key=pygame.K_RIGHT, mod=pygame.KMOD_SHIFT))
+        self.assertEqual(renderer.view_col, 1 + MAX_VISIBLE_COLS)
+        self.assertFalse(renderer.handle_scroll(event(pygame.KEYDOWN, key=pygame.K_q, mod=0)))
+        renderer.handle_scroll(event(pygame.MOUSEWHEEL, x=0, y=-3))
+        self.assertEqual(renderer.view_row, 4)
+        renderer.handle_scroll(event(pygame.MOUSEBUTTONDOWN, button=2, pos=(300, 400)))
+        renderer.handle_scroll(event(pygame.MOUSEMOTION, pos=(300 - 2 * CELL_SIZE, 400 + CELL_SIZE)))
+        self.assertEqual((renderer.view_row, renderer.view_col), (3, 3 + MAX_VISIBLE_COLS))
+        renderer.handle_scroll(event(pygame.MOUSEBUTTONUP, button=2, pos=(0, 0)))
+        self.assertFalse(renderer.handle_scroll(event(pygame.MOUSEMOTION, pos=(0, 0))))
+
+    # A click through the input handler reveals the cell under the mouse in the scrolled view.
+    def test_click_in_scrolled_view(self):
+        board = board_with_mines(60, 60, [(59, 59)])
+        renderer = BoardRenderer(board)
+        handler = InputHandler(board, renderer.cell_at)
+        handler.firstClick = False
+        renderer.scroll_to(30, 40)
+        handler.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=3, pos=self.pos(1, 2)))
+        self.assertTrue(board.grid[31][42].isFlagged)
+        handler.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=self.pos(5, 5)))
+        self.assertTrue(board.grid[35][45].isClicked)
+
+    # Changes outside the view leave the grid alone; scrolling redraws the window, and the scrolled
+    # screen after partial frames matches a fresh full repaint of the same view.
+    def test_drawing_scrolled_views(self):
+        rng = random.Random(13)
+        board = board_with_mines(40, 50, rng.sample([(r, c) for r in range(40) for c in range(50)], 300))
+        renderer = BoardRenderer(board)
+        screen = pygame.Surface((renderer.width, renderer.height))
+        renderer.draw(screen)
+        renderer.flush()
+        board.toggle_flag(39, 49)
+        renderer.draw(screen)
+        self.assertFalse(any(rect.colliderect(renderer.gridRect) for rect in renderer.flush()))
+        renderer.scroll(20, 25)
+        renderer.draw(screen)
+        self.assertIn(screen.get_rect(), renderer.flush())
+        for _ in range(40):
+            r, c = rng.randrange(20, 40), rng.randrange(25, 50)
+            if board.grid[r][c].cellState != 3:
+                board.reveal(r, c)
+            renderer.draw(screen)
+        fresh = BoardRenderer(board)
+        fresh.scroll(20, 25)
+        freshScreen = pygame.Surface((renderer.width, renderer.height))
+        fresh.draw(freshScreen)
+        self.assertEqual(pygame.image.tobytes(screen, "RGB"), pygame.image.tobytes(freshScreen, "RGB"))
+
+# The shared font and rendered-text cache.
+@unittest.skipIf(pygame is None, "PyGame not installed")
+class TextCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    # The same font and text come back as the same objects instead of being made again.
+    def test_reuses_fonts_and_text(self):
+        self.assertIs(get_font(None, 24), get_font(None, 24))
+        self.assertIsNot(get_font(None, 24), get_font(None, 36))
+        surf = render_text("Flag count: 3", 36, (0, 0, 0))
+        self.assertIs(render_text("Flag count: 3", 36, (0, 0, 0)), surf)
+        self.assertIsNot(render_text("Flag count: 3", 36, (200, 0, 0)), surf)
+        self.assertEqual(surf.get_size(), get_font(None, 36).size("Flag count: 3"))
+
+    # Strings that keep changing, like the timer, can't grow the cache past its limit.
+    def test_cache_is_bounded(self):
+        for t in range(TEXT_CACHE_SIZE + 100):
+            render_text(f"Time: {t}s", 36, (0, 0, 0))
+        self.assertLessEqual(render_text.cache_info().currsize, TEXT_CACHE_SIZE)
+
+# Column labels run A..Z, then AA, AB, ... like a spreadsheet.
+@unittest.skipIf(pygame is None, "PyGame not installed")
+class ColumnLabelTests(unittest.TestCase):
+    def test_labels(self):
+        self.assertEqual([column_label(c) for c in (0, 25, 26, 27, 51, 701, 702)],
+                         ["A", "Z", "AA", "AB", "AZ", "ZZ", "AAA"])
+
+# Cells are drawn by copying tiles from the pre-rendered atlas.
+@unittest.skipIf(pygame is None, "PyGame not installed")
+class TileAtlasTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    # Pixels of a surface area.
+    def pixels(self, surface, rect):
+        return pygame.image.tobytes(surface.subsurface(rect), "RGB")
+
+    # Every cell look has its own tile, and the atlas is built once per cell size.
+    def test_atlas(self):
+        atlas = tile_atlas(CELL_SIZE)
+        self.assertIs(tile_atlas(CELL_SIZE), atlas)
+        self.assertEqual(atlas.get_size(), (CELL_SIZE * TILE_COUNT, CELL_SIZE))
+        tiles = {self.pixels(atlas, (i * CELL_SIZE, 0, CELL_SIZE, CELL_SIZE)) for i in range(TILE_COUNT)}
+        self.assertEqual(len(tiles), TILE_COUNT)
+
+    # Covered, flagged, empty, numbered and mine cells pick the matching tile, and a drawn
+    # board shows exactly that tile in each cell.
+    def test_cells_use_their_tiles(self):
+        board = board_with_mines(10, 10, [(0, 0), (0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)])
+        board.toggle_flag(0, 0)
+        board.reveal(1, 1)
+        board.reveal(9, 9)
+        board.reveal(0, 1)
+        grid = board.grid
+        self.assertEqual(tile_index(grid[0][0]), TILE_FLAG)
+        self.assertEqual(tile_index(grid[1][0]), TILE_COVERED)
+        self.assertEqual(tile_index(grid[1][1]), 8)
+        self.assertEqual(tile_index(grid[9][9]), 0)
+        self.assertEqual(tile_index(grid[0][1]), TILE_MINE)
+        renderer = BoardRenderer(board)
+        screen = pygame.Surface((WIDTH, HEIGHT))
+        renderer.draw(screen)
+        atlas = tile_atlas(CELL_SIZE)
+        for row in grid:
+            for cell in row:
+                tile = (tile_index(cell) * CELL_SIZE, 0, CELL_SIZE, CELL_SIZE)
+                at = (cell.col * CELL_SIZE, cell.row * CELL_SIZE + GAME_STATE_OBJ_SIZE, CELL_SIZE, CELL_SIZE)
+                self.assertEqual(self.pixels(screen, at), self.pixels(atlas, tile))
+
+# The per-frame profiler behind the F3 overlay and F4 export.
+class ProfilerTests(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    # Nothing is recorded while profiling is off; once on, frames, reveals through the
+    # handler and AI moves are, and only the last `window` frames are kept.
+    def test_frames_and_reveals(self):
+        profiler = FrameProfiler(window=3)
+        board = Board(10, 10, 10, "n", "no_ai", seed=1)
+        handler = InputHandler(board)
+        handler.profiler = profiler
+        profiler.start_frame()
+        handler.reveal_cell(5, 5)
+        profiler.lap("input")
+        profiler.end_frame()
+        self.assertEqual(profiler.count, 0)
+        self.assertEqual(len(profiler.reveals), 0)
+        self.assertTrue(profiler.toggle())
+        for frame in range(5):
+            profiler.start_frame()
+            if frame == 4:
+                handler.reveal_cell(*next((r, c) for r in range(10) for c in range(10)
+                                          if not board.grid[r][c].isClicked and board.grid[r][c].cellState != 3))
+                profiler.ai_move(0.002)
+            profiler.lap("input")
+            profiler.lap("draw")
+            profiler.lap("idle")
+            profiler.end_frame()
+        self.assertEqual(profiler.count, 5)
+        self.assertEqual([f["frame"] for f in profiler.frames], [3, 4, 5])
+        last = profiler.frames[-1]
+        self.assertEqual(last["reveals"], 1)
+        self.assertGreaterEqual(last["reveal_cells"], 1)
+        self.assertEqual(last["ai_move_ms"], 2.0)
+        self.assertAlmostEqual(last["frame_ms"], sum(last[p] for p in ("events", "input", "ai", "draw", "victory", "hud", "display")), places=3)
+        self.assertTrue(profiler.summary_lines()[0].startswith("frame ms"))
+        self.assertFalse(profiler.toggle())
+        self.assertEqual(profiler.summary_lines()[-1], "F3 hides, F4 exports")
+
+    def test_export(self):
+        profiler = FrameProfiler()
+        profiler.toggle()
+        for _ in range(4):
+            profiler.start_frame()
+            profiler.reveal(0.001, 9)
+            profiler.lap("draw")
+            profiler.end_frame()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.csv")
+            profiler.export(path)
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([int(r["frame"]) for r in rows], [1, 2, 3, 4])
+            self.assertIn("draw", rows[0])
+            path = os.path.join(tmp, "profile.json")
+            profiler.export(path)
+            with open(path) as f:
+                data = json.load(f)
+            self.assertEqual(len(data["frames"]), 4)
+            self.assertEqual(data["reveals"], [{"ms": 1.0, "cells": 9}] * 4)
+            self.assertEqual(sorted(os.listdir(tmp)), ["profile.csv", "profile.json"])
+
+    # The worker reports how long each collected move took to work out.
+    def test_ai_move_time(self):
+        worker = AIWorker()
+        try:
+            board = Board(9, 9, 10, "y", "easy", seed=3)
+            InputHandler(board).reveal_cell(4, 4)
+            worker.request(AI(board, "easy"))
+            deadline = time.monotonic() + 10
+            while worker.result() is None and time.monotonic() < deadline:
+                time.sleep(0.001)
+            self.assertGreater(worker.last_seconds, 0)
+        finally:
+            worker.shutdown()
+
+# Startup timing up to the first frame.
+class StartupTimerTests(unittest.TestCase):
+    # Time spent at the prompts is reported apart and not counted.
+    def test_report_and_log(self):
+        timer = StartupTimer()
+        timer.steps = [("imports", 100.0, False), ("prompts", 3000.0, True), ("window", 20.0, False)]
+        self.assertEqual(timer.total_ms(), 120.0)
+        self.assertEqual(timer.report(), "Startup: imports 100.0 ms, window 20.0 ms; first frame after "
+                                         "120.0 ms (plus 3.0 s at the prompts)")
+        timer.mark("font")
+        self.assertEqual([step for step, _, _ in timer.steps][-1], "font")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "startup.jsonl")
+            timer.log(path)
+            timer.log(path)
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(set(records[0]["steps"]), {"imports", "prompts", "window", "font"})
+
+# Startup settings from the command line and the settings file.
+class SettingsTests(unittest.TestCase):
+    def test_board_size(self):
+        self.assertEqual(parse_board_size(" 16X30 "), (16, 30))
+        self.assertEqual(parse_board_size("inf"), (math.inf, math.inf))
+        for text in ("16", "16x", "axb", "16x30x2", "1x10", "10x100000"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_board_size(text)
+
+    def test_mine_bounds_and_names(self):
+        self.assertEqual(mine_bounds(10, 10), (10, 20))
+        self.assertEqual(mine_bounds(16, 30), (48, 96))
+        lo, hi = mine_bounds(3, 3)
+        self.assertEqual((lo, hi), (1, 1))
+        self.assertEqual(clean_name("  Ann<b>!  "), "Annb")
+        self.assertIsNone(clean_name(""))
+        self.assertIsNone(clean_name("x" * 21))
+
+    def test_validate(self):
+        self.assertEqual(validate({"size": "9x9", "mines": 10, "ai": "HARD", "sound": False}),
+                         {"size": (9, 9), "mines": 10, "ai": "hard", "sound": False})
+        for bad in ({"colour": "red"}, {"mines": True}, {"mines": "10"}, {"ai": "expert"},
+                    {"sound": "no"}, {"name": ""}):
+            with self.subTest(settings=bad), self.assertRaises(ValueError):
+                validate(bad)
+        self.assertEqual(validate({"no_guess": True}), {"no_guess": True})
+        with self.assertRaises(ValueError):
+            validate({"no_guess": "yes"})
+
+    # Flags win over the settings file; a missing default file is ignored, a bad one isn't.
+    def test_file_and_flags(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "settings.json")
+            with open(path, "w") as f:
+                json.dump({"name": "Ann", "size": "16x16", "mines": 40, "ai": "easy"}, f)
+            settings, _ = startup_settings(["--ai", "hard", "--no-sound", "--no-guess"], path)
+            self.assertEqual(settings, {"name": "Ann", "size": (16, 16), "mines": 40, "ai": "hard",
+                                        "sound": False, "no_guess": True})
+            settings, options = startup_settings([], os.path.join(tmp, "missing.json"))
+            self.assertEqual(settings, {})
+            self.assertFalse(options.quit_after_first_frame)
+            with open(path, "w") as f:
+                f.write("[1, 2]")
+            for argv, default in (([], path), (["--settings", os.path.join(tmp, "missing.json")], None),
+                                  (["--size", "big"], None)):
+                with self.subTest(argv=argv), self.assertRaises(SystemExit), \
+                        contextlib.redirect_stderr(io.StringIO()):
+                    startup_settings(argv, default)
+
+# Sound effects: files read in the background, the mixer and each sound started on first use.
+@unittest.skipIf(pygame is None, "PyGame is not installed")
+class SoundBankTests(unittest.TestCase):
+    def tearDown(self):
+        pygame.mixer.quit()
+
+    def test_lazy_loading(self):
+        folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio")
+        sounds = SoundBank(folder)
+        sounds.start()
+        sounds.loader.join()
+        self.assertFalse(pygame.mixer.get_init())
+        sounds.play("flag", exclusive=True)
+        sounds.play("click")
+        self.assertTrue(pygame.mixer.get_init())
+        self.assertEqual(set(sounds.sounds), {"flag", "click"})
+        self.assertIsNotNone(sounds.sounds["click"])
+
+    # With sound off the mixer never starts; missing files are skipped.
+    def test_disabled_and_missing(self):
+        sounds = SoundBank("no-such-folder", enabled=False)
+        sounds.start()
+        sounds.play("click")
+        self.assertIsNone(sounds.loader)
+        self.assertFalse(pygame.mixer.get_init())
+        sounds = SoundBank("no-such-folder")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            sounds.play("click")
+        self.assertIsNone(sounds.sounds["click"])
+        self.assertIn("Sound not loaded", out.getvalue())
+
+# Runs main.py with the given flags in a temporary folder, quits after `seconds` and prints
+# the number of frames pushed to the window.
+IDLE_GAME = """
+import os, sys, threading, time
+import pygame
+sys.path.insert(0, sys.argv[1])
+import main
+for name in ("HIGHSCORES_FILE", "REPLAYS_FILE", "SAVE_FILE", "SETTINGS_FILE"):
+    setattr(main, name, os.path.join(sys.argv[2], name))
+frames = []
+update = pygame.display.update
+def counting_update(*args):
+    frames.append(time.monotonic())
+    return update(*args)
+pygame.display.update = counting_update
+threading.Timer(float(sys.argv[3]), lambda: pygame.event.post(pygame.event.Event(pygame.QUIT))).start()
+main.main(sys.argv[4:])
+sys.stderr.write("%d\\n" % len(frames))
+"""
+
+# The game loop sleeps while nothing on screen is changing.
+@unittest.skipIf(pygame is None, "PyGame is not installed")
+class MainLoopTests(unittest.TestCase):
+    # An idle game draws a handful of frames a second instead of spinning.
+    def test_idle_loop_sleeps(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run([sys.executable, "-c", IDLE_GAME, here, tmp, "1.5", "--name", "Tester",
+                                     "--size", "10x10", "--mines", "10", "--ai", "none", "--no-sound"], env=env,
+                                    capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        frames = int(result.stderr.strip().splitlines()[-1])
+        self.assertGreater(frames, 0)
+        self.assertLess(frames, 20)
+
+# Calls the tests.
+if __name__ == "__main__":
+    unittest.main()
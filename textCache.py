@@ -0,0 +1,31 @@
+'''
+File: textCache.py
+Authors: Jace Keagy, K Li, Ian Lim, Jenna Luong, Kit Magar, Bryce Martin.
+Date: 10/18/2026
+Purpose: Shared cache of PyGame fonts and rendered text so cells, board labels and the HUD
+don't look up a SysFont or rasterize the same string every frame.
+Inputs: None.
+Outputs: None.
+External Sources: None.
+'''
+
+# Imports.
+from functools import lru_cache
+import pygame
+from config import *
+
+# One Font object per (name, size); there are only a handful of these. The default font
+# (name None) is what SysFont falls back to anyway, so it is opened directly without
+# scanning the system's fonts, which can take a noticeable part of startup.
+@lru_cache(maxsize=None)
+def get_font(name, size):
+    if name is None:
+        return pygame.font.Font(None, size)
+    return pygame.font.SysFont(name, size)
+
+# Rendered text surfaces, least recently used evicted first so strings that keep changing
+# (like the timer) can't grow the cache without limit. Returned surfaces are shared, so
+# callers must only blit them, never draw onto them.
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, size, color, name=None):
+    return get_font(name, size).render(text, True, color)